@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Kontrol Arayüzü Sıcak Yol Benchmark'ı
+IKADashboard'u ekransız (QT_QPA_PLATFORM=offscreen) açar; Firebase katmanı
+bellek içi bir sahte veritabanıyla değiştirilir, kamera sayfaları yüklenmez.
+Ölçülenler: handle_firebase_data dağıtım hızı, update_sensor_data ve LCD
+yenileme maliyeti, tuş olayından komutun kuyruğa bırakılmasına kadar geçen
+süre, apply_theme ile tema değişimi, buton durum değişimi ve FileUploadHandler'ın farklı boyutlarda
+yükleme hızı. Sonuçlar --output JSON dosyasına yazılır, --history dosyasına
+eklenir ve bir önceki çalıştırmayla karşılaştırılır.
+
+Kullanım: python benchmarks/bench_dashboard.py [--iterations 5000] [--sizes 64,1024,8192] [--label v1.5] [--output benchmarks/results/bench_dashboard.json]
+"""
+
+import argparse
+import base64
+import http.client
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Varsayılan sonuç klasörü (.gitignore'da); çalışma ağacında izlenmeyen dosya bırakılmaz
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Qt importlarından önce: ekransız platform ve ölçümü bozacak yan işler kapalı
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('IKA_MOTION_DETECTION', '0')
+os.environ.setdefault('IKA_FLIGHT_RECORDER', '0')
+os.environ.setdefault('IKA_STALL_WATCHDOG', '0')
+
+from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtGui import QKeyEvent
+from PyQt6.QtWidgets import QApplication
+
+from file_server import FileServer
+
+# Öncekiyle karşılaştırılan ölçütler: (bölüm, anahtar, etiket)
+METRICS = (
+    ('handle_firebase_data', 'per_call_us', 'handle_firebase_data µs/mesaj'),
+    ('update_sensor_data', 'per_call_us', 'update_sensor_data µs/mesaj'),
+    ('refresh_ui', 'per_call_us', 'LCD yenileme µs/kare'),
+    ('key_to_command', 'per_call_us', 'tuş → kuyruk µs/olay'),
+    ('apply_theme', 'per_call_us', 'tema değişimi µs'),
+    ('button_toggle', 'per_call_us', 'buton durumu µs'),
+)
+
+
+def load_app():
+    """ika-app.py'yi modül olarak yükler (dosya adında tire olduğu için importlib ile)"""
+    spec = importlib.util.spec_from_file_location('ika_app', os.path.join(ROOT, 'ika-app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubReference:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def set(self, data):
+        self.db.writes += 1
+
+
+class StubDb:
+    """firebase_admin.db yerine: yazmalar yalnızca sayılır"""
+
+    def __init__(self):
+        self.writes = 0
+
+    def reference(self, path):
+        return StubReference(self, path)
+
+
+def stats(samples_s):
+    """Saniye cinsinden örneklerden µs istatistikleri ve saniyedeki çağrı sayısı"""
+    samples = sorted(s * 1e6 for s in samples_s)
+    n = len(samples)
+    total = sum(samples)
+    return {
+        'calls': n,
+        'per_call_us': round(total / n, 2),
+        'p50_us': round(samples[n // 2], 2),
+        'p99_us': round(samples[min(n - 1, int(n * 0.99))], 2),
+        'max_us': round(samples[-1], 2),
+        'calls_per_s': round(n / (total / 1e6), 1) if total else None,
+    }
+
+
+def timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def sensor_message(i):
+    return {
+        'imu': {'roll': 1.5 + (i % 50) * 0.1, 'pitch': -0.5 + (i % 30) * 0.1, 'yaw': (i * 0.7) % 360},
+        'gps': {'latitude': 39.92 + i * 1e-6, 'longitude': 32.85 + i * 1e-6,
+                'altitude': 880.0 + (i % 10), 'speed': 4.2 + (i % 5) * 0.1},
+    }
+
+
+def firebase_messages(count):
+    """Sensör ağırlıklı, komut yankılarıyla karışık akış (gerçek veritabanı dinleyicisine benzer)"""
+    echoes = [
+        {'type': 'control', 'data': {'mode': 'manual'}},
+        {'type': 'gear', 'data': {'gear': '2'}},
+        {'type': 'emergency', 'data': {'emergency': False}},
+        {'type': 'vehicle_engine', 'data': {'engine_running': True}},
+        {'type': 'laser', 'data': {'command': 'null'}},
+    ]
+    messages = []
+    for i in range(count):
+        if i % 5 == 4:
+            messages.append(echoes[(i // 5) % len(echoes)])
+        else:
+            messages.append({'type': 'sensors', 'data': sensor_message(i)})
+    return messages
+
+
+def bench_firebase(dash, iterations):
+    messages = firebase_messages(iterations)
+    return stats(timed(dash.handle_firebase_data, [(m,) for m in messages]))
+
+
+def bench_sensors(dash, iterations):
+    sensors = stats(timed(dash.update_sensor_data, [(sensor_message(i),) for i in range(iterations)]))
+    # Kare zamanlayıcısının işi: her karede yeni değerler işaretlenmiş olarak LCD'lere uygulanır
+    frames = []
+    for i in range(min(iterations, 2000)):
+        dash.update_sensor_data(sensor_message(i))
+        start = time.perf_counter()
+        dash._refresh_ui()
+        frames.append(time.perf_counter() - start)
+    return sensors, stats(frames)
+
+
+def bench_keys(app, dash, db, iterations):
+    """Tuş basma + bırakma olayı GUI thread'inde; komut gönderimi arka plan thread'inde"""
+    keys = [Qt.Key.Key_W, Qt.Key.Key_A, Qt.Key.Key_S, Qt.Key.Key_D, Qt.Key.Key_1, Qt.Key.Key_2]
+    writes_before = db.writes
+    samples = []
+    start_all = time.perf_counter()
+    for i in range(iterations):
+        key = keys[i % len(keys)]
+        for kind in (QEvent.Type.KeyPress, QEvent.Type.KeyRelease):
+            event = QKeyEvent(kind, key, Qt.KeyboardModifier.NoModifier)
+            start = time.perf_counter()
+            QApplication.sendEvent(dash, event)
+            samples.append(time.perf_counter() - start)
+        if i % 100 == 0:
+            # Başlık geri alma zamanlayıcıları birikmesin
+            app.processEvents()
+    # Kuyruğun boşalması: arka plan thread'inin gönderim hızı
+    sent = -1
+    while sent != db.writes or dash.command_sender.pending:
+        sent = db.writes
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start_all
+    result = stats(samples)
+    result['commands_sent'] = db.writes - writes_before
+    # Aynı yola art arda gelen komutlar kuyrukta birleştirilir; yalnızca sonuncusu gönderilir
+    result['commands_superseded'] = sum(dash.input_latency.superseded.values()) if dash.input_latency else 0
+    result['drain_commands_per_s'] = round(result['commands_sent'] / elapsed, 1)
+    return result
+
+
+def bench_theme(app, dash, switches):
+    samples = []
+    for i in range(switches):
+        name = 'Glass' if i % 2 == 0 else 'NeoDark'
+        start = time.perf_counter()
+        dash.apply_theme(name)
+        # Yeniden polish ve yerleşim olay döngüsünde tamamlanır
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+    dash.apply_theme(dash.current_theme)
+    return stats(samples)
+
+
+def bench_toggle(dash, toggles):
+    """Yayın/kayıt butonu durum değişimi (tek widget yeniden polish edilir) ve tuş vurgusu"""
+    toggles_fn = [
+        lambda on: dash._set_style_state(dash.start_all_streams_btn, 'state', 'active' if on else 'idle'),
+        lambda on: dash._set_style_state(dash.start_recording_btn, 'state', 'active' if on else 'idle'),
+        lambda on: dash._highlight_button('up') if on else dash._unhighlight_button('up'),
+    ]
+    samples = []
+    for i in range(toggles):
+        fn = toggles_fn[i % len(toggles_fn)]
+        start = time.perf_counter()
+        fn((i // len(toggles_fn)) % 2 == 0)
+        samples.append(time.perf_counter() - start)
+    return stats(samples)
+
+
+def post(conn, path, body, content_type):
+    conn.request('POST', path, body=body, headers={'Content-Type': content_type})
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def bench_upload(sizes_kb, repeats):
+    """Tek seferlik base64 JSON yükleme (do_POST) ve ham kayıt parçası (/record/) hızları"""
+    tmp = tempfile.mkdtemp(prefix='ika_upload_bench_')
+    server = FileServer(port=0, recordings_dir=tmp)
+    results = {}
+    try:
+        if not server.start():
+            return results
+        conn = http.client.HTTPConnection('localhost', server.port, timeout=30)
+        for size_kb in sizes_kb:
+            payload = os.urandom(size_kb * 1024)
+            body = json.dumps({'filename': 'bench.webm', 'data': base64.b64encode(payload).decode()})
+            upload, chunk = [], []
+            for seq in range(repeats):
+                start = time.perf_counter()
+                status = post(conn, '/', body, 'application/json')
+                upload.append(time.perf_counter() - start)
+                if status != 200:
+                    raise RuntimeError(f"Yükleme başarısız: HTTP {status}")
+                start = time.perf_counter()
+                post(conn, f'/record/bench_{size_kb}.webm?seq={seq}', payload, 'application/octet-stream')
+                chunk.append(time.perf_counter() - start)
+            post(conn, f'/record/bench_{size_kb}.webm?final=1', b'', 'application/octet-stream')
+            results[f'{size_kb}KB'] = {
+                'upload_ms': round(sorted(upload)[len(upload) // 2] * 1000.0, 2),
+                'upload_mb_s': round(size_kb / 1024 * len(upload) / sum(upload), 1),
+                'record_chunk_ms': round(sorted(chunk)[len(chunk) // 2] * 1000.0, 2),
+                'record_chunk_mb_s': round(size_kb / 1024 * len(chunk) / sum(chunk), 1),
+            }
+        conn.close()
+    finally:
+        server.stop()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def last_entry(history_path):
+    if not history_path or not os.path.exists(history_path):
+        return None
+    last = None
+    with open(history_path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kontrol arayüzü sıcak yol benchmark'ı")
+    parser.add_argument('--iterations', type=int, default=5000, help="Mesaj/tuş sayısı")
+    parser.add_argument('--theme-switches', type=int, default=20)
+    parser.add_argument('--sizes', default='64,1024,8192', help="Yükleme boyutları (KB, virgülle)")
+    parser.add_argument('--upload-repeats', type=int, default=5)
+    parser.add_argument('--label', default=time.strftime('%Y-%m-%d'), help="Sürüm etiketi")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'bench_dashboard.json'),
+                        help="Bu çalıştırmanın sonuç dosyası")
+    parser.add_argument('--history', default=os.path.join(RESULTS_DIR, 'bench_dashboard.jsonl'),
+                        help="Sonuçların eklendiği JSONL dosyası")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+    history = os.path.abspath(args.history) if args.history else None
+
+    app_module = load_app()
+    app_module.AGORA_APP_ID = app_module.AGORA_APP_ID or 'bench'
+    app_module.AGORA_TOKEN = app_module.AGORA_TOKEN or 'bench'
+
+    class BenchDashboard(app_module.IKADashboard):
+        def start_subsystems(self):
+            # Kamera sayfaları, dosya sunucusu ve gerçek Firebase başlatılmaz
+            pass
+
+    app = QApplication(sys.argv[:1])
+    workdir = tempfile.mkdtemp(prefix='ika_dash_bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        db = StubDb()
+        app_module.db = db
+        app_module.FIREBASE_AVAILABLE = True
+        dash = BenchDashboard()
+        dash.firebase_initialized = True
+        app.processEvents()
+
+        results = {
+            'handle_firebase_data': bench_firebase(dash, args.iterations),
+        }
+        results['update_sensor_data'], results['refresh_ui'] = bench_sensors(dash, args.iterations)
+        results['key_to_command'] = bench_keys(app, dash, db, args.iterations // 2)
+        results['apply_theme'] = bench_theme(app, dash, args.theme_switches)
+        results['button_toggle'] = bench_toggle(dash, args.theme_switches * 30)
+        dash.close()
+        app.processEvents()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    results['file_upload'] = bench_upload([int(s) for s in args.sizes.split(',') if s.strip()],
+                                          args.upload_repeats)
+
+    previous = last_entry(history)
+    print(f"{'ölçüt':<32} {'ort.':>10} {'p50':>10} {'p99':>10} {'öncekine fark':>14}")
+    for section, key, label in METRICS:
+        s = results[section]
+        before = (previous or {}).get('results', {}).get(section, {}).get(key)
+        delta = f"{(s[key] - before) / before * 100:+.1f}%" if before else '-'
+        print(f"{label:<32} {s[key]:>10.1f} {s['p50_us']:>10.1f} {s['p99_us']:>10.1f} {delta:>14}")
+    keys = results['key_to_command']
+    print(f"\nKomut gönderimi: {keys['commands_sent']} komut ({keys.get('commands_superseded', 0)} birleşti), "
+          f"{keys['drain_commands_per_s']:.0f} komut/sn (sahte veritabanı)")
+    print(f"\n{'yükleme':<10} {'base64 ms':>10} {'MB/sn':>8} {'parça ms':>10} {'MB/sn':>8}")
+    for size, r in results['file_upload'].items():
+        print(f"{size:<10} {r['upload_ms']:>10.1f} {r['upload_mb_s']:>8.1f} "
+              f"{r['record_chunk_ms']:>10.1f} {r['record_chunk_mb_s']:>8.1f}")
+
+    record = {'label': args.label, 'revision': git_revision(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'iterations': args.iterations, 'results': results}
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    if history:
+        os.makedirs(os.path.dirname(history), exist_ok=True)
+        with open(history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"\n✅ Sonuçlar yazıldı: {output}" + (f" (+ {history})" if history else ''))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Uçuş Kaydedicisi Benchmark'ı
+GUI thread'inde record() çağrısının kayıt başı maliyetini ve yazıcı thread'inin
+toplu kodlama/yazma hızını ölçer, ardından dosyayı memmap ile geri okur
+
+Kullanım: python benchmarks/bench_flight_recorder.py [--records 200000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flight_recorder import FlightRecorder, list_logs, load_logs, RECORD_DTYPE
+
+
+def sample_sensors(i):
+    return {
+        'imu': {'roll': 1.5 + i % 7, 'pitch': -0.5, 'yaw': 182.0},
+        'gps': {'latitude': 39.92077 + i * 1e-6, 'longitude': 32.85411, 'altitude': 938.0, 'speed': 4.2},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uçuş kaydedicisi benchmark'ı")
+    parser.add_argument('--records', type=int, default=200000)
+    args = parser.parse_args()
+
+    log_dir = tempfile.mkdtemp(prefix='ika_flight_')
+    try:
+        # Sözlükler önceden hazırlanır ki yalnızca record() ölçülsün
+        sensors = [sample_sensors(i) for i in range(1000)]
+        command = {'command': 'forward', 'timestamp': time.time()}
+
+        recorder = FlightRecorder(log_dir)
+        start = time.perf_counter()
+        for i in range(args.records):
+            if i % 4:
+                recorder.record_sensors(sensors[i % 1000])
+            else:
+                recorder.record_command('movement', command)
+        hot_path = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recorder.close()
+        drain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = load_logs(list_logs(log_dir))
+        load = time.perf_counter() - start
+
+        print(f"Kayıt boyutu: {RECORD_DTYPE.itemsize} byte, {args.records} kayıt")
+        print(f"record() (GUI thread'i): {hot_path / args.records * 1e6:.2f} µs/kayıt")
+        print(f"Kapanışta kalan kuyruğu yazma: {drain * 1000:.1f} ms, toplu yazma: {recorder.batches}")
+        print(f"Geri okuma (memmap + birleştirme): {load * 1000:.1f} ms, {len(records)} kayıt")
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Kare Musluğu Aktarım Benchmark'ı
+Sayfanın yaptığı gibi ham RGBA kareleri HTTP ile FileServer'a gönderir ve
+5, 15 ve 30 fps'de ulaşılan hızı, bant genişliğini ve istek gecikmesini ölçer
+
+Kullanım: python benchmarks/bench_frame_tap.py [--width 320 --height 180 --cameras 3 --seconds 3]
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_server import FileServer
+from frame_tap import FrameTap
+
+
+def send_frames(port, camera, width, height, fps, seconds, latencies):
+    """Tek kameranın sayfa döngüsünü taklit eder: her karede bir POST, öncekini bekler"""
+    payload = bytes(width * height * 4)
+    headers = {
+        'Content-Type': 'application/octet-stream',
+        'X-Frame-Width': str(width),
+        'X-Frame-Height': str(height),
+    }
+    interval = 1.0 / fps
+    deadline = time.perf_counter() + seconds
+    next_send = time.perf_counter()
+    while time.perf_counter() < deadline:
+        now = time.perf_counter()
+        if now < next_send:
+            time.sleep(next_send - now)
+        next_send += interval
+
+        start = time.perf_counter()
+        conn = http.client.HTTPConnection('localhost', port)
+        conn.request('POST', f'/frames/{camera}', body=payload, headers=headers)
+        conn.getresponse().read()
+        conn.close()
+        latencies.append(time.perf_counter() - start)
+
+
+def run(fps, width, height, cameras, seconds):
+    tap = FrameTap()
+    received = {}
+
+    def on_frame(camera, frame, timestamp):
+        received[camera] = received.get(camera, 0) + 1
+
+    names = [f"cam{i}" for i in range(cameras)]
+    for name in names:
+        tap.configure(name, width, height)
+        tap.subscribe(name, on_frame)
+
+    server = FileServer(port=0, recordings_dir="recordings", frame_tap=tap)
+    server.start()
+    try:
+        latencies = []
+        threads = [
+            threading.Thread(target=send_frames, args=(server.port, name, width, height, fps, seconds, latencies))
+            for name in names
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    frames = sum(received.values())
+    frame_bytes = width * height * 4
+    latencies.sort()
+    return {
+        'target_fps': fps,
+        'achieved_fps_per_camera': frames / elapsed / cameras,
+        'throughput_mb_s': frames * frame_bytes / elapsed / 1e6,
+        'latency_mean_ms': statistics.mean(latencies) * 1000 if latencies else 0.0,
+        'latency_p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kare musluğu aktarım benchmark'ı")
+    parser.add_argument('--width', type=int, default=320)
+    parser.add_argument('--height', type=int, default=180)
+    parser.add_argument('--cameras', type=int, default=3)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"Kare: {args.width}x{args.height} RGBA, {args.cameras} kamera, {args.seconds:.0f} sn")
+    print(f"{'hedef fps':>10} {'ulaşılan fps':>13} {'MB/s':>8} {'ort. ms':>8} {'p95 ms':>8}")
+    for fps in (5, 15, 30):
+        r = run(fps, args.width, args.height, args.cameras, args.seconds)
+        print(f"{r['target_fps']:>10} {r['achieved_fps_per_camera']:>13.1f} {r['throughput_mb_s']:>8.1f} "
+              f"{r['latency_mean_ms']:>8.2f} {r['latency_p95_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
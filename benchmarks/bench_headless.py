@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Arayüzsüz Düğüm Kaynak Karşılaştırması
+Tam arayüzü (--autostart) ve arayüzsüz kayıt düğümünü (--headless) sırayla ayrı
+süreçte aynı süre çalıştırır; ısınmadan sonra süreç ağacının (QtWebEngineProcess
+alt süreçleri dahil) CPU ve bellek (RSS) kullanımını örnekler ve karşılaştırır.
+Gerçekçi sonuç için yayıncılar açık olmalı (config.env / cameras.json); arayüzsüz
+düğüm bu sürede kayıt da yapar, dosyalar recordings/ altına yazılır.
+
+Kullanım: python benchmarks/bench_headless.py [--duration 60] [--warmup 20] [--label v1.6]
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+# psutil gerekli: alt süreçlerin CPU ve belleği dışarıdan ölçülür
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'ika-app.py')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+MODES = (
+    ('dashboard', 'tam arayüz', ['--autostart']),
+    ('headless', 'arayüzsüz düğüm', ['--headless']),
+)
+
+
+def sample_tree(root, known):
+    """Süreç ağacının CPU yüzdesi (tek çekirdek = %100) ve toplam RSS'i (MB).
+    known: pid -> Process; ilk ölçümü 0 dönen yeni süreçler bir sonraki örnekte sayılır"""
+    cpu = 0.0
+    rss = 0
+    alive = {}
+    for proc in [root] + root.children(recursive=True):
+        try:
+            tracked = known.get(proc.pid)
+            if tracked is None:
+                tracked = proc
+                tracked.cpu_percent(None)
+            else:
+                cpu += tracked.cpu_percent(None)
+            rss += tracked.memory_info().rss
+            alive[proc.pid] = tracked
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    known.clear()
+    known.update(alive)
+    return cpu, rss / (1024 * 1024)
+
+
+def run_mode(args_extra, duration, warmup, interval):
+    """Süreci başlatır, ısınmadan sonra örnekler ve SIGTERM ile kapatır; süreç erken çıkarsa None"""
+    proc = psutil.Popen([sys.executable, APP] + args_extra, cwd=ROOT,
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    known = {}
+    cpu_samples, rss_samples = [], []
+    try:
+        deadline = time.monotonic() + warmup
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                return None
+            sample_tree(proc, known)
+            time.sleep(interval)
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                return None
+            cpu, rss = sample_tree(proc, known)
+            cpu_samples.append(cpu)
+            rss_samples.append(rss)
+            time.sleep(interval)
+    finally:
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=15)
+            except psutil.TimeoutExpired:
+                for child in proc.children(recursive=True):
+                    child.kill()
+                proc.kill()
+    if not cpu_samples:
+        return None
+    cpu_sorted = sorted(cpu_samples)
+    return {
+        'samples': len(cpu_samples),
+        'cpu_mean': round(statistics.mean(cpu_samples), 1),
+        'cpu_p95': round(cpu_sorted[min(len(cpu_sorted) - 1, int(len(cpu_sorted) * 0.95))], 1),
+        'rss_mean_mb': round(statistics.mean(rss_samples), 1),
+        'rss_max_mb': round(max(rss_samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arayüzsüz düğüm ile tam arayüzün kaynak karşılaştırması")
+    parser.add_argument('--duration', type=float, default=60.0, help="Ölçüm süresi (sn, mod başına)")
+    parser.add_argument('--warmup', type=float, default=20.0, help="Ölçüm öncesi bekleme (sn): sayfalar ve yayınlar açılsın")
+    parser.add_argument('--interval', type=float, default=1.0, help="Örnekleme aralığı (sn)")
+    parser.add_argument('--label', default=time.strftime('%Y-%m-%d'), help="Sürüm etiketi")
+    parser.add_argument('--history', default=os.path.join(RESULTS_DIR, 'bench_headless.jsonl'),
+                        help="Sonuçların eklendiği JSONL dosyası")
+    args = parser.parse_args()
+
+    if not PSUTIL_AVAILABLE:
+        print("❌ psutil bulunamadı: pip install psutil")
+        sys.exit(1)
+
+    results = {}
+    for key, label, extra in MODES:
+        print(f"▶️ {label}: {args.warmup:.0f} sn ısınma + {args.duration:.0f} sn ölçüm...")
+        result = run_mode(extra, args.duration, args.warmup, args.interval)
+        if result is None:
+            print(f"  ❌ {label} ölçülemedi (süreç erken çıktı; config.env ve QtWebEngine kurulumunu kontrol edin)")
+            continue
+        results[key] = result
+
+    if not results:
+        sys.exit(1)
+    print(f"\n{'mod':<18} {'CPU ort. %':>11} {'CPU p95 %':>10} {'RSS ort. MB':>12} {'RSS maks MB':>12}")
+    for key, label, _ in MODES:
+        r = results.get(key)
+        if r is not None:
+            print(f"{label:<18} {r['cpu_mean']:>11.1f} {r['cpu_p95']:>10.1f} {r['rss_mean_mb']:>12.1f} {r['rss_max_mb']:>12.1f}")
+    if len(results) == len(MODES):
+        full, node = results['dashboard'], results['headless']
+        cpu_ratio = node['cpu_mean'] / full['cpu_mean'] if full['cpu_mean'] else None
+        rss_ratio = node['rss_mean_mb'] / full['rss_mean_mb'] if full['rss_mean_mb'] else None
+        print(f"\nArayüzsüz düğüm / tam arayüz: CPU "
+              + (f"%{cpu_ratio * 100:.0f}" if cpu_ratio is not None else '-')
+              + ", bellek " + (f"%{rss_ratio * 100:.0f}" if rss_ratio is not None else '-'))
+
+    record = {'label': args.label, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'duration_s': args.duration, 'warmup_s': args.warmup, 'results': results}
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    with open(args.history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"\n✅ Sonuç eklendi: {args.history} ({args.label})")
+
+
+if __name__ == "__main__":
+    main()
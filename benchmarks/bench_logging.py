@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Log Hattı Benchmark'ı
+Log çağıran thread'in (GUI thread'i) çağrı başına maliyetini karşılaştırır:
+doğrudan StreamHandler + FileHandler, QueueHandler/QueueListener hattı ve
+seviyesi kapalı (DEBUG) çağrı. Ayrıca üç kamera sayfasının JS konsol
+sağanağında hız sınırlayıcının kaç satırı geçirdiğini ölçer.
+
+Kullanım: python benchmarks/bench_logging.py [--records 20000] [--js-lines 3000]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import LOG_FORMAT, JsConsoleLimiter, LogPipeline
+
+
+def measure(logger, records, level=logging.INFO):
+    """Çağrı başına süre (µs) listesi"""
+    samples = []
+    payload = {'imu': {'roll': 1.5, 'pitch': -0.5}, 'gps': {'speed': 4.2}}
+    for i in range(records):
+        start = time.perf_counter()
+        logger.log(level, f"Sensör verisi {i}: {payload}")
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def stats(samples):
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        'mean': sum(samples) / n,
+        'p50': samples[n // 2],
+        'p99': samples[min(n - 1, int(n * 0.99))],
+        'max': samples[-1],
+    }
+
+
+def run_sync(tmp, records, devnull):
+    logger = logging.getLogger('bench.sync')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(devnull), logging.FileHandler(os.path.join(tmp, 'sync.log'), encoding='utf-8')]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    try:
+        return measure(logger, records), 0.0
+    finally:
+        for handler in handlers:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+def run_queue(tmp, records, devnull):
+    pipeline = LogPipeline(os.path.join(tmp, 'queue.log'))
+    pipeline.handlers[0].setStream(devnull)
+    pipeline.start()
+    try:
+        samples = measure(logging.getLogger('bench.queue'), records)
+    finally:
+        # Kuyruğun boşalması (dinleyici thread'inin yazması) çağıranın süresine dahil değildir
+        start = time.perf_counter()
+        pipeline.stop()
+        drain_ms = (time.perf_counter() - start) * 1000.0
+    return samples, drain_ms
+
+
+def run_disabled(records):
+    logger = logging.getLogger('bench.disabled')
+    logger.setLevel(logging.INFO)
+    return measure(logger, records, logging.DEBUG), 0.0
+
+
+def run_js(lines, pages=3, rate_hz=1000.0):
+    """Sayfa başına rate_hz satır/sn üreten sağanak (simüle saat)"""
+    logger = logging.getLogger('bench.js')
+    logger.propagate = False
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.DEBUG)
+    limiters = [JsConsoleLimiter(f"page{i}", logger=logger) for i in range(pages)]
+    t0 = time.monotonic()
+    start = time.perf_counter()
+    for n in range(lines):
+        now = t0 + n / rate_hz
+        for limiter in limiters:
+            limiter.allow(now)
+    elapsed = time.perf_counter() - start
+    passed = sum(l.passed + l.sampled for l in limiters)
+    total = lines * pages
+    return {
+        'lines': total,
+        'logged': passed,
+        'per_call_us': elapsed / total * 1e6,
+        'simulated_s': lines / rate_hz,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log hattı benchmark'ı")
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--js-lines', type=int, default=3000, help="Sayfa başına JS konsol satırı")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='ika_log_bench_')
+    devnull = open(os.devnull, 'w')
+    try:
+        results = [
+            ('doğrudan (Stream+File)',) + run_sync(tmp, args.records, devnull),
+            ('kuyruk (QueueHandler)',) + run_queue(tmp, args.records, devnull),
+            ('kapalı seviye (DEBUG)',) + run_disabled(args.records),
+        ]
+    finally:
+        devnull.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{args.records} kayıt, çağıran thread'de çağrı başına µs")
+    print(f"{'yöntem':<26} {'ort.':>8} {'p50':>8} {'p99':>8} {'maks':>9} {'boşaltma ms':>12}")
+    for name, samples, drain_ms in results:
+        s = stats(samples)
+        print(f"{name:<26} {s['mean']:>8.2f} {s['p50']:>8.2f} {s['p99']:>8.2f} {s['max']:>9.1f} {drain_ms:>12.1f}")
+
+    js = run_js(args.js_lines)
+    print(f"\nJS konsolu: {js['lines']} satır ({js['simulated_s']:.1f} sn, 3 sayfa), "
+          f"loglanan {js['logged']} (%{js['logged'] / js['lines'] * 100:.1f}), "
+          f"sınırlayıcı {js['per_call_us']:.2f} µs/satır")
+
+
+if __name__ == "__main__":
+    main()
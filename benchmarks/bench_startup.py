@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Soğuk Açılış Benchmark'ı
+ika-app.py'yi --profile-startup --quit-after-startup ile birkaç kez ayrı süreçte
+çalıştırır; pencerenin görünür olmasına ve (--autostart ile) ilk kameranın ilk
+karesine kadar geçen süreyi ve en pahalı açılış aşamalarını raporlar. Sonuçlar
+--history dosyasına eklenir ve bir önceki sürümle karşılaştırılır.
+
+Kullanım: python benchmarks/bench_startup.py [--runs 5] [--autostart] [--label v1.4] [--history benchmarks/results/bench_startup.jsonl]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'ika-app.py')
+# Varsayılan sonuç klasörü (.gitignore'da)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+METRICS = (
+    ('time_to_window_visible_ms', 'pencere görünür'),
+    ('time_to_first_frame_ms', 'ilk kare'),
+    ('startup_total_ms', 'açılış toplamı'),
+)
+
+
+def run_once(autostart, timeout):
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_path = os.path.join(tmp, 'profile.json')
+        cmd = [sys.executable, APP, '--profile-startup', profile_path, '--quit-after-startup']
+        if autostart:
+            cmd.append('--autostart')
+        start = time.perf_counter()
+        try:
+            subprocess.run(cmd, cwd=ROOT, timeout=timeout, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except subprocess.TimeoutExpired:
+            return None
+        wall_ms = (time.perf_counter() - start) * 1000.0
+        if not os.path.exists(profile_path):
+            return None
+        with open(profile_path, encoding='utf-8') as f:
+            profile = json.load(f)
+    profile['process_wall_ms'] = wall_ms
+    return profile
+
+
+def summarize(profiles):
+    summary = {}
+    for key, _ in METRICS:
+        values = [p[key] for p in profiles if p.get(key) is not None]
+        if values:
+            summary[key] = {'median': statistics.median(values), 'min': min(values), 'max': max(values)}
+    # Aşama başına medyan süre (en pahalılar raporlanır)
+    durations = {}
+    for p in profiles:
+        for phase in p['phases']:
+            durations.setdefault(phase['name'], []).append(phase['duration_ms'])
+    summary['phases'] = {name: statistics.median(values) for name, values in durations.items()}
+    return summary
+
+
+def last_entry(history_path):
+    if not history_path or not os.path.exists(history_path):
+        return None
+    last = None
+    with open(history_path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soğuk açılış benchmark'ı")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--autostart', action='store_true',
+                        help="Yayınları da başlat ve ilk kareye kadar geçen süreyi ölç (Agora bağlantısı gerekir)")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Çalıştırma başına zaman aşımı (sn)")
+    parser.add_argument('--label', default=time.strftime('%Y-%m-%d'), help="Sürüm etiketi")
+    parser.add_argument('--history', default=os.path.join(RESULTS_DIR, 'bench_startup.jsonl'),
+                        help="Sonuçların eklendiği JSONL dosyası")
+    parser.add_argument('--top', type=int, default=8, help="Raporlanacak en pahalı aşama sayısı")
+    args = parser.parse_args()
+
+    profiles = []
+    for i in range(args.runs):
+        profile = run_once(args.autostart, args.timeout)
+        if profile is None:
+            print(f"  #{i + 1}: ❌ profil alınamadı (zaman aşımı ya da başlatma hatası)")
+            continue
+        profiles.append(profile)
+        print(f"  #{i + 1}: pencere {profile.get('time_to_window_visible_ms') or 0:.0f} ms, "
+              f"açılış {profile['startup_total_ms']:.0f} ms, süreç {profile['process_wall_ms']:.0f} ms")
+    if not profiles:
+        sys.exit(1)
+
+    summary = summarize(profiles)
+    previous = last_entry(args.history)
+    print(f"\n{'ölçüt':<18} {'medyan ms':>10} {'min':>8} {'maks':>8} {'öncekine fark':>14}")
+    for key, label in METRICS:
+        stats = summary.get(key)
+        if stats is None:
+            continue
+        before = (previous or {}).get('summary', {}).get(key, {}).get('median')
+        delta = f"{stats['median'] - before:+.0f}" if before is not None else '-'
+        print(f"{label:<18} {stats['median']:>10.0f} {stats['min']:>8.0f} {stats['max']:>8.0f} {delta:>14}")
+
+    print("\nEn pahalı aşamalar (medyan):")
+    for name, ms in sorted(summary['phases'].items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    record = {'label': args.label, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'runs': len(profiles),
+              'autostart': args.autostart, 'summary': summary}
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    with open(args.history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"\n✅ Sonuç eklendi: {args.history} ({args.label})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Kamera Hazırlık Takibi
+Her kameranın başlatma aşamalarını (SDK hazır, kanala katıldı, abone olundu,
+ilk kare) zamanlar ve ilk kareye kadar geçen süreyi (TTFF) kaydeder
+"""
+
+import json
+import time
+import logging
+
+PHASES = ('sdk_ready', 'joined', 'subscribed', 'first_frame')
+
+PHASE_LABELS = {
+    'sdk_ready': 'SDK hazır',
+    'joined': 'katıldı',
+    'subscribed': 'abone',
+    'first_frame': 'ilk kare',
+    'failed': 'hata',
+}
+
+DEFAULT_TTFF_LOG = 'ika_ttff.jsonl'
+
+
+class ReadinessTracker:
+    """Aynı anda başlatılan kameraların aşama zamanlarını tutar"""
+
+    def __init__(self, cameras, log_path=DEFAULT_TTFF_LOG):
+        self.cameras = list(cameras)
+        self.log_path = log_path
+        self.started_at = time.time()
+        self.phases = {camera: {} for camera in self.cameras}
+        self.errors = {}
+        self.logged = False
+
+    def mark(self, camera, phase, elapsed_ms):
+        """Sayfanın ölçtüğü süreyle (startStream çağrısından itibaren ms) aşamayı işaretler"""
+        if camera not in self.phases:
+            return
+        self.phases[camera].setdefault(phase, round(elapsed_ms, 1))
+
+    def fail(self, camera, reason):
+        if camera in self.phases:
+            self.errors[camera] = reason
+
+    def is_ready(self, camera):
+        return 'first_frame' in self.phases.get(camera, {})
+
+    def is_complete(self):
+        return all(self.is_ready(c) or c in self.errors for c in self.cameras)
+
+    def ttff(self, camera):
+        return self.phases.get(camera, {}).get('first_frame')
+
+    def camera_text(self, camera):
+        if camera in self.errors:
+            return f"❌ {self.errors[camera]}"
+        ttff = self.ttff(camera)
+        if ttff is not None:
+            return f"✅ {ttff / 1000:.2f} sn"
+        reached = [p for p in PHASES if p in self.phases[camera]]
+        return f"⏳ {PHASE_LABELS[reached[-1]]}" if reached else "⏳ başlatılıyor"
+
+    def summary_text(self, names=None):
+        names = names or {}
+        return "\n".join(f"{names.get(c, c)}: {self.camera_text(c)}" for c in self.cameras)
+
+    def write_log(self):
+        """Regresyon takibi için oturumu JSON satırı olarak ekler (bir kez)"""
+        if self.logged:
+            return
+        self.logged = True
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'cameras': {
+                camera: {
+                    'phases_ms': self.phases[camera],
+                    'ttff_ms': self.ttff(camera),
+                    'error': self.errors.get(camera),
+                }
+                for camera in self.cameras
+            },
+        }
+        for camera in self.cameras:
+            logging.info(f"TTFF {camera}: {self.ttff(camera)} ms, aşamalar: {self.phases[camera]}")
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.error(f"TTFF logu yazılamadı: {e}")
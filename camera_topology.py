@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Kamera Topolojisi
+Kameralar (ad, kanal, token, uid, rol, öncelik) tek bir yerde tanımlanır:
+IKA_CAMERAS_FILE ile verilen JSON dosyası (varsayılan cameras.json), yoksa
+config.env'deki AGORA_CHANNEL_ONE/TWO/THREE ile önceki üç kameralı düzen.
+Alıcı arayüzü, arayüzsüz kayıt düğümü, token sağlayıcı ve gönderici sayfası
+aynı listeyi kullanır. Qt'den bağımsızdır.
+"""
+
+import os
+import re
+import json
+import math
+import logging
+
+DEFAULT_CAMERAS_FILE = 'cameras.json'
+MAX_CAMERAS = 8
+# Aynı anda çözülen en fazla video; görünür kameralardan odak ve önceliğe göre seçilir (0: sınırsız)
+DEFAULT_MAX_DECODED = 4
+# main: büyük karo (sürüş), laser: lazer modunda odak, rear: hareket algılama, aux: diğer
+ROLES = ('main', 'laser', 'rear', 'aux')
+KEY_PATTERN = re.compile(r'^[a-z0-9_-]+$')
+
+# Yapılandırma dosyası yoksa: (ad, anahtar, kanal env'i, varsayılan kanal, token env'i, uid, rol, kayıt dosyası)
+LEGACY_CAMERAS = (
+    ("🚗 Ön Kamera", "front", 'AGORA_CHANNEL_ONE', 'channel_one', 'AGORA_TOKEN_ONE', 1, 'main', 'on-cam.webm'),
+    ("🎯 Lazer Atış Kamera", "laser", 'AGORA_CHANNEL_TWO', 'channel_two', 'AGORA_TOKEN_TWO', 2, 'laser', 'lazer-cam.webm'),
+    ("🔙 Arka Kamera", "back", 'AGORA_CHANNEL_THREE', 'channel_three', 'AGORA_TOKEN_THREE', 3, 'rear', 'arka-cam.webm'),
+)
+
+
+class CameraSpec:
+    """Tek kamera. key gönderici tarafındaki cameraType ile aynıdır; priority 1 en önemlisidir.
+    token yoksa AGORA_TOKEN (ya da token sağlayıcı) kullanılır."""
+
+    def __init__(self, key, name, channel, uid, role='aux', priority=1, token=None, file=None):
+        self.key = key
+        self.name = name
+        self.channel = channel
+        self.uid = uid
+        self.role = role
+        self.priority = priority
+        self.token = token
+        self.file = file or f"{key}-cam.webm"
+
+    def publisher(self, app_id='', default_token=''):
+        """Gönderici sayfasındaki publisherInfo girdisi"""
+        return {
+            'appId': app_id,
+            'channelName': self.channel,
+            'uid': self.uid,
+            'token': self.token or default_token,
+            'cameraType': self.key,
+            'name': self.name,
+            'deviceId': 'default',
+        }
+
+    def __repr__(self):
+        return f"CameraSpec({self.key!r}, {self.channel!r}, uid={self.uid}, role={self.role!r}, priority={self.priority})"
+
+
+def legacy_cameras():
+    return [
+        CameraSpec(key, name, os.getenv(channel_var, channel_default), uid, role, index + 1,
+                   os.getenv(token_var) or None, filename)
+        for index, (name, key, channel_var, channel_default, token_var, uid, role, filename)
+        in enumerate(LEGACY_CAMERAS)
+    ]
+
+
+def parse_cameras(data):
+    """{"cameras": [...]} ya da doğrudan liste; hatalı yapılandırmada ValueError"""
+    entries = data.get('cameras') if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError("'cameras' listesi bulunamadı")
+    cameras = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{index + 1}. kamera bir nesne değil")
+        missing = [field for field in ('key', 'channel') if not entry.get(field)]
+        if missing:
+            raise ValueError(f"{index + 1}. kamerada eksik alan: {', '.join(missing)}")
+        try:
+            uid = int(entry.get('uid', index + 1))
+            priority = int(entry.get('priority', index + 1))
+        except (TypeError, ValueError):
+            raise ValueError(f"{entry['key']}: uid ve priority tamsayı olmalı")
+        cameras.append(CameraSpec(
+            str(entry['key']), entry.get('name') or str(entry['key']), str(entry['channel']), uid,
+            entry.get('role', 'aux'), priority, entry.get('token') or None, entry.get('file'),
+        ))
+    validate(cameras)
+    return cameras
+
+
+def validate(cameras):
+    if not 1 <= len(cameras) <= MAX_CAMERAS:
+        raise ValueError(f"1 ile {MAX_CAMERAS} arasında kamera tanımlanmalı ({len(cameras)} var)")
+    keys, channels = set(), set()
+    for camera in cameras:
+        if not KEY_PATTERN.match(camera.key):
+            raise ValueError(f"Geçersiz kamera anahtarı: {camera.key!r} (küçük harf, rakam, '_' ve '-')")
+        if camera.key in keys:
+            raise ValueError(f"Aynı anahtarla iki kamera: {camera.key}")
+        # Alıcı sayfası kanaldaki yayıncıyı gösterir; her kamera ayrı kanalda olmalı
+        if camera.channel in channels:
+            raise ValueError(f"{camera.key}: {camera.channel} kanalı başka bir kamerada da kullanılıyor")
+        if camera.role not in ROLES:
+            raise ValueError(f"{camera.key}: bilinmeyen rol {camera.role!r} ({', '.join(ROLES)})")
+        keys.add(camera.key)
+        channels.add(camera.channel)
+    for role in ('main', 'laser'):
+        if sum(1 for camera in cameras if camera.role == role) > 1:
+            raise ValueError(f"'{role}' rolünde en fazla bir kamera olabilir")
+
+
+def load_topology(path=None):
+    """Kamera listesi (yapılandırma sırasıyla); dosya yoksa önceki üç kameralı düzen"""
+    path = path or os.getenv('IKA_CAMERAS_FILE', DEFAULT_CAMERAS_FILE)
+    if not os.path.exists(path):
+        return legacy_cameras()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"{path} okunamadı: {e}")
+    cameras = parse_cameras(data)
+    logging.info(f"Kamera topolojisi yüklendi: {path} ({len(cameras)} kamera)")
+    return cameras
+
+
+def camera_with_role(cameras, role):
+    """Roldeki ilk kamera; 'main' yoksa ilk kamera ana kameradır"""
+    for camera in cameras:
+        if camera.role == role:
+            return camera
+    return cameras[0] if role == 'main' else None
+
+
+def grid_columns(count):
+    """İkincil karoların sütun sayısı: 3'e kadar tek satır, sonra en fazla 4 sütun"""
+    return max(1, count if count <= 3 else min(4, math.ceil(count / 2)))
+
+
+def select_decoded(cameras, visible, focused=None, budget=DEFAULT_MAX_DECODED):
+    """Görünür kameralardan çözülecek olanların anahtarları: önce odak kamerası, sonra
+    önceliğe göre; budget 0 ise görünürlerin hepsi"""
+    candidates = sorted((camera for camera in cameras if camera.key in visible),
+                        key=lambda camera: (camera.key != focused, camera.priority))
+    if budget > 0:
+        candidates = candidates[:budget]
+    return {camera.key for camera in candidates}
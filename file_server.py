@@ -5,22 +5,50 @@ WebRTC kayıtlarını recordings klasörüne kaydeder
 """
 
 import os
+import hmac
 import base64
 import json
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
 import logging
 
+from recording_writer import RecordingWriter
+
+# /token isteğinde paylaşılan anahtarın geldiği başlık
+TOKEN_KEY_HEADER = 'X-IKA-Token-Key'
+# /token yanıtını okuyabilecek sayfa kökenleri; 'null': file:// ile açılan gönderici sayfası
+DEFAULT_TOKEN_ORIGINS = ('null',)
+
 class FileUploadHandler(BaseHTTPRequestHandler):
-    def __init__(self, *args, recordings_dir="recordings", **kwargs):
-        self.recordings_dir = recordings_dir
-        os.makedirs(recordings_dir, exist_ok=True)
+    frame_tap = None
+    token_provider = None
+    # Anahtar tanımlı değilse /token kapalıdır; yalnızca topolojideki kanallara token verilir
+    token_key = None
+    token_channels = None
+    token_origins = DEFAULT_TOKEN_ORIGINS
+    status_provider = None
+    recording_writer = None
+    recordings_dir = "recordings"
+
+    def __init__(self, *args, recordings_dir=None, **kwargs):
+        # FileServer'ın alt sınıfta verdiği klasör, argüman verilmedikçe korunur
+        if recordings_dir is not None:
+            self.recordings_dir = recordings_dir
+        os.makedirs(self.recordings_dir, exist_ok=True)
         super().__init__(*args, **kwargs)
     
     def do_POST(self):
         """Dosya yükleme isteği"""
+        path = urlparse(self.path).path
+        if path.startswith('/frames/'):
+            self.handle_frame(path[len('/frames/'):])
+            return
+        if path.startswith('/record/'):
+            self.handle_record_chunk(path[len('/record/'):])
+            return
+
         try:
             # Content length al
             content_length = int(self.headers['Content-Length'])
@@ -65,12 +93,146 @@ class FileUploadHandler(BaseHTTPRequestHandler):
             print(f"❌ Dosya kaydetme hatası: {e}")
             self.send_error(500, f"Dosya kaydetme hatası: {str(e)}")
     
+    def do_GET(self):
+        """Token yenileme isteği: GET /token?channel=<kanal>&uid=<uid>; düğüm durumu: GET /status"""
+        parsed = urlparse(self.path)
+        if parsed.path == '/status' and self.status_provider is not None:
+            self.handle_status()
+            return
+        if parsed.path != '/token' or self.token_provider is None:
+            self.send_error(404, explain="Bulunamadı")
+            return
+        if not self.token_key:
+            self.send_error(403, explain="Token adresi kapalı (IKA_TOKEN_KEY tanımlı değil)")
+            return
+        if not hmac.compare_digest(self.headers.get(TOKEN_KEY_HEADER, '').encode(), self.token_key.encode()):
+            logging.warning(f"Token isteği reddedildi: anahtar geçersiz (köken: {self.headers.get('Origin')})")
+            self.send_error(403, explain="Geçersiz token anahtarı")
+            return
+        try:
+            query = parse_qs(parsed.query)
+            channel = query.get('channel', [''])[0]
+            uid = int(query.get('uid', ['0'])[0] or 0)
+            if self.token_channels is None or channel not in self.token_channels:
+                logging.warning(f"Token isteği reddedildi: tanımsız kanal {channel!r}")
+                self.send_error(403, explain=f"Kanal yapılandırmada yok: {channel}")
+                return
+            token = self.token_provider.get_token(channel, uid)
+            if not token:
+                self.send_error(404, explain=f"Token yok: {channel}")
+                return
+
+            body = json.dumps({'channel': channel, 'token': token}).encode()
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_token_cors_headers()
+            self.end_headers()
+            self.wfile.write(body)
+        except Exception as e:
+            self.send_error(500, explain=f"Token alınamadı: {str(e)}")
+
+    def send_token_cors_headers(self):
+        """Yalnızca izin verilen kökene (joker değil) CORS izni verir"""
+        origin = self.headers.get('Origin')
+        if origin is not None and origin in self.token_origins:
+            self.send_header('Access-Control-Allow-Origin', origin)
+            self.send_header('Vary', 'Origin')
+
+    def handle_status(self):
+        """status_provider()'ın döndürdüğü sözlüğü JSON olarak yazar"""
+        try:
+            body = json.dumps(self.status_provider(), ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except Exception as e:
+            self.send_error(500, explain=f"Durum alınamadı: {str(e)}")
+
+    def handle_record_chunk(self, filename):
+        """MediaRecorder parçasını ham olarak alır ve yazıcı kuyruğuna verir"""
+        if self.recording_writer is None:
+            self.send_error(404, explain="Kayıt yazıcısı etkin değil")
+            return
+        try:
+            query = parse_qs(urlparse(self.path).query)
+            content_length = int(self.headers.get('Content-Length') or 0)
+            data = self.rfile.read(content_length) if content_length else b''
+
+            # Sayfa dosya adını encodeURIComponent ile gönderir; oturum (parse_qs) gibi çözülür ki
+            # anahtar manifestteki adla eşleşsin. '..' ve mutlak yollar yazıcının path_for'unda atılır
+            filename = unquote(filename)
+
+            # Oturumlu kayıtlar recordings/<oturum>/ altına yazılır
+            session = query.get('session', [''])[0]
+            if session:
+                filename = f"{session}/{filename}"
+
+            if data:
+                seq = int(query.get('seq', ['0'])[0])
+                # Sayfanın damgaladığı zamanlar (epoch ms): parça aralığı ve kaydedicinin başladığı an
+                meta = {
+                    name: float(query[name][0])
+                    for name in ('t0', 't1', 'start')
+                    if name in query
+                }
+                if not self.recording_writer.write(filename, seq, data, meta):
+                    self.send_busy()
+                    return
+            if query.get('final', ['0'])[0] == '1':
+                if not self.recording_writer.close(filename):
+                    self.send_busy()
+                    return
+
+            self.send_response(204)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+        except Exception as e:
+            self.send_error(500, explain=f"Kayıt parçası yazılamadı: {str(e)}")
+
+    def send_busy(self):
+        """Yazıcı kuyruğu dolu: sayfa aynı parçayı biraz sonra yeniden gönderir"""
+        self.send_response(503)
+        self.send_header('Retry-After', '1')
+        self.send_header('Content-Length', '0')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+    def handle_frame(self, camera):
+        """Ham RGBA kareyi frame tap halka tamponuna yazar"""
+        if self.frame_tap is None:
+            self.send_error(404, "Frame tap etkin değil")
+            return
+        try:
+            content_length = int(self.headers['Content-Length'])
+            width = int(self.headers['X-Frame-Width'])
+            height = int(self.headers['X-Frame-Height'])
+            timestamp = self.headers.get('X-Frame-Timestamp')
+            timestamp = float(timestamp) / 1000.0 if timestamp else None
+
+            self.frame_tap.write_from(camera, width, height, self.rfile, content_length, timestamp)
+
+            self.send_response(204)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+        except Exception as e:
+            self.send_error(400, f"Kare alınamadı: {str(e)}")
+
     def do_OPTIONS(self):
         """CORS preflight isteği"""
+        if urlparse(self.path).path == '/token':
+            self.send_response(204)
+            self.send_token_cors_headers()
+            self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', TOKEN_KEY_HEADER)
+            self.end_headers()
+            return
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, X-Frame-Width, X-Frame-Height, X-Frame-Timestamp')
         self.end_headers()
     
     def log_message(self, format, *args):
@@ -78,22 +240,47 @@ class FileUploadHandler(BaseHTTPRequestHandler):
         pass
 
 class FileServer:
-    def __init__(self, port=8080, recordings_dir="recordings"):
+    def __init__(self, port=8080, recordings_dir="recordings", frame_tap=None, token_provider=None,
+                 status_provider=None, token_key=None, token_channels=None, token_origins=DEFAULT_TOKEN_ORIGINS):
         self.port = port
         self.recordings_dir = recordings_dir
+        self.frame_tap = frame_tap
+        self.token_provider = token_provider
+        # /token: paylaşılan anahtar (TOKEN_KEY_HEADER), izinli kanallar ve kökenler
+        self.token_key = token_key
+        self.token_channels = set(token_channels) if token_channels is not None else None
+        self.token_origins = tuple(token_origins)
+        # HTTP thread'inde çağrılır; JSON'a çevrilebilir bir sözlük döndürmeli
+        self.status_provider = status_provider
+        self.recording_writer = None
+        self.recording_session = None
         self.server = None
         self.server_thread = None
         
     def start(self):
         """Sunucuyu başlat"""
         try:
+            # Kayıt parçalarını diske yazan thread
+            self.recording_writer = RecordingWriter(self.recordings_dir)
+            self.recording_writer.on_chunk = self._on_record_chunk
+            self.recording_writer.on_close = self._on_record_close
+
             # Handler'ı oluştur
             handler = type('FileUploadHandler', (FileUploadHandler,), {
-                'recordings_dir': self.recordings_dir
+                'recordings_dir': self.recordings_dir,
+                'frame_tap': self.frame_tap,
+                'token_provider': self.token_provider,
+                'token_key': self.token_key,
+                'token_channels': self.token_channels,
+                'token_origins': self.token_origins,
+                'status_provider': self.status_provider,
+                'recording_writer': self.recording_writer
             })
             
-            # HTTP sunucusu oluştur
-            self.server = HTTPServer(('localhost', self.port), handler)
+            # HTTP sunucusu oluştur - kameralar ve kayıtlar birbirini beklemesin diye çok thread'li
+            self.server = ThreadingHTTPServer(('localhost', self.port), handler)
+            self.server.daemon_threads = True
+            self.port = self.server.server_address[1]
             
             # Sunucuyu ayrı thread'de başlat
             self.server_thread = threading.Thread(target=self.server.serve_forever)
@@ -107,12 +294,28 @@ class FileServer:
             print(f"❌ Sunucu başlatma hatası: {e}")
             return False
     
+    def attach_session(self, session):
+        """Gelen kayıt parçalarını bu oturumun manifestine işler"""
+        self.recording_session = session
+
+    def _on_record_chunk(self, filename, seq, offset, size, meta):
+        session = self.recording_session
+        if session is not None and session.owns(filename):
+            session.on_chunk(filename, seq, offset, size, meta)
+
+    def _on_record_close(self, filename, stats):
+        session = self.recording_session
+        if session is not None and session.owns(filename):
+            session.on_close(filename, stats)
+
     def stop(self):
         """Sunucuyu durdur"""
         if self.server:
             self.server.shutdown()
             self.server.server_close()
             print("✅ Dosya sunucusu durduruldu")
+        if self.recording_writer:
+            self.recording_writer.stop()
     
     def get_recordings_list(self):
         """Recordings klasöründeki dosyaları listele"""
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Telemetri Uçuş Kaydedicisi
+Gelen her sensör güncellemesi ve giden her komut sabit boyutlu ikili kayıt
+olarak dönen (rotating) dosyalara eklenir. Dosyalar np.memmap ile doğrudan
+açılabilir; oynatma ve analiz araçları aynı kayıt düzenini kullanır.
+"""
+
+import os
+import re
+import glob
+import struct
+import threading
+import time
+import logging
+from collections import deque
+
+import numpy as np
+
+# Kayıt türleri
+KIND_SENSORS = 1    # update_sensor_data'ya gelen sensör verisi
+KIND_COMMAND = 2    # send_to_firebase ile giden komut
+KIND_STATE = 3      # Firebase'den okunan kontrol durumu (komutun yankısı)
+
+# Firebase yolları; kayıttaki kod = sıra + 1
+CHANNELS = (
+    'sensors', 'control', 'gear', 'commands', 'laser', 'emergency',
+    'vehicle_engine', 'movement', 'steering', 'gas', 'laser_mode',
+)
+CHANNEL_CODES = {name: i + 1 for i, name in enumerate(CHANNELS)}
+
+# Komut değerleri sayı olarak saklanır; tabloda olmayan metinler -1 olur
+VALUES = (
+    'null', 'forward', 'backward', 'left', 'right', 'up', 'down',
+    'increase', 'decrease', 'fire', 'manual', 'semi_auto', 'auto',
+    '1', '2', 'B', 'G',
+)
+VALUE_CODES = {name: i for i, name in enumerate(VALUES)}
+UNKNOWN_VALUE = -1
+
+# value alanının nasıl yorumlanacağı
+VALUE_NONE = 0
+VALUE_CODE = 1
+VALUE_BOOL = 2
+VALUE_NUMBER = 3
+
+# Komut sözlüklerinde değerin bulunduğu anahtarlar (ilk bulunan kullanılır)
+VALUE_KEYS = ('command', 'mode', 'gear', 'active', 'emergency', 'engine_running')
+
+# 64 byte'lık kayıt; eksik sensör alanları NaN
+RECORD_DTYPE = np.dtype([
+    ('t', '<f8'),           # kayıt zamanı (Unix epoch sn)
+    ('ref_t', '<f8'),       # veri içindeki 'timestamp' (komut yankısı için), yoksa NaN
+    ('lat', '<f8'),
+    ('lon', '<f8'),
+    ('roll', '<f4'),
+    ('pitch', '<f4'),
+    ('yaw', '<f4'),
+    ('alt', '<f4'),
+    ('speed', '<f4'),
+    ('value', '<f4'),
+    ('seq', '<u4'),         # oturum içi sıra numarası
+    ('kind', 'u1'),
+    ('channel', 'u1'),
+    ('value_type', 'u1'),
+    ('_pad', 'u1'),
+])
+
+MAGIC = b'IKATLM01'
+HEADER_FORMAT = '<8sHHId'
+HEADER_SIZE = 64
+FORMAT_VERSION = 1
+LOG_SUFFIX = '.ikt'
+# Dosya adı ika_<koşu>_<sıra>.ikt; koşu kimliği new_run_id() ile üretilir. Analiz aracı
+# dosyaları bu desenle koşulara ayırır, biçim değişirse ikisi birlikte güncellenmeli
+RUN_PATTERN = re.compile(r'^(ika_\d{8}-\d{6}-\d+)_\d{3}' + re.escape(LOG_SUFFIX) + '$')
+
+DEFAULT_LOG_DIR = 'telemetry'
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_FILES = 100
+DEFAULT_FLUSH_INTERVAL = 0.25
+DEFAULT_BATCH_SIZE = 512
+
+NAN = float('nan')
+
+
+def _float(container, key):
+    try:
+        return float(container[key])
+    except (KeyError, TypeError, ValueError):
+        return NAN
+
+
+def encode_value(data):
+    """Komut sözlüğünden (value, value_type) üretir"""
+    if not isinstance(data, dict):
+        data = {'command': data}
+    for key in VALUE_KEYS:
+        if key not in data:
+            continue
+        value = data[key]
+        if isinstance(value, bool):
+            return float(value), VALUE_BOOL
+        if isinstance(value, (int, float)):
+            return float(value), VALUE_NUMBER
+        return float(VALUE_CODES.get(str(value), UNKNOWN_VALUE)), VALUE_CODE
+    return NAN, VALUE_NONE
+
+
+def decode_value(value, value_type):
+    """encode_value'nun tersi; oynatma için sözlükteki ham değeri döndürür"""
+    if value_type == VALUE_BOOL:
+        return bool(value)
+    if value_type == VALUE_NUMBER:
+        return float(value)
+    if value_type == VALUE_CODE:
+        code = int(value)
+        return VALUES[code] if 0 <= code < len(VALUES) else None
+    return None
+
+
+def encode_record(seq, t, kind, channel, data):
+    """Ham kaydı RECORD_DTYPE alan sırasıyla bir demete çevirir"""
+    ref_t = _float(data, 'timestamp') if isinstance(data, dict) else NAN
+    if kind == KIND_SENSORS:
+        imu = data.get('imu') if isinstance(data, dict) else None
+        gps = data.get('gps') if isinstance(data, dict) else None
+        imu = imu if isinstance(imu, dict) else {}
+        gps = gps if isinstance(gps, dict) else {}
+        return (
+            t, ref_t, _float(gps, 'latitude'), _float(gps, 'longitude'),
+            _float(imu, 'roll'), _float(imu, 'pitch'), _float(imu, 'yaw'),
+            _float(gps, 'altitude'), _float(gps, 'speed'),
+            NAN, seq, kind, CHANNEL_CODES.get(channel, 0), VALUE_NONE, 0,
+        )
+    value, value_type = encode_value(data)
+    return (
+        t, ref_t, NAN, NAN, NAN, NAN, NAN, NAN, NAN,
+        value, seq, kind, CHANNEL_CODES.get(channel, 0), value_type, 0,
+    )
+
+
+def write_header(f, created):
+    header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize, HEADER_SIZE, created)
+    f.write(header.ljust(HEADER_SIZE, b'\0'))
+
+
+def new_run_id():
+    """Açılış anı ve süreç kimliği: aynı saniyede başlayan iki çalıştırma ayrı koşudur"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def log_name(run_id, index):
+    return f"ika_{run_id}_{index:03d}{LOG_SUFFIX}"
+
+
+def open_log(path):
+    """Log dosyasını kopyalamadan (np.memmap) açar; boş dosya için boş dizi döner"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < struct.calcsize(HEADER_FORMAT):
+        raise ValueError(f"Telemetri logu değil: {path}")
+    magic, version, record_size, header_size, _ = struct.unpack_from(HEADER_FORMAT, header)
+    if magic != MAGIC or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Desteklenmeyen telemetri logu: {path}")
+
+    # Yarım yazılmış son kayıt (ani kapanma) yok sayılır
+    count = (os.path.getsize(path) - header_size) // record_size
+    if count <= 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=header_size, shape=(count,))
+
+
+def list_logs(path):
+    """Klasördeki log dosyalarını (ya da tek dosyayı) zaman sırasıyla listeler"""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*' + LOG_SUFFIX)))
+    return [path]
+
+
+def load_logs(paths):
+    """Birden çok log dosyasını tek, zaman sıralı diziye birleştirir"""
+    arrays = [open_log(p) for p in paths]
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    records = np.concatenate(arrays)
+    return records[np.argsort(records['t'], kind='stable')]
+
+
+class FlightRecorder:
+    """GUI thread'inde record() yalnızca bir deque'ya ekler; kodlama ve yazma
+    ayrı thread'de toplu (NumPy yapılandırılmış dizi) olarak yapılır"""
+
+    def __init__(self, log_dir=DEFAULT_LOG_DIR, max_bytes=DEFAULT_MAX_BYTES, max_files=DEFAULT_MAX_FILES,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, batch_size=DEFAULT_BATCH_SIZE):
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        os.makedirs(log_dir, exist_ok=True)
+
+        self.run_id = new_run_id()
+        self.file_index = 0
+        self.current_path = None
+        self._file = None
+        self._file_bytes = 0
+
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._running = True
+        self._last_state = {}
+        self.seq = 0
+        self.written = 0
+        self.skipped = 0
+        self.batches = 0
+
+        self.thread = threading.Thread(target=self._run, name="FlightRecorder", daemon=True)
+        self.thread.start()
+
+    # --- Sıcak yol (GUI thread'i) ---
+    def record(self, kind, channel, data):
+        self._pending.append((time.time(), kind, channel, data))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def record_sensors(self, data):
+        self.record(KIND_SENSORS, 'sensors', data)
+
+    def record_command(self, path, data):
+        self.record(KIND_COMMAND, path, data)
+
+    def record_state(self, data_type, data):
+        self.record(KIND_STATE, data_type, data)
+
+    # --- Yazıcı thread'i ---
+    def _run(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        count = len(self._pending)
+        if not count:
+            return
+        items = [self._pending.popleft() for _ in range(count)]
+        rows = []
+        for t, kind, channel, data in items:
+            if kind == KIND_STATE and self._is_repeat(channel, data):
+                # FirebaseThread aynı durumu her 100 ms'de okur; değişmeyenler yazılmaz
+                self.skipped += 1
+                continue
+            try:
+                rows.append(encode_record(self.seq, t, kind, channel, data))
+            except Exception as e:
+                logging.error(f"Telemetri kaydı kodlanamadı ({channel}): {e}")
+                continue
+            self.seq += 1
+        if rows:
+            self._write(np.array(rows, dtype=RECORD_DTYPE))
+
+    def _is_repeat(self, channel, data):
+        key = repr(data)
+        if self._last_state.get(channel) == key:
+            return True
+        self._last_state[channel] = key
+        return False
+
+    def _write(self, batch):
+        try:
+            if self._file is None or self._file_bytes + batch.nbytes > self.max_bytes:
+                self._rotate()
+            self._file.write(batch.tobytes())
+            self._file.flush()
+            self._file_bytes += batch.nbytes
+            self.written += len(batch)
+            self.batches += 1
+        except OSError as e:
+            logging.error(f"Telemetri logu yazılamadı: {e}")
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        # 'xb': var olan log asla ezilmez; ad alınmışsa sıradaki numara denenir
+        while True:
+            self.current_path = os.path.join(self.log_dir, log_name(self.run_id, self.file_index))
+            self.file_index += 1
+            try:
+                self._file = open(self.current_path, 'xb')
+                break
+            except FileExistsError:
+                continue
+        write_header(self._file, time.time())
+        self._file_bytes = HEADER_SIZE
+        self._prune()
+
+    def _prune(self):
+        """En eski dosyaları silerek klasörde en fazla max_files log tutar"""
+        if not self.max_files:
+            return
+        logs = list_logs(self.log_dir)
+        for path in logs[:max(0, len(logs) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        """Bekleyen kayıtları yazıp dosyayı kapatır"""
+        self._running = False
+        self._wake.set()
+        self.thread.join(timeout=5)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        logging.info(f"Telemetri kaydı: {self.written} kayıt, {self.batches} toplu yazma, "
+                     f"{self.skipped} tekrar atlandı ({self.current_path})")
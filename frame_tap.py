@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Kamera Kare Musluğu (Frame Tap)
+Alıcı sayfalarının gönderdiği ham RGBA kareleri kamera başına önceden
+ayrılmış NumPy halka tamponlarına yazar ve abonelere kopyasız görünüm verir
+"""
+
+import threading
+import time
+import logging
+
+import numpy as np
+
+# Sayfanın göndereceği varsayılan kare ayarları
+DEFAULT_TAP_FPS = 5
+DEFAULT_TAP_WIDTH = 320
+DEFAULT_TAP_HEIGHT = 180
+FRAME_CHANNELS = 4  # canvas getImageData -> RGBA
+
+
+class FrameRingBuffer:
+    """Sabit boyutlu kare halka tamponu; tek yazar, çok okuyucu"""
+
+    def __init__(self, width, height, capacity=8, channels=FRAME_CHANNELS):
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.frames = np.zeros((capacity, height, width, channels), dtype=np.uint8)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.count = 0  # Toplam yazılan kare sayısı
+        self.lock = threading.Lock()
+
+    @property
+    def frame_nbytes(self):
+        return self.frames[0].nbytes
+
+    def next_slot(self):
+        """Yazılacak sıradaki yuvanın indeksini ve yazılabilir görünümünü döndürür"""
+        index = self.count % self.capacity
+        return index, self.frames[index]
+
+    def commit(self, index, timestamp):
+        """Yuvaya yazma bittiğinde kareyi okuyuculara açar"""
+        with self.lock:
+            self.timestamps[index] = timestamp
+            self.count += 1
+
+    def view(self, index):
+        """Salt okunur kopyasız görünüm; tampon dolup dönene kadar geçerlidir"""
+        frame = self.frames[index].view()
+        frame.flags.writeable = False
+        return frame
+
+    def latest(self):
+        """Son karenin (görünüm, zaman damgası) çiftini döndürür, kare yoksa None"""
+        with self.lock:
+            if self.count == 0:
+                return None
+            index = (self.count - 1) % self.capacity
+            return self.view(index), float(self.timestamps[index])
+
+
+class FrameTap:
+    """Kamera başına halka tamponları ve abonelikleri yönetir"""
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.buffers = {}
+        self.subscribers = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def configure(self, camera, width, height):
+        """Kamera için tamponu (gerekirse yeniden) ayırır"""
+        with self._lock:
+            buffer = self.buffers.get(camera)
+            if buffer is None or buffer.width != width or buffer.height != height:
+                buffer = FrameRingBuffer(width, height, self.capacity)
+                self.buffers[camera] = buffer
+                self.stats[camera] = {'frames': 0, 'bytes': 0, 'rejected': 0}
+            return buffer
+
+    def subscribe(self, camera, callback):
+        """callback(camera, frame, timestamp) her yeni karede yazıcı thread'inde çağrılır.
+        frame kopyasız görünümdür; saklanacaksa kopyalanmalıdır."""
+        with self._lock:
+            self.subscribers.setdefault(camera, []).append(callback)
+
+    def unsubscribe(self, camera, callback):
+        with self._lock:
+            callbacks = self.subscribers.get(camera, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def has_subscribers(self, camera):
+        return bool(self.subscribers.get(camera))
+
+    def write_from(self, camera, width, height, stream, nbytes, timestamp=None):
+        """HTTP gövdesini doğrudan halka tamponuna okur (ara kopya yok)"""
+        buffer = self.configure(camera, width, height)
+        if nbytes != buffer.frame_nbytes:
+            self.stats[camera]['rejected'] += 1
+            raise ValueError(f"Kare boyutu uyuşmuyor: {nbytes} != {buffer.frame_nbytes}")
+
+        index, slot = buffer.next_slot()
+        target = memoryview(slot).cast('B')
+        received = 0
+        while received < nbytes:
+            n = stream.readinto(target[received:])
+            if not n:
+                raise ValueError("Kare verisi eksik geldi")
+            received += n
+
+        timestamp = time.time() if timestamp is None else timestamp
+        buffer.commit(index, timestamp)
+        self.stats[camera]['frames'] += 1
+        self.stats[camera]['bytes'] += nbytes
+        self._notify(camera, buffer.view(index), timestamp)
+
+    def _notify(self, camera, frame, timestamp):
+        for callback in list(self.subscribers.get(camera, [])):
+            try:
+                callback(camera, frame, timestamp)
+            except Exception as e:
+                logging.error(f"Kare abonesi hatası ({camera}): {e}")
+
+    def latest(self, camera):
+        buffer = self.buffers.get(camera)
+        return buffer.latest() if buffer is not None else None
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+GPS İz Takibi
+Aracın izini yerel metrik düzlemde büyüyen NumPy dizilerinde tutar.
+Çizim için ayrıntı seviyeleri (her seviyede kabul edilen en küçük adım iki katı)
+artımlı olarak oluşturulur ve seçilen seviye Douglas-Peucker ile sadeleştirilir;
+böylece saatlerce süren bir izde de çizilen nokta sayısı ekran çözünürlüğüyle sınırlı kalır.
+İki seviyeli ızgara indeksi "en yakın kayıtlı nokta" ve isabet testini iz
+büyüdükçe yavaşlamadan yanıtlar.
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+DEFAULT_CELL_M = 10.0
+# Ayrıntı seviyeleri: 0.5 m, 1 m, 2 m, ... ~8 km
+LEVEL_BASE_M = 0.5
+LEVEL_COUNT = 15
+INITIAL_CAPACITY = 4096
+# İnce ızgarada bu kadar halkada bulunamazsa kaba ızgaraya geçilir
+MAX_SEARCH_RINGS = 8
+COARSE_FACTOR = 32
+# Artımlı sadeleştirmede yeniden hesaplanan kuyruğun en fazla uzunluğu
+MAX_DP_TAIL = 2048
+
+
+def douglas_peucker(xy, tolerance):
+    """Ramer-Douglas-Peucker; (n, 2) dizisinden tutulan noktaların indekslerini döndürür.
+    Özyineleme yerine yığın kullanır, her parçada uzaklıklar vektörel hesaplanır."""
+    n = len(xy)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a = xy[first]
+        b = xy[last]
+        seg = xy[first + 1:last]
+        d = b - a
+        length = math.hypot(d[0], d[1])
+        if length == 0.0:
+            dist = np.hypot(seg[:, 0] - a[0], seg[:, 1] - a[1])
+        else:
+            dist = np.abs(d[0] * (seg[:, 1] - a[1]) - d[1] * (seg[:, 0] - a[0])) / length
+        i = int(dist.argmax())
+        if dist[i] > tolerance:
+            mid = first + 1 + i
+            keep[mid] = True
+            stack.append((first, mid))
+            stack.append((mid, last))
+    return np.flatnonzero(keep)
+
+
+class GpsTrack:
+    """Enlem/boylam noktaları; x/y ilk noktaya göre metre (eşdikdörtgen izdüşüm)"""
+
+    def __init__(self, cell_m=DEFAULT_CELL_M):
+        self.cell_m = cell_m
+        self.count = 0
+        self.t = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self.lat = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self.lon = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self.xy = np.zeros((INITIAL_CAPACITY, 2), dtype=np.float64)
+        self.origin = None
+        self.bounds = None          # (min_x, min_y, max_x, max_y)
+        self.grid = {}              # (hücre_x, hücre_y) -> nokta indeksleri
+        # İz sorgu noktasından uzaksa boş ince hücreleri taramamak için kaba ızgara
+        self.coarse_m = cell_m * COARSE_FACTOR
+        self.coarse_grid = {}
+        self._coarse_keys = None
+        self._coarse_cells = None
+        # Seviye başına tutulan nokta indeksleri ve son tutulan noktanın konumu
+        self.levels = [[] for _ in range(LEVEL_COUNT)]
+        self._level_last = [None] * LEVEL_COUNT
+        self._dp_cache = {}
+        self.version = 0
+
+    def __len__(self):
+        return self.count
+
+    def _project(self, lat, lon):
+        lat0, lon0, cos0 = self.origin
+        return (math.radians(lon - lon0) * EARTH_RADIUS_M * cos0,
+                math.radians(lat - lat0) * EARTH_RADIUS_M)
+
+    def _grow(self):
+        capacity = len(self.t) * 2
+        for name in ('t', 'lat', 'lon'):
+            array = np.zeros(capacity, dtype=np.float64)
+            array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        xy = np.zeros((capacity, 2), dtype=np.float64)
+        xy[:self.count] = self.xy[:self.count]
+        self.xy = xy
+
+    def add(self, t, lat, lon):
+        """Yeni konum; bir öncekinin aynısıysa (aynı okuma tekrar geldiyse) eklenmez"""
+        if self.count and lat == self.lat[self.count - 1] and lon == self.lon[self.count - 1]:
+            return False
+        if self.origin is None:
+            self.origin = (lat, lon, math.cos(math.radians(lat)))
+        if self.count == len(self.t):
+            self._grow()
+
+        i = self.count
+        x, y = self._project(lat, lon)
+        self.t[i], self.lat[i], self.lon[i] = t, lat, lon
+        self.xy[i] = (x, y)
+        self.count += 1
+
+        if self.bounds is None:
+            self.bounds = (x, y, x, y)
+        else:
+            b = self.bounds
+            self.bounds = (min(b[0], x), min(b[1], y), max(b[2], x), max(b[3], y))
+
+        self.grid.setdefault(self._cell(x, y, self.cell_m), []).append(i)
+        self.coarse_grid.setdefault(self._cell(x, y, self.coarse_m), []).append(i)
+
+        # Artımlı seviye: son tutulan noktadan en az adım kadar uzaktaysa eklenir
+        step = LEVEL_BASE_M
+        for level in range(LEVEL_COUNT):
+            last = self._level_last[level]
+            if last is None or math.hypot(x - last[0], y - last[1]) >= step:
+                self.levels[level].append(i)
+                self._level_last[level] = (x, y)
+            step *= 2
+        self.version += 1
+        return True
+
+    @staticmethod
+    def _cell(x, y, size):
+        return int(math.floor(x / size)), int(math.floor(y / size))
+
+    @staticmethod
+    def _ring_cells(cx, cy, ring):
+        """Merkez hücreye Chebyshev uzaklığı tam olarak ring olan hücreler (yalnızca çevre)"""
+        if ring == 0:
+            yield cx, cy
+            return
+        for gx in range(cx - ring, cx + ring + 1):
+            yield gx, cy - ring
+            yield gx, cy + ring
+        for gy in range(cy - ring + 1, cy + ring):
+            yield cx - ring, gy
+            yield cx + ring, gy
+
+    def _ring_search(self, grid, size, x, y, max_ring):
+        """Halkaları genişleterek arar; (indeks, uzaklık) ya da bulunamazsa (None, inf)"""
+        cx, cy = self._cell(x, y, size)
+        best, best_dist = None, float('inf')
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(cx, cy, ring):
+                indices = grid.get(cell)
+                if not indices:
+                    continue
+                pts = self.xy[indices]
+                dist = np.hypot(pts[:, 0] - x, pts[:, 1] - y)
+                j = int(dist.argmin())
+                if dist[j] < best_dist:
+                    best, best_dist = indices[j], float(dist[j])
+            # Sonraki halkadaki hiçbir nokta bulunandan yakın olamaz
+            if best is not None and best_dist <= ring * size:
+                return best, best_dist
+        return best, best_dist
+
+    def nearest(self, x, y, max_distance=None):
+        """En yakın kayıtlı noktanın indeksi: önce ince ızgarada, iz uzaktaysa kaba ızgarada aranır"""
+        if not self.count:
+            return None
+        if max_distance is not None:
+            max_ring = int(math.ceil(max_distance / self.cell_m)) + 1
+            best, dist = self._ring_search(self.grid, self.cell_m, x, y, max_ring)
+            return best if best is not None and dist <= max_distance else None
+
+        best, dist = self._ring_search(self.grid, self.cell_m, x, y, MAX_SEARCH_RINGS)
+        if best is None or dist > MAX_SEARCH_RINGS * self.cell_m:
+            best = self._coarse_nearest(x, y, best, dist)
+        return best
+
+    def _coarse_nearest(self, x, y, best, best_dist):
+        """Dolu kaba hücreler sorguya alt sınır uzaklığına göre sıralanır; alt sınır
+        bulunan en iyi uzaklığı geçince durulur (yalnızca yakın hücrelerin noktaları taranır)"""
+        if self._coarse_cells is None or len(self._coarse_cells) != len(self.coarse_grid):
+            self._coarse_keys = list(self.coarse_grid)
+            self._coarse_cells = np.array(self._coarse_keys, dtype=np.float64)
+        lo = self._coarse_cells * self.coarse_m
+        dx = np.maximum(np.maximum(lo[:, 0] - x, x - (lo[:, 0] + self.coarse_m)), 0.0)
+        dy = np.maximum(np.maximum(lo[:, 1] - y, y - (lo[:, 1] + self.coarse_m)), 0.0)
+        bound = np.hypot(dx, dy)
+        for k in np.argsort(bound):
+            if bound[k] >= best_dist:
+                break
+            indices = self.coarse_grid[self._coarse_keys[k]]
+            pts = self.xy[indices]
+            dist = np.hypot(pts[:, 0] - x, pts[:, 1] - y)
+            j = int(dist.argmin())
+            if dist[j] < best_dist:
+                best, best_dist = indices[j], float(dist[j])
+        return best
+
+    def hit_test(self, x, y, radius):
+        """Verilen yarıçap içinde kayıtlı bir nokta varsa indeksini döndürür"""
+        return self.nearest(x, y, max_distance=radius)
+
+    def point(self, i):
+        return {
+            't': float(self.t[i]), 'lat': float(self.lat[i]), 'lon': float(self.lon[i]),
+            'x': float(self.xy[i, 0]), 'y': float(self.xy[i, 1]),
+        }
+
+    def simplified(self, metres_per_pixel):
+        """Çizilecek noktalar (m cinsinden (n, 2)): ölçeğe uygun seviye + Douglas-Peucker"""
+        if not self.count:
+            return np.zeros((0, 2))
+        level = 0
+        step = LEVEL_BASE_M
+        while level + 1 < LEVEL_COUNT and step * 2 <= metres_per_pixel:
+            level += 1
+            step *= 2
+
+        kept = self._simplify_level(level, step)
+        indices = [self.levels[level][k] for k in kept]
+        if indices[-1] != self.count - 1:
+            indices.append(self.count - 1)      # iz her zaman son konumda biter
+        return self.xy[indices]
+
+    def _simplify_level(self, level, tolerance):
+        """Seviyenin Douglas-Peucker sonucunu artımlı günceller: yalnızca son kararlı
+        noktadan (çapa) sonraki kısım yeniden sadeleştirilir, maliyet iz uzunluğuyla büyümez"""
+        positions = self.levels[level]
+        n = len(positions)
+        kept, anchor, done = self._dp_cache.get(level, ([0], 0, 1))
+        if done == n:
+            return kept
+
+        stable = kept[:anchor + 1]
+        start = stable[-1]
+        seg = self.xy[positions[start:n]]
+        sub = douglas_peucker(seg, tolerance) + start
+        kept = stable + [int(k) for k in sub[1:]]
+        if len(sub) > 2:
+            # Son iç bölme noktasına kadarki kısım bir daha hesaplanmaz
+            anchor = len(kept) - 2
+        if n - kept[anchor] > MAX_DP_TAIL:
+            anchor = len(kept) - 1
+        self._dp_cache[level] = (kept, anchor, n)
+        return kept
@@ -1,50 +1,132 @@
 import sys
 import time
+# Açılış zaman çizelgesinin sıfır noktası: importlar da ölçüme girer
+STARTUP_T0 = time.perf_counter()
+from startup_timeline import StartupTimeline, ImportProfiler
+# --profile-startup: aşağıdaki her import ayrı ölçülür (importlar başlamadan kurulmalı)
+IMPORT_PROFILER = (ImportProfiler().install()
+                   if any(arg.startswith('--profile-startup') for arg in sys.argv) else None)
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QPushButton, QLabel, QGroupBox, QLCDNumber, QSizePolicy,
-    QGraphicsDropShadowEffect, QMessageBox
+    QGraphicsDropShadowEffect, QMessageBox, QSlider, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QEasingCurve, QPropertyAnimation, QRect, QTimer, QUrl
-from PyQt6.QtGui import QColor, QKeyEvent
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings, QWebEnginePage
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QObject, QThread, QEasingCurve, QPropertyAnimation, QRect, QTimer, QUrl, QEvent, QPoint, QPointF
+from PyQt6.QtGui import QColor, QKeyEvent, QPainter, QPen, QPalette, QPolygonF
 import logging
 import tempfile
 import os
-from dotenv import load_dotenv
-from file_server import FileServer
-
-# Logging ayarları
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('ika_app.log')
-    ]
+import json
+import argparse
+import signal
+import threading
+from file_server import FileServer, DEFAULT_TOKEN_ORIGINS
+from perf_monitor import CpuSampler, LabeledStats, OverloadDetector, DEFAULT_CPU_THRESHOLD, DEFAULT_FRAME_LATE_MS
+from frame_tap import FrameTap, DEFAULT_TAP_FPS, DEFAULT_TAP_WIDTH, DEFAULT_TAP_HEIGHT
+from motion_detector import MotionDetector
+from camera_readiness import ReadinessTracker
+from token_provider import create_token_provider
+from camera_topology import load_topology, camera_with_role, grid_columns, select_decoded, DEFAULT_MAX_DECODED
+from recording_session import RecordingSession
+from flight_recorder import FlightRecorder, DEFAULT_LOG_DIR, DEFAULT_MAX_BYTES
+from telemetry_replay import TelemetryReplay, SPEED_STEPS, format_position
+from telemetry_history import TelemetryHistory, DEFAULT_HISTORY_CAPACITY, decimate
+from ui_scheduler import UiUpdateScheduler
+from gps_track import GpsTrack
+from log_pipeline import (
+    LogPipeline, JsConsoleLimiter, DEFAULT_LOG_FILE, DEFAULT_BACKUP_COUNT, DEFAULT_ROTATE_WHEN,
+    DEFAULT_JS_RATE, DEFAULT_JS_BURST, DEFAULT_JS_SAMPLE_EVERY,
 )
+from stall_watchdog import StallWatchdog, DEFAULT_THRESHOLD_MS, DEFAULT_HEARTBEAT_MS, DEFAULT_STALL_LOG
+from input_latency import InputLatencyTracker, CommandSender, DEFAULT_LATENCY_EXPORT
 
-# Environment dosyasını yükle
-load_dotenv('config.env')
+DEFAULT_PROFILE_PATH = 'ika_startup_profile.json'
+# Performans çizim profilinde video karolarının en yüksek yenileme hızı
+DEFAULT_PERF_VIDEO_FPS = 12
+DEFAULT_HEADLESS_PORT = 8080
 
-# Agora kimlik bilgileri - Environment dosyasından alınır
-AGORA_APP_ID = os.getenv('AGORA_APP_ID')
-AGORA_TOKEN = os.getenv('AGORA_TOKEN')
 
-# Kimlik bilgileri kontrolü
-if not AGORA_APP_ID or not AGORA_TOKEN:
-    print("❌ HATA: AGORA_APP_ID veya AGORA_TOKEN bulunamadı!")
-    print("📝 Lütfen config.env dosyasını kontrol edin.")
-    sys.exit(1)
+def token_endpoint_options(cameras):
+    """Dosya sunucusunun /token ayarları: IKA_TOKEN_KEY anahtarı, izinli kökenler ve topolojideki kanallar"""
+    origins = os.getenv('IKA_TOKEN_ORIGINS')
+    return {
+        'token_key': os.getenv('IKA_TOKEN_KEY') or None,
+        'token_channels': {camera.channel for camera in cameras},
+        'token_origins': ([o.strip() for o in origins.split(',') if o.strip()]
+                          if origins is not None else DEFAULT_TOKEN_ORIGINS),
+    }
 
-# Firebase kütüphanelerini import edin (simülasyon modu)
-try:
-    import firebase_admin
-    from firebase_admin import credentials, db
-    FIREBASE_AVAILABLE = True
-except ImportError:
-    FIREBASE_AVAILABLE = False
+
+def setup_logging():
+    """Logging ayarları; modül importunda değil, uygulama başlarken yapılır.
+    Konsola ve dosyaya yazma kuyruk dinleyici thread'inde yapılır; dosya boyuta
+    (IKA_LOG_MAX_MB) ve zamana (IKA_LOG_ROTATE_WHEN) göre döndürülür"""
+    return LogPipeline(
+        os.getenv('IKA_LOG_FILE', DEFAULT_LOG_FILE),
+        max_bytes=int(float(os.getenv('IKA_LOG_MAX_MB', '10')) * 1024 * 1024),
+        backup_count=int(os.getenv('IKA_LOG_BACKUPS', DEFAULT_BACKUP_COUNT)),
+        when=os.getenv('IKA_LOG_ROTATE_WHEN', DEFAULT_ROTATE_WHEN),
+    ).start()
+
+
+# Agora kimlik bilgileri - load_config ile environment dosyasından alınır
+AGORA_APP_ID = None
+AGORA_TOKEN = None
+
+
+def load_config(path='config.env'):
+    """Environment dosyasını yükler; eksik Agora kimlik bilgilerinin adlarını döndürür"""
+    global AGORA_APP_ID, AGORA_TOKEN
+    from dotenv import load_dotenv
+    load_dotenv(path)
+    AGORA_APP_ID = os.getenv('AGORA_APP_ID')
+    AGORA_TOKEN = os.getenv('AGORA_TOKEN')
+    return [name for name, value in (('AGORA_APP_ID', AGORA_APP_ID), ('AGORA_TOKEN', AGORA_TOKEN))
+            if not value]
+
+
+def missing_credentials(tokens):
+    """Yayın başlatılırken eksik kimlik bilgileri: App ID ve token bulunamayan kanallar.
+    tokens: kanal -> token. Oynatma ve açılış profili Agora'ya bağlanmadığı için
+    kontrol açılışta değil, yayın başlarken yapılır; boş liste dönerse yayın başlatılabilir"""
+    missing = [] if AGORA_APP_ID else ['AGORA_APP_ID']
+    channels = [channel for channel, token in tokens.items() if not token]
+    if channels:
+        missing.append(f"AGORA_TOKEN ({', '.join(channels)})")
+    return missing
+
+
+# Firebase kütüphaneleri (grpc, google-auth) ağırdır; FirebaseThread başlarken load_firebase ile import edilir
+firebase_admin = credentials = db = None
+FIREBASE_AVAILABLE = False
+_firebase_import_tried = False
+
+
+def load_firebase():
+    """firebase_admin'i ilk çağrıda import eder (simülasyon modu: yoksa False)"""
+    global firebase_admin, credentials, db, FIREBASE_AVAILABLE, _firebase_import_tried
+    if not _firebase_import_tried:
+        _firebase_import_tried = True
+        try:
+            import firebase_admin
+            from firebase_admin import credentials, db
+            FIREBASE_AVAILABLE = True
+        except ImportError:
+            FIREBASE_AVAILABLE = False
+    return FIREBASE_AVAILABLE
+
+
+# QtWebEngine (Chromium) ilk kamera sayfası oluşturulurken yüklenir; bunun için
+# QApplication'dan önce AA_ShareOpenGLContexts ayarlanır (bkz. __main__)
+QWebEngineView = QWebEngineProfile = QWebEngineSettings = QWebEnginePage = QWebChannel = None
+
+
+def load_webengine():
+    global QWebEngineView, QWebEngineProfile, QWebEngineSettings, QWebEnginePage, QWebChannel
+    if QWebEngineView is None:
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings, QWebEnginePage
+        from PyQt6.QtWebChannel import QWebChannel
 
 # Camera 
 class CameraPanel(QLabel):
@@ -67,13 +149,233 @@ class CameraPanel(QLabel):
 
 
 
+# Sensör geçmişi grafiği
+class SparklineWidget(QWidget):
+    """Sinyal geçmişini genişliği kadar noktaya seyreltip çizer; rengi QSS'ten (color) alır"""
+
+    def __init__(self, history, method='minmax'):
+        super().__init__()
+        self.history = history
+        self.method = method
+        self._drawn_version = -1
+        self.setMinimumSize(90, 28)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+    def needs_redraw(self):
+        return self.history.version != self._drawn_version
+
+    def paintEvent(self, event):
+        self._drawn_version = self.history.version
+        if len(self.history) < 2:
+            return
+        t, v = self.history.ordered()
+        t, v = decimate(t, v, max(4, self.width()), self.method)
+
+        w, h, margin = self.width(), self.height(), 3
+        t_span = float(t[-1] - t[0]) or 1.0
+        v_min, v_max = float(v.min()), float(v.max())
+        v_span = (v_max - v_min) or 1.0
+        xs = (t - t[0]) / t_span * (w - 1)
+        ys = (h - margin) - (v - v_min) / v_span * (h - 2 * margin)
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self.palette().color(QPalette.ColorRole.WindowText), 1.2))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]))
+        painter.end()
+
+
+# GPS iz haritası (çevrimdışı, altlık harita yok)
+class TrackMapWidget(QWidget):
+    """İzi sığacak şekilde ölçekleyip sadeleştirilmiş çizgi olarak çizer.
+    Fareyle üzerine gelinen kayıtlı nokta ızgara indeksiyle bulunur ve gösterilir."""
+
+    HIT_RADIUS_PX = 8
+    PADDING_PX = 10
+
+    def __init__(self, track):
+        super().__init__()
+        self.track = track
+        self._drawn_version = -1
+        self._hover = None
+        self._transform = None      # (ölçek m/px, min_x, max_y, x ofseti, y ofseti)
+        self.setMinimumHeight(140)
+        self.setMouseTracking(True)
+        # QSS arka planı/çerçevesi özel paintEvent'ten önce çizilsin
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+
+    def needs_redraw(self):
+        return self.track.version != self._drawn_version
+
+    def _fit(self):
+        min_x, min_y, max_x, max_y = self.track.bounds
+        w = max(1, self.width() - 2 * self.PADDING_PX)
+        h = max(1, self.height() - 2 * self.PADDING_PX)
+        scale = max((max_x - min_x) / w, (max_y - min_y) / h, 0.05)
+        off_x = self.PADDING_PX + (w - (max_x - min_x) / scale) / 2
+        off_y = self.PADDING_PX + (h - (max_y - min_y) / scale) / 2
+        self._transform = (scale, min_x, max_y, off_x, off_y)
+
+    def _to_screen(self, xy):
+        scale, min_x, max_y, off_x, off_y = self._transform
+        return (xy[:, 0] - min_x) / scale + off_x, (max_y - xy[:, 1]) / scale + off_y
+
+    def _to_track(self, px, py):
+        scale, min_x, max_y, off_x, off_y = self._transform
+        return (px - off_x) * scale + min_x, max_y - (py - off_y) * scale
+
+    def paintEvent(self, event):
+        self._drawn_version = self.track.version
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        color = self.palette().color(QPalette.ColorRole.WindowText)
+        if not len(self.track):
+            painter.setPen(color)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "GPS verisi bekleniyor")
+            painter.end()
+            return
+
+        self._fit()
+        # Piksel başına düşen metreye göre sadeleştirilmiş iz: nokta sayısı iz uzunluğundan bağımsız
+        points = self.track.simplified(self._transform[0])
+        xs, ys = self._to_screen(points)
+        painter.setPen(QPen(color, 2))
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]))
+
+        # Son konum
+        last = self.track.xy[len(self.track) - 1:len(self.track)]
+        lx, ly = self._to_screen(last)
+        painter.setBrush(QColor('#f97316'))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawEllipse(QPointF(float(lx[0]), float(ly[0])), 4, 4)
+
+        if self._hover is not None and self._hover < len(self.track):
+            hx, hy = self._to_screen(self.track.xy[self._hover:self._hover + 1])
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.setPen(QPen(QColor('#facc15'), 2))
+            painter.drawEllipse(QPointF(float(hx[0]), float(hy[0])), 5, 5)
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        if self._transform is None or not len(self.track):
+            return
+        pos = event.position()
+        x, y = self._to_track(pos.x(), pos.y())
+        hover = self.track.hit_test(x, y, self.HIT_RADIUS_PX * self._transform[0])
+        if hover != self._hover:
+            self._hover = hover
+            if hover is None:
+                self.setToolTip("")
+            else:
+                p = self.track.point(hover)
+                self.setToolTip(f"{p['lat']:.6f}, {p['lon']:.6f}\n"
+                                f"{time.strftime('%H:%M:%S', time.localtime(p['t']))}")
+            self.update()
+
+    def leaveEvent(self, event):
+        if self._hover is not None:
+            self._hover = None
+            self.update()
+
+
+class InputLatencyPanel(QWidget):
+    """Tanılama penceresi: komut başına girişten onaya gecikme yüzdelikleri (ms).
+    Açıkken saniyede bir yenilenir; JSON dışa aktarma düğmesi oturum özetini yazar."""
+
+    COLUMNS = ("Komut", "n", "p50", "p95", "p99", "maks", "işleme p50", "kuyruk p50", "ağ p50")
+
+    def __init__(self, tracker, export_path, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool)
+        self.tracker = tracker
+        self.export_path = export_path
+        self.setWindowTitle("Tanılama — Giriş Gecikmesi")
+        self.resize(720, 360)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        export_btn = QPushButton("JSON olarak dışa aktar")
+        export_btn.clicked.connect(self.export)
+        layout.addWidget(export_btn)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        rows = self.tracker.snapshot()
+        self.table.setRowCount(len(rows))
+        for r, (command, stages) in enumerate(rows.items()):
+            total = stages['total']
+            values = [command, str(total['count'])]
+            values += [f"{total[key]:.1f}" for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]
+            values += [f"{stages[name]['p50_ms']:.1f}" for name in ('handle', 'queue', 'network')]
+            for c, value in enumerate(values):
+                item = self.table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if c:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.table.setItem(r, c, item)
+                item.setText(value)
+        failures = sum(self.tracker.failures.values())
+        superseded = sum(self.tracker.superseded.values())
+        self.summary_label.setText(
+            f"{self.tracker.sample_count()} komut onaylandı"
+            + (f", {failures} gönderim başarısız" if failures else "")
+            + (f", {superseded} komut yenisiyle birleşti" if superseded else "")
+            + " — giriş: tuş/fare olayı, onay: veritabanı yazması döndü"
+        )
+
+    def export(self):
+        path = self.tracker.export(self.export_path)
+        if path:
+            self.summary_label.setText(f"✅ Dışa aktarıldı: {path}")
+
+
+# Sayfadan Python'a olay köprüsü (QWebChannel)
+class CameraBridge(QObject):
+    phase_reported = pyqtSignal(str, float, str)
+
+    @pyqtSlot(str, float, str)
+    def reportPhase(self, phase, elapsed_ms, detail):
+        self.phase_reported.emit(phase, elapsed_ms, detail)
+
+
 # Agora Camera Panel for remote video streaming
 class AgoraCameraPanel(QWidget):
-    def __init__(self, camera_name: str):
+    # camera_key, aşama, startStream'den itibaren geçen ms, detay
+    phase_reported = pyqtSignal(str, str, float, str)
+
+    def __init__(self, camera_name: str, camera_key: str = None):
         super().__init__()
         self.camera_name = camera_name
+        # Gönderici tarafındaki cameraType ile aynı anahtar (front / laser / back)
+        self.camera_key = camera_key
         self.setMinimumSize(600, 400)  # 1440x900 için optimize edilmiş minimum boyut
         self.is_streaming = False
+        self.file_server_port = 8080
+        # Agora kanal adı (start_stream ile atanır); sayfa köprüsü web_channel'dadır
+        self.channel = None
+        self.web_channel = None
+        self.video_visible = True
+        self.high_quality = True
+        # 0: video sayfada normal oynatılır; > 0: en fazla bu kadar fps boyanır
+        self.render_fps = 0
         self.html_file = None
         
         # Layout - tam doluluk için
@@ -81,17 +383,55 @@ class AgoraCameraPanel(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         
+        # WebView açılışta pencere gösterildikten sonra attach_webview ile oluşturulur;
+        # o zamana kadar yer tutucu görünür
+        self.webview = None
+        self.placeholder = QLabel(f"{camera_name}\nKamera sayfası hazırlanıyor…")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        layout.addWidget(self.placeholder)
+
+    def attach_webview(self):
+        """WebView'i (Chromium sayfası) oluşturur ve HTML'i yükler; GUI thread'inde çağrılmalı"""
+        if self.webview is not None:
+            return
+        load_webengine()
         # WebView for video - tam doluluk
         self.webview = QWebEngineView()
         self.webview.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        layout.addWidget(self.webview)
+        self.layout().replaceWidget(self.placeholder, self.webview)
+        self.placeholder.deleteLater()
+        self.placeholder = None
         
         # Setup WebView
         self.setup_webview()
         
+        # Sayfa yokken verilen görünürlük/kalite kararları yüklenince uygulanır
+        self.webview.loadFinished.connect(self._sync_page_state)
+        
         # Create HTML content
         self.html_file = self.create_webview_html()
         self.webview.setUrl(QUrl.fromLocalFile(self.html_file))
+
+    def _sync_page_state(self, ok):
+        # Sayfa görünür ve yüksek kaliteyle açılır; yalnızca farklı olanlar gönderilir
+        if ok and not self.video_visible:
+            self.run_js("setVideoVisible(false)")
+        if ok and not self.high_quality:
+            self.run_js("setStreamQuality(false)")
+        if ok and self.render_fps:
+            self.run_js(f"setRenderRate({self.render_fps})")
+
+    def run_js(self, js_code, callback=None):
+        """Sayfada JavaScript çalıştırır; WebView henüz oluşturulmadıysa çağrı atlanır"""
+        if self.webview is None:
+            logging.debug(f"{self.camera_name}: sayfa hazır değil, atlandı: {js_code[:40]}")
+            return False
+        if callback is None:
+            self.webview.page().runJavaScript(js_code)
+        else:
+            self.webview.page().runJavaScript(js_code, callback)
+        return True
     
     def setup_webview(self):
         """WebView ayarlarını yapılandırır"""
@@ -109,12 +449,19 @@ class AgoraCameraPanel(QWidget):
         
         # Özel sayfa sınıfı oluştur
         class WebEnginePage(QWebEnginePage):
-            def __init__(self, profile, parent=None):
+            def __init__(self, profile, parent=None, console=None):
                 super().__init__(profile, parent)
+                self.console = console
                 self.featurePermissionRequested.connect(self.handlePermissionRequest)
                 
             def javaScriptConsoleMessage(self, level, message, line, source):
-                logging.debug(f"JS [L{line}] {message}")
+                # Sayfa başına hız sınırlı; JS bilgi satırları DEBUG, uyarı/hatalar kendi seviyesinde
+                if level == QWebEnginePage.JavaScriptConsoleMessageLevel.ErrorMessageLevel:
+                    self.console.log(logging.ERROR, message, line)
+                elif level == QWebEnginePage.JavaScriptConsoleMessageLevel.WarningMessageLevel:
+                    self.console.log(logging.WARNING, message, line)
+                else:
+                    self.console.log(logging.DEBUG, message, line)
                 
             def handlePermissionRequest(self, url, feature):
                 if feature in [QWebEnginePage.Feature.MediaAudioCapture,
@@ -128,9 +475,24 @@ class AgoraCameraPanel(QWidget):
                     logging.debug(f"Medya izni verildi: {feature}")
         
         # Özel sayfayı ayarla
-        self.page = WebEnginePage(profile, self.webview)
+        self.js_console = JsConsoleLimiter(
+            self.camera_key or self.camera_name,
+            rate=float(os.getenv('IKA_JS_LOG_RATE', DEFAULT_JS_RATE)),
+            burst=int(os.getenv('IKA_JS_LOG_BURST', DEFAULT_JS_BURST)),
+            sample_every=int(os.getenv('IKA_JS_LOG_SAMPLE_EVERY', DEFAULT_JS_SAMPLE_EVERY)),
+        )
+        self.page = WebEnginePage(profile, self.webview, self.js_console)
         self.webview.setPage(self.page)
         
+        # Başlatma aşamalarını sayfadan almak için köprü
+        self.bridge = CameraBridge(self)
+        self.bridge.phase_reported.connect(
+            lambda phase, ms, detail: self.phase_reported.emit(self.camera_key or self.camera_name, phase, ms, detail)
+        )
+        self.web_channel = QWebChannel(self.page)
+        self.web_channel.registerObject('bridge', self.bridge)
+        self.page.setWebChannel(self.web_channel)
+        
 
     
     def create_webview_html(self):
@@ -144,6 +506,7 @@ class AgoraCameraPanel(QWidget):
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Agora Remote Video</title>
         <script src="https://download.agora.io/sdk/release/AgoraRTC_N-4.19.3.js"></script>
+        <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
         <style>
             * {
                 margin: 0;
@@ -243,6 +606,35 @@ class AgoraCameraPanel(QWidget):
                 height: 100%;
                 overflow: hidden;
             }
+            
+            /* Performans profili: sınırlı hızda boyanan görüntü (bkz. setRenderRate) */
+            #renderCanvas {
+                position: absolute;
+                top: 0;
+                left: 0;
+                width: 100%;
+                height: 100%;
+                display: none;
+                background: #000;
+            }
+            
+            /* Hareket algılama bölgeleri */
+            #motionOverlay {
+                position: absolute;
+                top: 0;
+                left: 0;
+                width: 100%;
+                height: 100%;
+                pointer-events: none;
+                z-index: 998;
+            }
+            
+            .motion-box {
+                position: absolute;
+                border: 2px solid #ff3b30;
+                background: rgba(255,59,48,0.12);
+                border-radius: 4px;
+            }
         </style>
     </head>
     <body>
@@ -251,7 +643,11 @@ class AgoraCameraPanel(QWidget):
             <div class="video-wrapper">
                 <div class="video-item">
                     <video id="remoteVideo" autoplay muted></video>
+                    <video id="tapVideo" autoplay muted playsinline style="position:absolute;width:1px;height:1px;opacity:0;pointer-events:none"></video>
+                    <video id="renderVideo" autoplay muted playsinline style="position:absolute;width:1px;height:1px;opacity:0;pointer-events:none"></video>
                 </div>
+                <canvas id="renderCanvas"></canvas>
+                <div id="motionOverlay"></div>
                 <div class="loading" id="loading">Video bekleniyor...</div>
             </div>
         </div>
@@ -260,6 +656,34 @@ class AgoraCameraPanel(QWidget):
             let agoraClient = null;
             let isStreaming = false;
             let loadingElement = null;
+            let remoteVideoUser = null;
+            let videoPaused = false;
+            let preferHighStream = true;
+            let pyBridge = null;
+            let streamStartTime = 0;
+            
+            if (typeof QWebChannel !== 'undefined' && typeof qt !== 'undefined') {
+                new QWebChannel(qt.webChannelTransport, function(channel) {
+                    pyBridge = channel.objects.bridge;
+                });
+            }
+            
+            // Başlatma aşamasını Python'a bildir (startStream'den itibaren geçen ms ile)
+            function reportPhase(phase, detail = '') {
+                const elapsed = performance.now() - streamStartTime;
+                console.log('Aşama: ' + phase + ' (' + elapsed.toFixed(0) + ' ms) ' + detail);
+                if (pyBridge) {
+                    pyBridge.reportPhase(phase, elapsed, String(detail));
+                }
+            }
+            
+            // Başlatma dışı olaylar (kesinti, yeniden bağlanma): değer olayın kendi süresidir (ms)
+            function reportEvent(name, valueMs, detail = '') {
+                console.log('Olay: ' + name + ' (' + valueMs.toFixed(0) + ' ms) ' + detail);
+                if (pyBridge) {
+                    pyBridge.reportPhase(name, valueMs, String(detail));
+                }
+            }
             
             function updateStatus(message, type = 'info') {
                 const statusEl = document.getElementById('status');
@@ -295,6 +719,177 @@ class AgoraCameraPanel(QWidget):
                 }
             }
             
+            // Yeniden bağlanma durum makinesi: connected -> outage -> backoff -> rejoining -> connected
+            const RECONNECT_BASE_MS = 500;
+            const RECONNECT_MAX_MS = 15000;
+            const RECONNECT_STALL_MS = 10000;  // SDK'nın kendi denemesi bu kadar sürerse kanala yeniden katıl
+            let streamParams = null;
+            let reconnect = { state: 'idle', attempt: 0, timer: null, stallTimer: null, outageStart: null };
+            
+            // Eşit jitter'lı üstel bekleme: [cap/2, cap)
+            function backoffDelay(attempt) {
+                const cap = Math.min(RECONNECT_MAX_MS, RECONNECT_BASE_MS * Math.pow(2, attempt));
+                return cap / 2 + Math.random() * cap / 2;
+            }
+            
+            function beginOutage(reason) {
+                if (reconnect.outageStart === null) {
+                    reconnect.outageStart = performance.now();
+                    reportEvent('outage', 0, reason);
+                }
+            }
+            
+            function endOutage() {
+                clearTimeout(reconnect.stallTimer);
+                reconnect.stallTimer = null;
+                reconnect.attempt = 0;
+                reconnect.state = 'connected';
+                if (reconnect.outageStart !== null) {
+                    const outageMs = performance.now() - reconnect.outageStart;
+                    reconnect.outageStart = null;
+                    reportEvent('recovered', outageMs, '');
+                    updateStatus('✅ Yeniden bağlandı (' + (outageMs / 1000).toFixed(1) + ' sn kesinti)', 'success');
+                }
+            }
+            
+            function scheduleRejoin(reason) {
+                if (!isStreaming || reconnect.timer) {
+                    return;
+                }
+                const delay = backoffDelay(reconnect.attempt);
+                reconnect.attempt++;
+                reconnect.state = 'backoff';
+                reportEvent('reconnecting', delay, 'deneme ' + reconnect.attempt + ': ' + reason);
+                updateStatus('🔄 Yeniden bağlanılıyor (' + reconnect.attempt + '. deneme, ' + (delay / 1000).toFixed(1) + ' sn)', 'warning');
+                reconnect.timer = setTimeout(rejoin, delay);
+            }
+            
+            async function rejoin() {
+                reconnect.timer = null;
+                if (!isStreaming) {
+                    return;
+                }
+                // stopStream (ya da ardından yeni bir startStream) reconnect nesnesini değiştirir;
+                // her await'ten sonra bu deneme hâlâ geçerli mi diye bakılır
+                const attempt = reconnect;
+                const cancelled = () => !isStreaming || reconnect !== attempt;
+                attempt.state = 'rejoining';
+                const oldClient = agoraClient;
+                agoraClient = null;
+                remoteVideoUser = null;
+                if (oldClient) {
+                    oldClient.removeAllListeners();
+                    try {
+                        await oldClient.leave();
+                    } catch (error) {
+                        console.warn('Eski istemciden çıkılamadı:', error);
+                    }
+                }
+                if (cancelled()) {
+                    return;
+                }
+                try {
+                    // Katılımdan sonra kanaldaki yayıncı için user-published tekrar gelir ve yeniden abone olunur
+                    const client = await joinChannel();
+                    if (cancelled()) {
+                        // Katılım sürerken yayın durduruldu; bu istemci kanalda bırakılmaz
+                        if (client !== agoraClient) {
+                            client.removeAllListeners();
+                            client.leave().catch(error => console.warn('İstemciden çıkılamadı:', error));
+                        }
+                        return;
+                    }
+                    if (reconnect.outageStart !== null && client.connectionState === 'CONNECTED') {
+                        endOutage();
+                    }
+                } catch (error) {
+                    if (cancelled()) {
+                        return;
+                    }
+                    console.error('Yeniden katılım hatası:', error);
+                    scheduleRejoin(error.message);
+                }
+            }
+            
+            function createClient() {
+                const client = AgoraRTC.createClient({ 
+                    mode: "rtc", 
+                    codec: "vp8",
+                    role: "audience"
+                });
+                
+                client.on("error", (error) => {
+                    console.error('Agora istemci hatası:', error);
+                    updateStatus('❌ Agora hatası: ' + error.message, 'error');
+                    showLoading(false);
+                });
+                
+                client.on("connection-state-change", (curState, prevState, reason) => {
+                    // Yeniden katılımda bırakılan eski istemcinin olaylarını yok say
+                    if (client !== agoraClient) {
+                        return;
+                    }
+                    console.log('Bağlantı durumu:', prevState, '->', curState, 'Neden:', reason);
+                    updateStatus('Bağlantı: ' + curState, 'info');
+                    
+                    if (curState === 'CONNECTED') {
+                        showLoading(false);
+                        endOutage();
+                    } else if (curState === 'RECONNECTING') {
+                        // SDK kendisi deniyor; uzun sürerse kanala baştan katıl
+                        beginOutage(reason || 'RECONNECTING');
+                        clearTimeout(reconnect.stallTimer);
+                        reconnect.stallTimer = setTimeout(() => scheduleRejoin('RECONNECTING zaman aşımı'), RECONNECT_STALL_MS);
+                    } else if (curState === 'DISCONNECTED' && reason !== 'LEAVE' && isStreaming) {
+                        beginOutage(reason || 'DISCONNECTED');
+                        scheduleRejoin(reason || 'DISCONNECTED');
+                    }
+                });
+                
+                client.on("user-published", handleUserPublished);
+                client.on("user-unpublished", handleUserUnpublished);
+                
+                // Token süresi dolmadan Python'dan yenisini iste; renewToken ile kanaldan çıkmadan uygulanır
+                client.on("token-privilege-will-expire", () => {
+                    if (client === agoraClient) {
+                        reportEvent('token_will_expire', 0, streamParams.channel);
+                    }
+                });
+                client.on("token-privilege-did-expire", () => {
+                    if (client === agoraClient) {
+                        updateStatus('❌ Token süresi doldu', 'error');
+                        reportEvent('token_expired', 0, streamParams.channel);
+                    }
+                });
+                return client;
+            }
+            
+            async function joinChannel() {
+                const client = agoraClient = createClient();
+                const { appId, token, channel } = streamParams;
+                await client.join(appId, channel, token, null);
+                return client;
+            }
+            
+            async function renewToken(token) {
+                if (!streamParams) {
+                    return;
+                }
+                // Yeniden katılım gerekirse de yeni token kullanılsın
+                streamParams.token = token;
+                if (!agoraClient || agoraClient.connectionState !== 'CONNECTED') {
+                    return;
+                }
+                try {
+                    await agoraClient.renewToken(token);
+                    updateStatus('🔑 Token yenilendi', 'success');
+                    reportEvent('token_renewed', 0, streamParams.channel);
+                } catch (error) {
+                    console.error('Token yenileme hatası:', error);
+                    updateStatus('❌ Token yenilenemedi: ' + error.message, 'error');
+                }
+            }
+            
             async function startStream(appId, token, channel) {
                 if (isStreaming) {
                     updateStatus('Zaten yayın yapılıyor!', 'warning');
@@ -302,43 +897,25 @@ class AgoraCameraPanel(QWidget):
                 }
                 
                 try {
+                    streamStartTime = performance.now();
+                    streamParams = { appId: appId, token: token, channel: channel };
                     showLoading(true);
                     updateStatus('Agora istemcisi başlatılıyor...', 'info');
-                    
-                    agoraClient = AgoraRTC.createClient({ 
-                        mode: "rtc", 
-                        codec: "vp8",
-                        role: "audience"
-                    });
-                    
-                    agoraClient.on("error", (error) => {
-                        console.error('Agora istemci hatası:', error);
-                        updateStatus('❌ Agora hatası: ' + error.message, 'error');
-                        showLoading(false);
-                    });
-                    
-                    agoraClient.on("connection-state-change", (curState, prevState, reason) => {
-                        console.log('Bağlantı durumu:', prevState, '->', curState, 'Neden:', reason);
-                        updateStatus('Bağlantı: ' + curState, 'info');
-                        
-                        if (curState === 'CONNECTED') {
-                            showLoading(false);
-                        }
-                    });
-                    
-                    agoraClient.on("user-published", handleUserPublished);
-                    agoraClient.on("user-unpublished", handleUserUnpublished);
+                    reportPhase('sdk_ready');
                     
                     updateStatus('Kanala katılım yapılıyor...', 'info');
-                    await agoraClient.join(appId, channel, token, null);
+                    await joinChannel();
+                    reportPhase('joined');
                     
                     isStreaming = true;
+                    reconnect.state = 'connected';
                     updateStatus('✅ Bağlantı kuruldu, yayın bekleniyor...', 'success');
                     
                 } catch (error) {
                     console.error('Hata:', error);
                     updateStatus('❌ Hata: ' + error.message, 'error');
                     showLoading(false);
+                    reportPhase('failed', error.message);
                 }
             }
             
@@ -352,17 +929,24 @@ class AgoraCameraPanel(QWidget):
                     updateStatus('Yayın durduruluyor...', 'info');
                     showLoading(true);
                     
+                    // Bekleyen yeniden bağlanma denemelerini iptal et
+                    isStreaming = false;
+                    clearTimeout(reconnect.timer);
+                    clearTimeout(reconnect.stallTimer);
+                    reconnect = { state: 'idle', attempt: 0, timer: null, stallTimer: null, outageStart: null };
+                    
                     if (agoraClient) {
                         await agoraClient.leave();
                         agoraClient = null;
                     }
+                    remoteVideoUser = null;
+                    stopFrameTap();
                     
                     const video = document.getElementById('remoteVideo');
                     if (video) {
                         video.srcObject = null;
                     }
                     
-                    isStreaming = false;
                     updateStatus('✅ Yayın durduruldu.', 'success');
                     showLoading(false);
                     
@@ -376,9 +960,26 @@ class AgoraCameraPanel(QWidget):
             async function handleUserPublished(user, mediaType) {
                 updateStatus('Uzak kullanıcı yayın başlattı: ' + user.uid, 'info');
                 
+                if (mediaType === 'video') {
+                    remoteVideoUser = user;
+                    document.getElementById('tapVideo').srcObject = null;
+                    document.getElementById('renderVideo').srcObject = null;
+                    // Panel gizliyken abone olma, görünür olunca setVideoVisible abone olur
+                    if (videoPaused) {
+                        updateStatus('⏸️ Görüntü duraklatıldı (panel gizli)', 'info');
+                        return;
+                    }
+                }
+                
+                if (mediaType === 'video') {
+                    await applyStreamType();
+                }
                 await agoraClient.subscribe(user, mediaType);
                 
                 if (mediaType === 'video') {
+                    reportPhase('subscribed');
+                    user.videoTrack.once('first-frame-decoded', () => reportPhase('first_frame'));
+                    
                     const video = document.getElementById('remoteVideo');
                     user.videoTrack.play("remoteVideo");
                     
@@ -396,11 +997,247 @@ class AgoraCameraPanel(QWidget):
                 }
             }
             
-            function handleUserUnpublished(user) {
+            function handleUserUnpublished(user, mediaType) {
+                if (mediaType === 'video' && remoteVideoUser && remoteVideoUser.uid === user.uid) {
+                    remoteVideoUser = null;
+                    document.getElementById('tapVideo').srcObject = null;
+                    document.getElementById('renderVideo').srcObject = null;
+                }
                 updateStatus('Uzak kullanıcı yayın durdurdu: ' + user.uid, 'info');
                 showLoading(true);
             }
             
+            // Gönderici dual stream yayınlar: odaktaki panel yüksek, diğerleri düşük akışı ister
+            async function applyStreamType() {
+                if (!agoraClient || !remoteVideoUser) {
+                    return;
+                }
+                try {
+                    await agoraClient.setRemoteVideoStreamType(remoteVideoUser.uid, preferHighStream ? 0 : 1);
+                } catch (error) {
+                    console.error('Akış tipi ayarlanamadı:', error);
+                }
+            }
+            
+            async function setStreamQuality(high) {
+                preferHighStream = high;
+                await applyStreamType();
+                updateStatus(high ? '🔍 Yüksek kalite akış' : 'Düşük kalite akış', 'info');
+            }
+            
+            // Python tarafının bant genişliği ölçümü için anlık alım istatistikleri
+            function getStreamStats() {
+                if (!agoraClient || !remoteVideoUser || videoPaused) {
+                    return { receiveBitrate: 0, decodeFrameRate: 0, width: 0, height: 0, high: preferHighStream };
+                }
+                const stats = agoraClient.getRemoteVideoStats()[remoteVideoUser.uid] || {};
+                return {
+                    receiveBitrate: stats.receiveBitrate || 0,
+                    decodeFrameRate: stats.decodeFrameRate || 0,
+                    width: stats.receiveResolutionWidth || 0,
+                    height: stats.receiveResolutionHeight || 0,
+                    high: preferHighStream
+                };
+            }
+            
+            // Uzak video track'inden MediaStream (kayıt ve kare musluğu için)
+            function getRemoteStream() {
+                const video = document.getElementById('remoteVideo');
+                if (video && video.srcObject) {
+                    return video.srcObject;
+                }
+                if (remoteVideoUser && remoteVideoUser.videoTrack) {
+                    return new MediaStream([remoteVideoUser.videoTrack.getMediaStreamTrack()]);
+                }
+                return null;
+            }
+            
+            // Kare musluğu: belirli hız/çözünürlükte kareleri ham RGBA olarak Python'a gönderir
+            let frameTap = null;
+            
+            function startFrameTap(camera, fps, width, height, endpoint) {
+                stopFrameTap();
+                const canvas = document.createElement('canvas');
+                canvas.width = width;
+                canvas.height = height;
+                frameTap = {
+                    camera: camera,
+                    width: width,
+                    height: height,
+                    url: endpoint + '/frames/' + camera,
+                    ctx: canvas.getContext('2d', { willReadFrequently: true }),
+                    busy: false,
+                    sent: 0,
+                    dropped: 0,
+                    timer: null
+                };
+                frameTap.timer = setInterval(grabFrame, 1000 / fps);
+                updateStatus('Kare musluğu: ' + fps + ' fps ' + width + 'x' + height, 'info');
+            }
+            
+            function stopFrameTap() {
+                if (frameTap) {
+                    clearInterval(frameTap.timer);
+                    frameTap = null;
+                }
+                const tapVideo = document.getElementById('tapVideo');
+                if (tapVideo) {
+                    tapVideo.srcObject = null;
+                }
+            }
+            
+            async function grabFrame() {
+                const tap = frameTap;
+                if (!tap || videoPaused) {
+                    return;
+                }
+                // Önceki kare hâlâ gönderiliyorsa bu kareyi at, kuyruk oluşturma
+                if (tap.busy) {
+                    tap.dropped++;
+                    return;
+                }
+                const tapVideo = document.getElementById('tapVideo');
+                if (!tapVideo.srcObject) {
+                    const stream = getRemoteStream();
+                    if (!stream) {
+                        return;
+                    }
+                    tapVideo.srcObject = stream;
+                }
+                if (tapVideo.readyState < 2) {
+                    return;
+                }
+                
+                tap.busy = true;
+                try {
+                    tap.ctx.drawImage(tapVideo, 0, 0, tap.width, tap.height);
+                    const pixels = tap.ctx.getImageData(0, 0, tap.width, tap.height).data;
+                    await fetch(tap.url, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/octet-stream',
+                            'X-Frame-Width': String(tap.width),
+                            'X-Frame-Height': String(tap.height),
+                            'X-Frame-Timestamp': String(Date.now())
+                        },
+                        body: pixels
+                    });
+                    tap.sent++;
+                } catch (error) {
+                    console.error('Kare gönderme hatası:', error);
+                } finally {
+                    tap.busy = false;
+                }
+            }
+            
+            // Performans profili: görüntü saniyede en fazla fps kez tuvale kopyalanır,
+            // video katmanı boyanmaz (fps = 0: normal oynatma)
+            let renderLimiter = null;
+            
+            function setRenderRate(fps) {
+                const item = document.querySelector('.video-item');
+                const canvas = document.getElementById('renderCanvas');
+                const source = document.getElementById('renderVideo');
+                if (renderLimiter) {
+                    clearInterval(renderLimiter);
+                    renderLimiter = null;
+                }
+                if (!fps) {
+                    canvas.style.display = 'none';
+                    item.style.visibility = 'visible';
+                    source.srcObject = null;
+                    return;
+                }
+                const ctx = canvas.getContext('2d', { alpha: false });
+                canvas.style.display = 'block';
+                item.style.visibility = 'hidden';
+                renderLimiter = setInterval(() => drawLimitedFrame(ctx, canvas, source), 1000 / fps);
+                updateStatus('Video yenileme: ' + fps + ' fps', 'info');
+            }
+            
+            function drawLimitedFrame(ctx, canvas, source) {
+                if (videoPaused) {
+                    return;
+                }
+                if (!source.srcObject) {
+                    const stream = getRemoteStream();
+                    if (!stream) {
+                        return;
+                    }
+                    source.srcObject = stream;
+                }
+                if (source.readyState < 2) {
+                    return;
+                }
+                const w = canvas.clientWidth;
+                const h = canvas.clientHeight;
+                if (canvas.width !== w || canvas.height !== h) {
+                    canvas.width = w;
+                    canvas.height = h;
+                }
+                // <video>'daki object-fit: cover ile aynı kırpma
+                const scale = Math.max(w / source.videoWidth, h / source.videoHeight);
+                const sw = w / scale;
+                const sh = h / scale;
+                ctx.drawImage(source, (source.videoWidth - sw) / 2, (source.videoHeight - sh) / 2, sw, sh, 0, 0, w, h);
+            }
+            
+            // Hareket bölgelerini (normalize x, y, w, h) video üzerinde göster
+            let motionClearTimer = null;
+            
+            function showMotionRegions(boxes) {
+                const overlay = document.getElementById('motionOverlay');
+                overlay.innerHTML = '';
+                boxes.forEach(box => {
+                    const el = document.createElement('div');
+                    el.className = 'motion-box';
+                    el.style.left = (box[0] * 100) + '%';
+                    el.style.top = (box[1] * 100) + '%';
+                    el.style.width = (box[2] * 100) + '%';
+                    el.style.height = (box[3] * 100) + '%';
+                    overlay.appendChild(el);
+                });
+                clearTimeout(motionClearTimer);
+                motionClearTimer = setTimeout(() => { overlay.innerHTML = ''; }, 1000);
+            }
+            
+            // Panel gizlendiğinde video aboneliğini bırak, kanaldan çıkma (hızlı geri dönüş için)
+            async function setVideoVisible(visible) {
+                if (visible === !videoPaused) {
+                    return;
+                }
+                videoPaused = !visible;
+                
+                if (!agoraClient || !remoteVideoUser) {
+                    return;
+                }
+                
+                try {
+                    if (videoPaused) {
+                        if (isRecording()) {
+                            // Kaydedilen iz bırakılmaz; yalnızca karoya çizim durur, kayıt bitince bırakılır
+                            remoteVideoUser.videoTrack && remoteVideoUser.videoTrack.stop();
+                            updateStatus('⏸️ Görüntü gizlendi, kayıt sürüyor', 'info');
+                            return;
+                        }
+                        await agoraClient.unsubscribe(remoteVideoUser, 'video');
+                        updateStatus('⏸️ Görüntü duraklatıldı (panel gizli)', 'info');
+                    } else {
+                        if (!remoteVideoUser.videoTrack) {
+                            await applyStreamType();
+                            await agoraClient.subscribe(remoteVideoUser, 'video');
+                        }
+                        remoteVideoUser.videoTrack.play("remoteVideo");
+                        document.getElementById('tapVideo').srcObject = null;
+                        document.getElementById('renderVideo').srcObject = null;
+                        updateStatus('▶️ Görüntü devam ediyor', 'success');
+                    }
+                } catch (error) {
+                    console.error('Görünürlük değişim hatası:', error);
+                    updateStatus('❌ Hata: ' + error.message, 'error');
+                }
+            }
+            
             // Pencere boyutu değiştiğinde video boyutunu ayarla
             window.addEventListener('resize', resizeVideo);
             
@@ -413,92 +1250,130 @@ class AgoraCameraPanel(QWidget):
                 resizeObserver.observe(video);
             }
             
-            // Kaydetme fonksiyonları - WebRTC Remote Recorder yaklaşımı
+            // Kaydetme fonksiyonları - her parça geldiği anda Python'a gönderilir, sayfada birikmez
             let mediaRecorder = null;
-            let recordedChunks = [];
             let currentFilename = '';
-            let currentFilepath = '';
+            let recordEndpoint = 'http://localhost:8080';
+            let chunkSeq = 0;
+            let uploadChain = Promise.resolve();
+            let recordSession = '';
+            let recordStartTimer = null;
+            let recorderStartMs = null;
+            let lastChunkEndMs = null;
+            
+            function isRecording() {
+                return recordStartTimer !== null || (mediaRecorder !== null && mediaRecorder.state !== 'inactive');
+            }
             
-            async function startRecording(filename, filepath) {
+            // Panel kayıt sırasında gizlendiyse kayıt bitince video aboneliği bırakılır
+            async function releaseHiddenVideo() {
+                if (!videoPaused || isRecording() || !agoraClient || !remoteVideoUser || !remoteVideoUser.videoTrack) {
+                    return;
+                }
                 try {
-                    const video = document.getElementById('remoteVideo');
-                    if (!video.srcObject) {
+                    await agoraClient.unsubscribe(remoteVideoUser, 'video');
+                    updateStatus('⏸️ Görüntü duraklatıldı (panel gizli)', 'info');
+                } catch (error) {
+                    console.error('Video aboneliği bırakılamadı:', error);
+                }
+            }
+            
+            // 503: yazıcı kuyruğu dolu, parça alınmadı; zincir beklediği için sıra bozulmaz
+            const RECORD_RETRY_LIMIT = 5;
+            function postChunk(url, data, attempt) {
+                return fetch(url, { method: 'POST', body: data }).then(response => {
+                    if (response.status === 503 && attempt < RECORD_RETRY_LIMIT) {
+                        console.warn('Kayıt kuyruğu dolu, parça yeniden gönderilecek (' + (attempt + 1) + '. deneme)');
+                        return new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)))
+                            .then(() => postChunk(url, data, attempt + 1));
+                    }
+                    if (!response.ok) {
+                        throw new Error('HTTP ' + response.status);
+                    }
+                });
+            }
+            
+            // Parçalar sırayla gönderilir ki dosyaya doğru sırada eklensin
+            // t0/t1: parçanın kapsadığı yakalama aralığı, start: kaydedicinin başladığı an (epoch ms)
+            function uploadChunk(filename, seq, data, final, times) {
+                let url = recordEndpoint + '/record/' + encodeURIComponent(filename) +
+                    '?seq=' + seq + (final ? '&final=1' : '');
+                if (recordSession) {
+                    url += '&session=' + encodeURIComponent(recordSession);
+                }
+                if (times) {
+                    url += '&t0=' + times.t0.toFixed(1) + '&t1=' + times.t1.toFixed(1) +
+                        '&start=' + times.start.toFixed(1);
+                }
+                uploadChain = uploadChain
+                    .then(() => postChunk(url, data, 0))
+                    .catch(error => {
+                        console.error('Kayıt parçası gönderilemedi:', error);
+                        updateStatus('❌ Dosya kaydetme hatası: ' + error.message, 'error');
+                    });
+                return uploadChain;
+            }
+            
+            // Epoch ms, performance.now() çözünürlüğünde
+            function nowEpochMs() {
+                return performance.timeOrigin + performance.now();
+            }
+            
+            // startAtMs: oturumun ortak başlangıç anı; tüm sayfalar kaydı bu ana zamanlar
+            async function startRecording(filename, filepath, endpoint, session, startAtMs) {
+                try {
+                    let stream = getRemoteStream();
+                    if (!stream && videoPaused && agoraClient && remoteVideoUser) {
+                        // Gizli ya da çözme bütçesi dışındaki kamera kayıt için abone olur; karoya çizilmez
+                        await applyStreamType();
+                        await agoraClient.subscribe(remoteVideoUser, 'video');
+                        stream = getRemoteStream();
+                    }
+                    if (!stream) {
                         updateStatus('❌ Kaydedilecek video yok', 'error');
                         return;
                     }
                     
                     currentFilename = filename || 'kayit.webm';
-                    currentFilepath = filepath || '';
-                    recordedChunks = [];
+                    recordEndpoint = endpoint || recordEndpoint;
+                    chunkSeq = 0;
+                    recordSession = session || '';
+                    recorderStartMs = null;
+                    lastChunkEndMs = null;
                     
-                    const stream = video.srcObject;
                     mediaRecorder = new MediaRecorder(stream, {
                         mimeType: 'video/webm;codecs=vp9'
                     });
                     
+                    const filenameForRecorder = currentFilename;
+                    mediaRecorder.onstart = function() {
+                        recorderStartMs = nowEpochMs();
+                        lastChunkEndMs = recorderStartMs;
+                    };
                     mediaRecorder.ondataavailable = function(event) {
                         if (event.data.size > 0) {
-                            recordedChunks.push(event.data);
+                            const end = nowEpochMs();
+                            const times = { t0: lastChunkEndMs, t1: end, start: recorderStartMs };
+                            lastChunkEndMs = end;
+                            uploadChunk(filenameForRecorder, chunkSeq++, event.data, false, times);
                         }
                     };
                     
                     mediaRecorder.onstop = function() {
-                        const blob = new Blob(recordedChunks, { type: 'video/webm' });
-                        
-                                                // WebRTC Remote Recorder yaklaşımı - HTTP sunucusu ile dosya kaydetme
-            if (currentFilepath) {
-                // Blob'u base64'e çevir
-                const reader = new FileReader();
-                reader.onload = function() {
-                    const base64Data = reader.result.split(',')[1];
-                    
-                    // HTTP sunucusuna gönder
-                    fetch('http://localhost:8080', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            filename: currentFilename,
-                            data: base64Data
-                        })
-                    })
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.status === 'success') {
-                            updateStatus('✅ Dosya kaydedildi: ' + data.filepath, 'success');
-                        } else {
-                            updateStatus('❌ Dosya kaydetme hatası', 'error');
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Dosya kaydetme hatası:', error);
-                        updateStatus('❌ Dosya kaydetme hatası: ' + error.message, 'error');
-                    });
-                };
-                reader.readAsDataURL(blob);
-            }
-            
-            // Ayrıca tarayıcı indirme seçeneği de sun
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = currentFilename;
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            
-            // URL'yi temizle
-            setTimeout(() => {
-                URL.revokeObjectURL(url);
-            }, 10000);
-                        
-                        recordedChunks = [];
-                        updateStatus('✅ Kayıt tamamlandı: ' + currentFilename, 'success');
+                        // Son parça ondataavailable ile gönderildi, dosyayı kapat
+                        uploadChunk(filenameForRecorder, chunkSeq, new Blob(), true).then(() => {
+                            updateStatus('✅ Kayıt tamamlandı: ' + filenameForRecorder, 'success');
+                        });
+                        releaseHiddenVideo();
                     };
                     
-                    mediaRecorder.start(1000); // Her 1 saniyede bir chunk al
-                    updateStatus('📹 Kayıt başladı: ' + currentFilename, 'info');
+                    // runJavaScript gecikmesinden bağımsız olarak ortak anda başla
+                    const delay = startAtMs ? Math.max(0, startAtMs - Date.now()) : 0;
+                    recordStartTimer = setTimeout(function() {
+                        recordStartTimer = null;
+                        mediaRecorder.start(1000); // Her 1 saniyede bir chunk al
+                        updateStatus('📹 Kayıt başladı: ' + currentFilename, 'info');
+                    }, delay);
                     
                 } catch (error) {
                     console.error('Kayıt hatası:', error);
@@ -507,6 +1382,14 @@ class AgoraCameraPanel(QWidget):
             }
             
             function stopRecording() {
+                if (recordStartTimer) {
+                    // Kayıt henüz başlamadan durduruldu
+                    clearTimeout(recordStartTimer);
+                    recordStartTimer = null;
+                    uploadChunk(currentFilename, 0, new Blob(), true);
+                    releaseHiddenVideo();
+                    return;
+                }
                 if (mediaRecorder && mediaRecorder.state !== 'inactive') {
                     mediaRecorder.stop();
                     updateStatus('⏹️ Kayıt durduruldu', 'info');
@@ -532,28 +1415,74 @@ class AgoraCameraPanel(QWidget):
     
     def start_stream(self, app_id, token, channel):
         """Yayını başlatır"""
+        self.channel = channel
         if not self.is_streaming:
             js_code = f"startStream('{app_id}', '{token}', '{channel}')"
-            self.webview.page().runJavaScript(js_code)
-            self.is_streaming = True
+            self.is_streaming = self.run_js(js_code)
     
     def stop_stream(self):
         """Yayını durdurur"""
         if self.is_streaming:
-            self.webview.page().runJavaScript("stopStream()")
+            self.run_js("stopStream()")
             self.is_streaming = False
     
-    def start_recording(self, filename):
-        """Kaydetmeyi başlatır"""
+    def renew_token(self, token):
+        """Yeni token'ı kanaldan çıkmadan uygular"""
+        self.run_js(f"renewToken('{token}')")
+    
+    def set_video_visible(self, visible: bool):
+        """Panel görünürlüğünü sayfaya bildirir; gizliyken video çözülmez"""
+        if visible == self.video_visible:
+            return
+        self.video_visible = visible
+        self.run_js(f"setVideoVisible({'true' if visible else 'false'})")
+        logging.info(f"{self.camera_name}: video {'devam ediyor' if visible else 'duraklatıldı'}")
+    
+    def set_high_quality(self, high: bool):
+        """Odaktaki panel yüksek, diğerleri düşük kalite akışı ister"""
+        if high == self.high_quality:
+            return
+        self.high_quality = high
+        self.run_js(f"setStreamQuality({'true' if high else 'false'})")
+    
+    def set_render_rate(self, fps: int):
+        """Video karolarının yenileme hızını sınırlar (0: sınırsız)"""
+        if fps == self.render_fps:
+            return
+        self.render_fps = fps
+        self.run_js(f"setRenderRate({fps})")
+    
+    def request_stream_stats(self, callback):
+        """Anlık alım istatistiklerini (kbps, fps, çözünürlük) callback'e verir"""
+        if not self.run_js("getStreamStats()", callback):
+            callback(None)
+    
+    def start_frame_tap(self, fps=DEFAULT_TAP_FPS, width=DEFAULT_TAP_WIDTH, height=DEFAULT_TAP_HEIGHT, port=8080):
+        """Sayfadan Python'a ham kare akışını başlatır (FileServer /frames/<camera_key>)"""
+        js_code = f"startFrameTap('{self.camera_key}', {fps}, {width}, {height}, 'http://localhost:{port}')"
+        self.run_js(js_code)
+    
+    def stop_frame_tap(self):
+        self.run_js("stopFrameTap()")
+    
+    def show_motion_regions(self, boxes):
+        """Hareket algılanan bölgeleri video üzerinde vurgular"""
+        self.run_js(f"showMotionRegions({json.dumps(boxes)})")
+    
+    def start_recording(self, filename, session_id=None, start_at_ms=None):
+        """Kaydetmeyi başlatır; oturumla çağrılırsa kayıt ortak başlangıç anında başlar"""
         try:
             # Recordings klasörüne tam yol oluştur
             recordings_dir = os.path.join(os.path.dirname(__file__), 'recordings')
+            if session_id:
+                recordings_dir = os.path.join(recordings_dir, session_id)
             os.makedirs(recordings_dir, exist_ok=True)
             filepath = os.path.join(recordings_dir, filename)
             
-            # Kaydetme için JavaScript kodu - tam dosya yolu ile
-            js_code = f"startRecording('{filename}', '{filepath}')"
-            self.webview.page().runJavaScript(js_code)
+            # Kaydetme için JavaScript kodu - parçalar dosya sunucusuna gönderilir
+            js_code = (f"startRecording('{filename}', '{filepath}', 'http://localhost:{self.file_server_port}', "
+                       f"'{session_id or ''}', {start_at_ms or 0})")
+            self.run_js(js_code)
             logging.info(f"Kaydetme başlatıldı: {filepath}")
         except Exception as e:
             logging.error(f"Kaydetme başlatma hatası: {e}")
@@ -561,7 +1490,7 @@ class AgoraCameraPanel(QWidget):
     def stop_recording(self):
         """Kaydetmeyi durdurur"""
         try:
-            self.webview.page().runJavaScript("stopRecording()")
+            self.run_js("stopRecording()")
             logging.info("Kaydetme durduruldu")
         except Exception as e:
             logging.error(f"Kaydetme durdurma hatası: {e}")
@@ -612,11 +1541,18 @@ class SensorThread(QThread):
 # -----------------------------
 class FirebaseThread(QThread):
     data_received = pyqtSignal(dict)
+    # Firebase yalnızca bu thread'de başlatılır; sonuç GUI thread'ine bildirilir
+    initialized = pyqtSignal(bool)
+    cleanup_finished = pyqtSignal(bool)
     
-    def __init__(self):
+    # Açılışta silinen eski dallar
+    STALE_PATHS = ('throttle', 'command')
+    
+    def __init__(self, timeline=None):
         super().__init__()
         self.running = True
         self.firebase_initialized = False
+        self.timeline = timeline
         
     def initialize_firebase(self):
         if not FIREBASE_AVAILABLE:
@@ -639,66 +1575,120 @@ class FirebaseThread(QThread):
             self.firebase_initialized = False
             return False
     
+    def cleanup_stale_data(self):
+        """Firebase'deki eski dalları temizle (ağ isteği; GUI thread'ini bekletmez)"""
+        try:
+            for path in self.STALE_PATHS:
+                db.reference(path).delete()
+            return True
+        except Exception as e:
+            logging.warning(f"Firebase eski dalları silinemedi: {e}")
+            return False
+    
+    def _begin(self, phase):
+        if self.timeline is not None:
+            self.timeline.begin(phase, thread='FirebaseThread')
+    
+    def _end(self, phase, ok=True, detail=''):
+        if self.timeline is not None:
+            self.timeline.end(phase, ok, detail)
+    
     def run(self):
+        self._begin('firebase_import')
+        self._end('firebase_import', load_firebase(), '' if FIREBASE_AVAILABLE else 'firebase_admin yok')
+        self._begin('firebase_init')
         if not self.initialize_firebase():
-            # Simülasyon yok: bağlantı kurulana kadar bekle ve tekrar dene
+            # Açılış ilk denemeyi beklemez; bağlantı kurulana kadar arka planda tekrar denenir
+            self._end('firebase_init', False, 'bağlantı bekleniyor' if FIREBASE_AVAILABLE else 'firebase_admin yok')
+            self.initialized.emit(False)
             while self.running and not self.initialize_firebase():
                 self.msleep(1000)
+            if not self.running:
+                return
+            logging.info("Firebase bağlantısı kuruldu")
         else:
-            # Gerçek Firebase modu
-            ref = db.reference()
-            while self.running:
-                try:
-                    # Sensör verilerini al
-                    sensors = ref.child('sensors').get()
-                    if sensors:
-                        self.data_received.emit({'type': 'sensors', 'data': sensors})
-                    else:
-                        # Sensör verisi yoksa bunu bildir
-                        self.data_received.emit({'type': 'sensors_empty', 'data': None})
-                    
-                    # Kontrol verilerini al
-                    control = ref.child('control').get()
-                    if control:
-                        self.data_received.emit({'type': 'control', 'data': control})
-                    
-                    # Vites verisini al
-                    gear = ref.child('gear').get()
-                    if gear:
-                        self.data_received.emit({'type': 'gear', 'data': gear})
-                    
-                    # Komut verilerini al
-                    commands = ref.child('commands').get()
-                    if commands:
-                        self.data_received.emit({'type': 'commands', 'data': commands})
-                    
-                    # Lazer verilerini al
-                    laser = ref.child('laser').get()
-                    if laser:
-                        self.data_received.emit({'type': 'laser', 'data': laser})
-                    
-                    # Acil durum verilerini al
-                    emergency = ref.child('emergency').get()
-                    if emergency:
-                        self.data_received.emit({'type': 'emergency', 'data': emergency})
-                    
-                    # Araç çalıştır verilerini al
-                    vehicle_engine = ref.child('vehicle_engine').get()
-                    if vehicle_engine:
-                        self.data_received.emit({'type': 'vehicle_engine', 'data': vehicle_engine})
-                    
-                    self.msleep(100)
-                    
-                except Exception as e:
-                    self.msleep(1000)
+            # Temizlik de rapora girsin diye init bitmeden beklenen aşamalara eklenir
+            if self.timeline is not None:
+                self.timeline.expect('firebase_cleanup')
+            self._end('firebase_init')
+        self.initialized.emit(True)
+        
+        self._begin('firebase_cleanup')
+        ok = self.cleanup_stale_data()
+        self._end('firebase_cleanup', ok)
+        self.cleanup_finished.emit(ok)
+        
+        # Gerçek Firebase modu
+        ref = db.reference()
+        while self.running:
+            try:
+                # Sensör verilerini al
+                sensors = ref.child('sensors').get()
+                if sensors:
+                    self.data_received.emit({'type': 'sensors', 'data': sensors})
+                else:
+                    # Sensör verisi yoksa bunu bildir
+                    self.data_received.emit({'type': 'sensors_empty', 'data': None})
+                
+                # Kontrol verilerini al
+                control = ref.child('control').get()
+                if control:
+                    self.data_received.emit({'type': 'control', 'data': control})
+                
+                # Vites verisini al
+                gear = ref.child('gear').get()
+                if gear:
+                    self.data_received.emit({'type': 'gear', 'data': gear})
+                
+                # Komut verilerini al
+                commands = ref.child('commands').get()
+                if commands:
+                    self.data_received.emit({'type': 'commands', 'data': commands})
+                
+                # Lazer verilerini al
+                laser = ref.child('laser').get()
+                if laser:
+                    self.data_received.emit({'type': 'laser', 'data': laser})
+                
+                # Acil durum verilerini al
+                emergency = ref.child('emergency').get()
+                if emergency:
+                    self.data_received.emit({'type': 'emergency', 'data': emergency})
+                
+                # Araç çalıştır verilerini al
+                vehicle_engine = ref.child('vehicle_engine').get()
+                if vehicle_engine:
+                    self.data_received.emit({'type': 'vehicle_engine', 'data': vehicle_engine})
+                
+                self.msleep(100)
+                
+            except Exception as e:
+                self.msleep(1000)
     
     def stop(self):
         self.running = False
 
 # Ana Pencere
 class IKADashboard(QMainWindow):
-    def __init__(self):
+    # Hareket analizi sonucu süreç havuzu thread'inden GUI thread'ine aktarılır
+    motion_detected = pyqtSignal(str, list, float)
+    # Dosya sunucusu arka planda başlatılır; sonuç GUI thread'ine aktarılır
+    file_server_ready = pyqtSignal(bool)
+
+    def __init__(self, replay=None, timeline=None, autostart=False, profile_path=None,
+                 quit_after_startup=False, cameras=None):
         super().__init__()
+        # Kamera karoları, kanallar ve kayıt dosyaları bu listeden (bkz. camera_topology)
+        self.cameras = cameras if cameras is not None else load_topology()
+        # Oynatma modunda veriler Firebase yerine telemetri logundan gelir
+        self.replay = replay
+        self.startup_timeline = timeline or StartupTimeline()
+        self.startup_timeline.begin('shell')
+        # Açılış bitince yayınlar başlatılır (ilk kareye kadar geçen sürenin ölçümü için)
+        self.autostart = autostart
+        self.profile_path = profile_path
+        self.quit_after_startup = quit_after_startup
+        self._startup_finished = False
         self.laser_mode = False
         self.current_theme = "NeoDark"
         self.firebase_initialized = False
@@ -719,17 +1709,28 @@ class IKADashboard(QMainWindow):
         
         self.setGeometry(x, y, window_width, window_height)
 
-        self.build_ui()
-        self.setup_shortcuts()
-        self.build_sensors()
-        self.init_firebase()
-        self.apply_theme(self.current_theme)
-        
-        # Firebase başlatıldıktan sonra eski dalları temizle!! BURAYA TEKRAR BAK
-        if self.firebase_initialized:
-            self.cleanup_firebase_data()
+        # Sinyal başına halka tamponu; grafikler create_sensor_panel'de bağlanır
+        self.telemetry_history = TelemetryHistory(
+            int(os.getenv('IKA_HISTORY_CAPACITY', DEFAULT_HISTORY_CAPACITY))
+        )
+        self.gps_track = GpsTrack()
+
+        # Her kurulum adımı açılış zaman çizelgesinde ayrı görünür
+        for step in ('build_ui', 'setup_ui_refresh', 'setup_frame_tap', 'setup_motion_detection',
+                     'setup_visibility_tracking', 'setup_readiness_tracking', 'setup_token_renewal',
+                     'setup_shortcuts', 'setup_flight_recorder', 'setup_stall_watchdog', 'setup_input_latency',
+                     'setup_render_profile', 'build_sensors', 'setup_replay'):
+            with self.startup_timeline.phase(f'shell:{step}'):
+                getattr(self, step)()
+        with self.startup_timeline.phase('shell:apply_theme'):
+            self.apply_theme(self.current_theme)
+        self.startup_timeline.end('shell')
         
+        # Kabuk hemen gösterilir; WebView'ler, dosya sunucusu ve Firebase pencere
+        # açıldıktan sonra aşamalı ve eşzamanlı başlatılır (bkz. start_subsystems)
         self.show()
+        self.startup_timeline.mark('window_shown')
+        QTimer.singleShot(0, self.start_subsystems)
     # Genel CSS 
     def neo_dark_qss(self):
         return """
@@ -820,6 +1821,14 @@ class IKADashboard(QMainWindow):
             background:#0b1325; color:#22d3ee;
             border:1px solid #1e335a; border-radius:10px;
         }
+        SparklineWidget { color:#38bdf8; }
+        QLabel#StallIndicator { color:#64748b; font-size:11px; font-weight:600; }
+        QLabel#StallIndicator[severity="warn"] { color:#f59e0b; }
+        QLabel#StallIndicator[severity="bad"] { color:#ef4444; }
+        TrackMapWidget {
+            color:#38bdf8; background:#0b1325;
+            border:1px solid #1e335a; border-radius:10px;
+        }
         QLabel[class~="camera-tile"] {
             background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
                 stop:0 #0b1730, stop:1 #0b1120);
@@ -897,35 +1906,168 @@ class IKADashboard(QMainWindow):
             background: rgba(16,185,129,.2); border-color: rgba(16,185,129,.5);
             color:#ecfdf5; font-size:16px; border-radius:16px; padding:12px;
         }
-        QPushButton#vehicle_start:checked {
-            background: rgba(16,185,129,.35); border-color: rgba(16,185,129,.7);
-            color:#fff;
+        QPushButton#vehicle_start:checked {
+            background: rgba(16,185,129,.35); border-color: rgba(16,185,129,.7);
+            color:#fff;
+        }
+        QLCDNumber {
+            background: rgba(2,6,23,.6); color:#22d3ee;
+            border: 1px solid rgba(255,255,255,.12); border-radius: 10px;
+        }
+        SparklineWidget { color:#7dd3fc; }
+        QLabel#StallIndicator { color: rgba(226,232,240,.55); font-size:11px; font-weight:600; }
+        QLabel#StallIndicator[severity="warn"] { color:#fbbf24; }
+        QLabel#StallIndicator[severity="bad"] { color:#f87171; }
+        TrackMapWidget {
+            color:#7dd3fc; background: rgba(2,6,23,.6);
+            border: 1px solid rgba(255,255,255,.12); border-radius: 10px;
+        }
+        QLabel[class~="camera-tile"] {
+            background: rgba(255,255,255,.06);
+            border: 1px solid rgba(255,255,255,.12);
+            border-radius: 18px;
+        }
+        #BottomBar {
+            background: rgba(255,255,255,.06);
+            border-top: 1px solid rgba(255,255,255,.12);
+        }
+        QProgressBar {
+            background: rgba(255,255,255,.06); border:1px solid rgba(255,255,255,.12);
+            border-radius:8px; color:#e5e7eb; text-align:center;
+        }
+        QProgressBar::chunk { background: rgba(34,197,94,.9); border-radius:8px; }
+        """
+
+    def flat_qss(self):
+        """Performans profili: gradyan, yarı saydamlık ve büyük köşe yarıçapı yok;
+        düz renkler yeniden boyamada karışım gerektirmez"""
+        return """
+        QMainWindow { background:#0b1020; }
+        #TopBar, #BottomBar { background:#0e1726; border:none; }
+        QLabel#Title { color:#e2e8f0; font-weight:900; font-size:18px; }
+        QLabel#Badge { color:#94a3b8; background:#111a2e; padding:6px 10px; border:1px solid #1e293b; }
+        QGroupBox {
+            color:#e5e7eb; font-weight:800; font-size:16px;
+            border:1px solid #1f2a44; border-radius:4px;
+            margin-top:16px; padding-top:18px; background:#0d1424;
+        }
+        QGroupBox::title { subcontrol-origin: margin; left:12px; padding:0 6px; background:#0b1020; }
+        QLabel { color:#cbd5e1; font-weight:700; font-size:14px; }
+        QPushButton {
+            background:#12213f; border:1px solid #1e335a; border-radius:4px;
+            color:#e5e7eb; font-weight:800; padding:10px 12px;
+        }
+        QPushButton:hover { background:#1c2f5a; border-color:#3b82f6; }
+        QPushButton:pressed { background:#0b1730; }
+        QPushButton#emergency {
+            background:#991b1b; border:2px solid #b91c1c; color:#fee2e2;
+            font-size:18px; padding:14px;
+        }
+        QPushButton#emergency:checked { background:#dc2626; border:3px solid #ef4444; color:#fff; }
+        QPushButton#laser { background:#7c2d12; border:1px solid #b45309; }
+        QPushButton#laser:checked { background:#ea580c; border:2px solid #f59e0b; color:#fff; }
+        QPushButton#vehicle_start {
+            background:#047857; border:2px solid #10b981; color:#ecfdf5;
+            font-size:16px; padding:12px;
+        }
+        QPushButton#vehicle_start:checked { background:#10b981; border:3px solid #34d399; color:#fff; }
+        QLCDNumber { background:#0b1325; color:#22d3ee; border:1px solid #1e335a; }
+        SparklineWidget { color:#38bdf8; }
+        QLabel#StallIndicator { color:#64748b; font-size:11px; font-weight:600; }
+        QLabel#StallIndicator[severity="warn"] { color:#f59e0b; }
+        QLabel#StallIndicator[severity="bad"] { color:#ef4444; }
+        TrackMapWidget { color:#38bdf8; background:#0b1325; border:1px solid #1e335a; }
+        QLabel[class~="camera-tile"] { background:#0b1325; border:1px solid #1e335a; }
+        QProgressBar { background:#0b1325; border:1px solid #1e335a; color:#e5e7eb; text-align:center; }
+        QProgressBar::chunk { background:#16a34a; }
+        """
+
+    def control_qss(self):
+        """Temadan bağımsız kontrol stilleri. Yayın/kayıt butonlarının durumu satır içi
+        stil yerine dinamik özellikle seçilir; klavyeyle vurgulanan buton basılı
+        (setDown) gösterilir, :pressed yeniden polish gerektirmez. Vurgu kuralları
+        en sonda olmalı ki aynı özgüllükteki tema kurallarını ezsin"""
+        return """
+        #SensorPanel QLabel { font-size:12px; }
+        QLabel[class~="status-note"], #SensorPanel QLabel[class~="status-note"] {
+            font-size:11px; font-weight:600;
+        }
+        QLabel#ThrottleLabel { font-size:10px; font-weight:700; color:#cbd5e1; }
+        QPushButton[class~="control-key"] { font-size:14px; font-weight:900; }
+        QPushButton[class~="laser-key"] { font-size:12px; font-weight:900; }
+        QPushButton[class~="throttle-key"] { font-size:10px; font-weight:900; }
+        QPushButton#LaserFire { font-size:14px; font-weight:1000; }
+        QPushButton#StreamButton, QPushButton#RecordButton {
+            border-radius: 8px; color: white; font-weight: 800; padding: 15px;
+            font-size: 16px;
+        }
+        QPushButton#StreamButton[state="idle"] {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #4CAF50, stop:1 #45a049);
+            border: 1px solid #4CAF50;
+        }
+        QPushButton#StreamButton[state="idle"]:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #45a049, stop:1 #4CAF50);
+        }
+        QPushButton#RecordButton[state="idle"] {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #2196F3, stop:1 #1976D2);
+            border: 1px solid #2196F3;
         }
-        QLCDNumber {
-            background: rgba(2,6,23,.6); color:#22d3ee;
-            border: 1px solid rgba(255,255,255,.12); border-radius: 10px;
+        QPushButton#RecordButton[state="idle"]:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #1976D2, stop:1 #2196F3);
         }
-        QLabel[class~="camera-tile"] {
-            background: rgba(255,255,255,.06);
-            border: 1px solid rgba(255,255,255,.12);
-            border-radius: 18px;
+        QPushButton#StreamButton[state="active"], QPushButton#RecordButton[state="active"] {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #f44336, stop:1 #d32f2f);
+            border: 1px solid #f44336;
         }
-        #BottomBar {
-            background: rgba(255,255,255,.06);
-            border-top: 1px solid rgba(255,255,255,.12);
+        QPushButton#StreamButton[state="active"]:hover, QPushButton#RecordButton[state="active"]:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #d32f2f, stop:1 #f44336);
         }
-        QProgressBar {
-            background: rgba(255,255,255,.06); border:1px solid rgba(255,255,255,.12);
-            border-radius:8px; color:#e5e7eb; text-align:center;
+        QPushButton[class~="control-key"]:pressed, QPushButton[class~="laser-key"]:pressed,
+        QPushButton[class~="throttle-key"]:pressed, QPushButton#LaserFire:pressed,
+        QPushButton#emergency:pressed, QPushButton#laser:pressed {
+            border: 3px solid #4ecdc4; border-radius: 8px;
         }
-        QProgressBar::chunk { background: rgba(34,197,94,.9); border-radius:8px; }
         """
 
+    # Tema adı -> birleştirilmiş stil sayfası (süreç boyunca bir kez üretilir)
+    _theme_qss_cache = {}
+
+    def theme_qss(self, name: str):
+        qss = self._theme_qss_cache.get(name)
+        if qss is None:
+            base = {"NeoDark": self.neo_dark_qss, "Flat": self.flat_qss}.get(name, self.glass_qss)()
+            qss = self._theme_qss_cache[name] = base + self.control_qss()
+        return qss
+
     def apply_theme(self, name: str):
-        if name == "NeoDark":
-            self.setStyleSheet(self.neo_dark_qss())
-        else:
-            self.setStyleSheet(self.glass_qss())
+        """Stil sayfası yalnızca pencerede tanımlıdır; çocuk widget'larda satır içi
+        stil olmadığından tema değişiminde tek bir sayfa çözülür.
+        Performans çizim profilinde seçili temadan bağımsız olarak düz tema kullanılır"""
+        if getattr(self, 'render_profile', 'quality') == 'performance':
+            name = "Flat"
+        if name == getattr(self, '_applied_theme', None):
+            return
+        # Yeniden polish sırasında ara boyamalar yapılmaz
+        self.setUpdatesEnabled(False)
+        try:
+            self.setStyleSheet(self.theme_qss(name))
+        finally:
+            self.setUpdatesEnabled(True)
+        self._applied_theme = name
+
+    def _set_style_state(self, widget, name, value):
+        """Dinamik özelliği değiştirip yalnızca o widget'ı yeniden polish eder"""
+        if widget.property(name) == value:
+            return
+        widget.setProperty(name, value)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
 
     # UI
     def build_ui(self):
@@ -953,6 +2095,8 @@ class IKADashboard(QMainWindow):
         self._middle_wrap = middle_wrap
 
     def reveal_anim(self, widget):
+        if self.render_profile == 'performance':
+            return
         anim = QPropertyAnimation(widget, b"geometry")
         start_rect = QRect(widget.x(), widget.y() + 30, widget.width(), widget.height())
         anim.setDuration(380)
@@ -976,9 +2120,571 @@ class IKADashboard(QMainWindow):
         if not hasattr(self, "_first_shown"):
             self._first_shown = True
             QTimer.singleShot(0, lambda: (self._force_initial_layout(), self.reveal_anim(self._middle_wrap)))
+            # Pencere başka bir pencerenin altında kaldığında Expose olayı gelir
+            if self.windowHandle() is not None:
+                self.windowHandle().installEventFilter(self)
         
         # Pencereye focus ver ki tuş olayları yakalansın
         self.setFocus()
+        self.update_camera_visibility()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_camera_visibility()
+
+    def moveEvent(self, event):
+        # Pencere kısmen ekran dışına taşınınca dışarıda kalan karolar duraklatılır
+        super().moveEvent(event)
+        self.update_camera_visibility()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_camera_visibility()
+
+    def eventFilter(self, obj, event):
+        if obj is not self.windowHandle():
+            return super().eventFilter(obj, event)
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            self.mark_input('mouse')
+        elif event.type() == QEvent.Type.Expose:
+            if obj.isExposed():
+                # Pencerenin ekranda ilk görünür olduğu an
+                self.startup_timeline.mark('window_exposed')
+            QTimer.singleShot(0, self.update_camera_visibility)
+        return super().eventFilter(obj, event)
+
+    # ---------- Kamera Görünürlüğü ----------
+    def setup_visibility_tracking(self):
+        # Lazer modunda sadece lazer kamerası çözülür (IKA_LASER_ONLY_VIDEO=0 ile kapatılır)
+        self.laser_only_video = os.getenv('IKA_LASER_ONLY_VIDEO', '1') == '1'
+        self.cpu_sampler = CpuSampler()
+        self.visibility_cpu_stats = LabeledStats()
+        self.cpu_timer = QTimer(self)
+        self.cpu_timer.timeout.connect(self._sample_camera_cpu)
+        self.cpu_timer.start(2000)
+
+        # Görünür karolardan en fazla bu kadarı çözülür; odak ve önceliği düşük olanlar duraklatılır
+        self.max_decoded_videos = int(os.getenv('IKA_MAX_DECODED_VIDEOS', DEFAULT_MAX_DECODED))
+
+        # Odak kamera: sadece o panel yüksek kalite akışı alır
+        self.focused_camera = self.main_camera
+        self.bandwidth_stats = LabeledStats()
+        self._pending_stream_stats = {}
+        self.set_focus_camera(self.main_camera)
+
+    # ---------- Kare Musluğu ----------
+    def setup_frame_tap(self):
+        """Python tüketicileri frame_tap.subscribe(camera_key, callback) ile kare alır"""
+        self.frame_tap = FrameTap()
+        self.frame_tap_fps = int(os.getenv('IKA_FRAME_TAP_FPS', DEFAULT_TAP_FPS))
+        size = os.getenv('IKA_FRAME_TAP_SIZE', f"{DEFAULT_TAP_WIDTH}x{DEFAULT_TAP_HEIGHT}")
+        self.frame_tap_width, self.frame_tap_height = (int(v) for v in size.lower().split('x'))
+        # IKA_FRAME_TAP=front,laser ile abone olmadan da kare alınabilir
+        self.frame_tap_cameras = {c.strip() for c in os.getenv('IKA_FRAME_TAP', '').split(',') if c.strip()}
+
+    # ---------- Arayüz Yenileme (LCD'ler ve grafikler) ----------
+    def setup_ui_refresh(self):
+        """LCD'ler ve grafikler veri geldikçe değil, tek zamanlayıcıyla ekran yenileme
+        hızında (ya da daha düşük IKA_UI_FPS) ve yalnızca değiştiyse güncellenir"""
+        self.ui_scheduler = UiUpdateScheduler()
+        self.sensor_lcds = {
+            'roll': self.roll_lcd, 'pitch': self.pitch_lcd, 'yaw': self.yaw_lcd,
+            'lat': self.lat_lcd, 'lon': self.lon_lcd, 'alt': self.alt_lcd, 'speed': self.speed_lcd,
+        }
+        screen = QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None and screen.refreshRate() > 0 else 60.0
+        fps = min(rate, float(os.getenv('IKA_UI_FPS', rate)))
+        self.ui_timer = QTimer(self)
+        self.ui_timer.timeout.connect(self._refresh_ui)
+        self.ui_timer.start(max(1, int(1000 / fps)))
+
+    def _refresh_ui(self):
+        if self.render_auto:
+            self.overload.tick(self.ui_timer.interval() / 1000.0)
+        self.ui_scheduler.flush(lambda key, text: self.sensor_lcds[key].display(text))
+        for chart in (*self.sparklines.values(), self.track_map):
+            if chart.needs_redraw() and chart.isVisible():
+                chart.update()
+
+    def log_ui_update_stats(self):
+        stats = self.ui_scheduler.summary()
+        if stats['updates']:
+            logging.info(f"LCD güncellemeleri: {stats['updates']} gelen, {stats['applied']} uygulandı, "
+                         f"{stats['skipped']} aynı değer atlandı, {stats['coalesced']} birleştirildi")
+
+    # ---------- Telemetri Kaydı ----------
+    def setup_flight_recorder(self):
+        """Gelen sensör verisi ve giden komutlar ikili telemetri loguna yazılır"""
+        self.flight_recorder = None
+        if self.replay is not None or os.getenv('IKA_FLIGHT_RECORDER', '1') != '1':
+            return
+        max_mb = float(os.getenv('IKA_FLIGHT_LOG_MAX_MB', DEFAULT_MAX_BYTES / (1024 * 1024)))
+        try:
+            self.flight_recorder = FlightRecorder(
+                os.getenv('IKA_FLIGHT_LOG_DIR', DEFAULT_LOG_DIR),
+                max_bytes=int(max_mb * 1024 * 1024),
+            )
+        except OSError as e:
+            logging.error(f"Telemetri kaydı başlatılamadı: {e}")
+
+    # ---------- Arayüz Takılma Bekçisi ----------
+    def setup_stall_watchdog(self):
+        """Olay döngüsü kalp atışı; eşikten uzun takılmalar yığınıyla ika_stalls.jsonl'e yazılır"""
+        self.stall_watchdog = None
+        if os.getenv('IKA_STALL_WATCHDOG', '1') != '1':
+            self.stall_label.hide()
+            return
+        self.stall_watchdog = StallWatchdog(
+            float(os.getenv('IKA_STALL_THRESHOLD_MS', DEFAULT_THRESHOLD_MS)),
+            os.getenv('IKA_STALL_LOG', DEFAULT_STALL_LOG),
+            app_root=os.path.dirname(os.path.abspath(__file__)),
+        )
+        # Gösterge son takılmadan bu kadar sonra normale döner
+        self.stall_indicator_hold = 60.0
+        self._last_stall_at = None
+        self._stall_beats = 0
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.timeout.connect(self._heartbeat)
+        self.heartbeat_timer.start(DEFAULT_HEARTBEAT_MS)
+
+    def _heartbeat(self):
+        # Açık modal pencere (QMessageBox) kontrol girişini de kilitler; takılma sayılır
+        stall = self.stall_watchdog.beat(QApplication.activeModalWidget() is not None)
+        if stall is not None:
+            self.on_gui_stall(stall)
+        self._stall_beats += 1
+        if self._stall_beats % 100 == 0:
+            self.refresh_stall_indicator()
+
+    def on_gui_stall(self, stall):
+        kind = "modal pencere" if stall['kind'] == 'modal' else "takıldı"
+        logging.warning(f"Arayüz {stall['duration_ms']:.0f} ms {kind}: {stall['culprit'] or 'yığın alınamadı'}")
+        self._last_stall_at = time.monotonic()
+        self.refresh_stall_indicator()
+
+    def refresh_stall_indicator(self):
+        h = self.stall_watchdog.histogram
+        last = self.stall_watchdog.last_stall()
+        if last is None:
+            text, severity = "⏱️ Arayüz akıcı", "ok"
+        else:
+            recent = time.monotonic() - self._last_stall_at < self.stall_indicator_hold
+            severity = ("bad" if last['duration_ms'] >= 1000 else "warn") if recent else "ok"
+            text = f"⏱️ {len(h)} takılma, son {last['duration_ms']:.0f} ms"
+        self._set_style_state(self.stall_label, "severity", severity)
+        self.stall_label.setText(text)
+
+        lines = [f"{label}: {count}" for label, count in h.buckets()]
+        if last is not None:
+            lines += ["", f"Son: {last['culprit'] or '-'}"] + last['stack'][-6:]
+        self.stall_label.setToolTip("\n".join(lines))
+
+    # ---------- Çizim Profili ----------
+    def setup_render_profile(self):
+        """IKA_RENDER_PROFILE: quality (efektler, animasyon, gradyanlı tema), performance
+        (efektsiz, düz tema, video karoları IKA_PERF_VIDEO_FPS ile sınırlı) ya da auto:
+        kalite ile başlar, CPU veya kare gecikmesi eşiği sürekli aşılırsa performansa geçer"""
+        mode = os.getenv('IKA_RENDER_PROFILE', 'auto')
+        self.render_profile = 'quality'
+        self.render_auto = mode == 'auto'
+        self.perf_video_fps = int(os.getenv('IKA_PERF_VIDEO_FPS', DEFAULT_PERF_VIDEO_FPS))
+        self.overload = OverloadDetector(
+            float(os.getenv('IKA_PERF_CPU_THRESHOLD', DEFAULT_CPU_THRESHOLD)),
+            float(os.getenv('IKA_PERF_FRAME_LATE_MS', DEFAULT_FRAME_LATE_MS)),
+        )
+        self.render_profile_btn.toggled.connect(self.on_render_profile_toggled)
+        if mode == 'performance':
+            self.set_render_profile('performance', "IKA_RENDER_PROFILE")
+
+    def on_render_profile_toggled(self, on):
+        # Elle seçilen profil otomatik seçimle değiştirilmez
+        self.render_auto = False
+        self.set_render_profile('performance' if on else 'quality', "elle seçildi")
+
+    def set_render_profile(self, profile, reason=''):
+        if profile == self.render_profile:
+            return
+        self.render_profile = profile
+        performance = profile == 'performance'
+        # Gölge gibi efektler widget'ı her boyamada ekran dışı tampona çizdirir
+        for widget in self.findChildren(QWidget):
+            effect = widget.graphicsEffect()
+            if effect is not None:
+                effect.setEnabled(not performance)
+        for panel in self.camera_panels():
+            panel.set_render_rate(self.perf_video_fps if performance else 0)
+        self.apply_theme(self.current_theme)
+        self.render_profile_btn.blockSignals(True)
+        self.render_profile_btn.setChecked(performance)
+        self.render_profile_btn.blockSignals(False)
+        logging.info(f"Çizim profili: {profile}" + (f" ({reason})" if reason else ""))
+
+    # ---------- Giriş Gecikmesi ----------
+    def setup_input_latency(self):
+        """Komutlar arka plan thread'inde gönderilir; tuş/fare olayından veritabanı
+        onayına kadar geçen süre komut başına histogramlanır (IKA_INPUT_LATENCY=0 ile kapatılır)"""
+        self.input_latency = None
+        self.latency_panel = None
+        self.latency_export_path = os.getenv('IKA_INPUT_LATENCY_EXPORT', DEFAULT_LATENCY_EXPORT)
+        if os.getenv('IKA_INPUT_LATENCY', '1') == '1':
+            # Fare olayları pencereye (QWindow) düğmenin sinyalinden önce gelir; orada damgalanır (bkz. eventFilter)
+            self.input_latency = InputLatencyTracker()
+            self.latency_btn.clicked.connect(self.toggle_latency_panel)
+        else:
+            self.latency_btn.hide()
+        self.command_sender = CommandSender(self._write_to_firebase, self.input_latency)
+
+    def mark_input(self, source):
+        """Olay işleyicisinin başı; damga bir sonraki olay döngüsü turunda silinir"""
+        if self.input_latency is not None and self.input_latency.mark_input(source):
+            QTimer.singleShot(0, self.input_latency.clear_input)
+
+    def toggle_latency_panel(self):
+        if self.latency_panel is None:
+            self.latency_panel = InputLatencyPanel(self.input_latency, self.latency_export_path, self)
+        self.latency_panel.setVisible(not self.latency_panel.isVisible())
+
+    def export_input_latency(self):
+        """Oturum sonunda özet loglanır ve JSON'a yazılır (komut gönderildiyse)"""
+        if self.input_latency is None or not self.input_latency.sample_count():
+            return
+        for line in self.input_latency.report_lines():
+            logging.info(line)
+        path = self.input_latency.export(self.latency_export_path)
+        if path:
+            logging.info(f"Giriş gecikmesi özeti yazıldı: {path}")
+
+    # ---------- Telemetri Oynatma ----------
+    def setup_replay(self):
+        """--replay ile açıldıysa oynatma çubuğunu ekler ve logu baştan oynatır"""
+        if self.replay is None:
+            return
+        self._base_title = f"{self._base_title} — Telemetri Oynatma"
+        self.setWindowTitle(self._base_title)
+
+        bar = QWidget()
+        layout = QHBoxLayout(bar)
+        layout.setContentsMargins(12, 8, 12, 0)
+
+        self.replay_play_btn = QPushButton("⏸️ Duraklat")
+        self.replay_play_btn.clicked.connect(self.toggle_replay)
+        layout.addWidget(self.replay_play_btn)
+
+        self.replay_slider = QSlider(Qt.Orientation.Horizontal)
+        self.replay_slider.setRange(0, int(self.replay.duration))
+        self.replay_slider.sliderReleased.connect(lambda: self.seek_replay(self.replay_slider.value()))
+        layout.addWidget(self.replay_slider, 1)
+
+        self.replay_time_label = QLabel()
+        layout.addWidget(self.replay_time_label)
+
+        self.replay_speed_box = QComboBox()
+        for speed in SPEED_STEPS:
+            self.replay_speed_box.addItem(f"{speed:g}×", speed)
+        index = self.replay_speed_box.findData(self.replay.speed)
+        if index < 0:
+            self.replay_speed_box.addItem(f"{self.replay.speed:g}×", self.replay.speed)
+            index = self.replay_speed_box.count() - 1
+        self.replay_speed_box.setCurrentIndex(index)
+        self.replay_speed_box.currentIndexChanged.connect(
+            lambda i: self.set_replay_speed(self.replay_speed_box.itemData(i))
+        )
+        layout.addWidget(self.replay_speed_box)
+
+        self.centralWidget().layout().insertWidget(0, bar)
+
+        # Olaylar bir sonraki kaydın zamanına kurulan tek atışlık zamanlayıcıyla uygulanır
+        self.replay_timer = QTimer(self)
+        self.replay_timer.setSingleShot(True)
+        self.replay_timer.timeout.connect(self._replay_tick)
+        self.replay_ui_timer = QTimer(self)
+        self.replay_ui_timer.timeout.connect(self._refresh_replay_position)
+        self.replay_ui_timer.start(250)
+
+        logging.info(f"Telemetri oynatma: {len(self.replay)} kayıt, "
+                     f"{format_position(self.replay.duration)}, {self.replay.speed:g}×")
+        self._apply_replay_events(self.replay.seek(0))
+        self.replay.play()
+        self._replay_tick()
+
+    def _apply_replay_events(self, events):
+        for kind, payload in events:
+            if kind == 'sensors':
+                self.update_sensor_data(payload)
+            else:
+                self.handle_firebase_data(payload)
+
+    def _replay_tick(self):
+        self._apply_replay_events(self.replay.due_events())
+        delay = self.replay.next_delay()
+        if delay is None:
+            if self.replay.is_finished():
+                self.replay.pause()
+                self.replay_play_btn.setText("▶️ Oynat")
+                self._flash_title("Oynatma bitti")
+            return
+        # Uzun boşluklarda hız/konum değişikliklerine tepki için en fazla 0.5 sn beklenir
+        self.replay_timer.start(int(min(delay, 0.5) * 1000))
+
+    def _refresh_replay_position(self):
+        position = self.replay.position()
+        if not self.replay_slider.isSliderDown():
+            self.replay_slider.setValue(int(position))
+        self.replay_time_label.setText(
+            f"{format_position(position)} / {format_position(self.replay.duration)}"
+        )
+
+    def toggle_replay(self):
+        if self.replay.playing:
+            self.replay.pause()
+            self.replay_timer.stop()
+            self.replay_play_btn.setText("▶️ Oynat")
+        else:
+            if self.replay.is_finished():
+                self._apply_replay_events(self.replay.seek(0))
+            self.replay.play()
+            self.replay_play_btn.setText("⏸️ Duraklat")
+            self._replay_tick()
+
+    def seek_replay(self, seconds):
+        """Zaman indeksiyle konuma atlar ve o andaki son durumları uygular"""
+        self._apply_replay_events(self.replay.seek(seconds))
+        self._refresh_replay_position()
+        if self.replay.playing:
+            self._replay_tick()
+
+    def set_replay_speed(self, speed):
+        self.replay.set_speed(speed)
+        if self.replay.playing:
+            self._replay_tick()
+
+    # ---------- Hareket Algılama ('rear' rolündeki kamera) ----------
+    def setup_motion_detection(self):
+        self.motion_detector = None
+        self._last_motion_alert = 0.0
+        if os.getenv('IKA_MOTION_DETECTION', '1') != '1' or self.rear_camera is None:
+            return
+        self.motion_detector = MotionDetector(self.motion_detected.emit)
+        self.motion_detected.connect(self.handle_motion_result)
+        self.frame_tap.subscribe(self.rear_camera.camera_key, self.motion_detector.on_frame)
+
+    def handle_motion_result(self, camera, boxes, latency):
+        panel = self.panels_by_key[camera]
+        panel.show_motion_regions(boxes)
+
+        now = time.monotonic()
+        if boxes and now - self._last_motion_alert > 3.0:
+            self._last_motion_alert = now
+            logging.warning(f"{panel.camera_name}: hareket, {len(boxes)} bölge")
+            self._flash_title(f"⚠️ {panel.camera_name}: hareket")
+
+        if self.motion_detector.processed % 100 == 0:
+            self.log_motion_latency()
+
+    def log_motion_latency(self):
+        summary = self.motion_detector.latency_summary() if self.motion_detector else None
+        if summary:
+            logging.info(
+                f"Hareket analizi gecikmesi: ort {summary['mean_ms']:.1f} ms, "
+                f"p95 {summary['p95_ms']:.1f} ms, maks {summary['max_ms']:.1f} ms "
+                f"({summary['processed']} kare, {summary['dropped']} atlandı)"
+            )
+
+    def start_frame_taps(self):
+        for panel in self.camera_panels():
+            if panel.camera_key in self.frame_tap_cameras or self.frame_tap.has_subscribers(panel.camera_key):
+                self.frame_tap.configure(panel.camera_key, self.frame_tap_width, self.frame_tap_height)
+                panel.start_frame_tap(self.frame_tap_fps, self.frame_tap_width, self.frame_tap_height,
+                                      panel.file_server_port)
+
+    def camera_panels(self):
+        return list(self.panels_by_key.values())
+
+    # ---------- Kamera Hazırlık Takibi ----------
+    def setup_readiness_tracking(self):
+        self.readiness = None
+        self.camera_outages = {}
+        self.camera_connection_state = {}
+        self.readiness_timer = QTimer(self)
+        self.readiness_timer.setSingleShot(True)
+        self.readiness_timer.timeout.connect(self.finish_readiness)
+        for panel in self.camera_panels():
+            panel.phase_reported.connect(self.on_camera_phase)
+
+    def begin_readiness(self):
+        self.readiness = ReadinessTracker([panel.camera_key for panel in self.camera_panels()])
+        self.readiness_timer.start(int(os.getenv('IKA_CAMERA_READY_TIMEOUT_MS', '20000')))
+        self.refresh_readiness_label()
+
+    def on_camera_phase(self, camera, phase, elapsed_ms, detail):
+        if phase in ('outage', 'reconnecting', 'recovered'):
+            self.on_camera_connection_event(camera, phase, elapsed_ms, detail)
+            return
+        if phase in ('token_will_expire', 'token_expired'):
+            self.renew_camera_token(camera)
+            return
+        if phase == 'token_renewed':
+            logging.info(f"{self._camera_name(camera)}: token yenilendi ({detail})")
+            return
+        if self.readiness is None:
+            return
+        if phase == 'failed':
+            self.readiness.fail(camera, detail)
+        else:
+            self.readiness.mark(camera, phase, elapsed_ms)
+            if phase == 'first_frame':
+                self.startup_timeline.mark(f'first_frame:{camera}')
+        self.refresh_readiness_label()
+        if self.readiness.is_complete():
+            self.finish_readiness()
+
+    def on_camera_connection_event(self, camera, event, value_ms, detail):
+        """Sayfanın yeniden bağlanma durum makinesinden gelen olaylar; diğer kameralara dokunulmaz"""
+        name = self._camera_name(camera)
+        if event == 'outage':
+            self.camera_outages.setdefault(camera, [])
+            self.camera_connection_state[camera] = "⚠️ bağlantı koptu"
+            logging.warning(f"{name}: bağlantı koptu ({detail})")
+        elif event == 'reconnecting':
+            self.camera_connection_state[camera] = f"🔄 {detail}"
+            logging.info(f"{name}: {value_ms / 1000:.1f} sn sonra yeniden bağlanılacak ({detail})")
+        elif event == 'recovered':
+            self.camera_outages.setdefault(camera, []).append(value_ms)
+            self.camera_connection_state.pop(camera, None)
+            logging.info(f"{name}: yeniden bağlandı, kesinti {value_ms / 1000:.2f} sn")
+            self._flash_title(f"{name} yeniden bağlandı ({value_ms / 1000:.1f} sn)")
+        self.refresh_readiness_label()
+
+    # ---------- Token Yenileme ----------
+    def setup_token_renewal(self):
+        self.token_provider = create_token_provider(self.cameras)
+        # Token dosyası değiştiğinde yeni token'lar süre dolmasını beklemeden uygulanır
+        self.token_watch_timer = QTimer(self)
+        self.token_watch_timer.timeout.connect(self._check_token_source)
+        self.token_watch_timer.start(5000)
+
+    def _check_token_source(self):
+        if self.token_provider.poll_changed():
+            for panel in self.camera_panels():
+                if panel.is_streaming:
+                    self.renew_camera_token(panel.camera_key)
+
+    def renew_camera_token(self, camera):
+        for panel in self.camera_panels():
+            if panel.camera_key == camera and panel.channel:
+                token = self.token_provider.get_token(panel.channel, 0)
+                if token:
+                    panel.renew_token(token)
+                else:
+                    logging.error(f"{panel.camera_name}: yeni token alınamadı ({panel.channel})")
+
+    def _camera_name(self, camera):
+        for panel in self.camera_panels():
+            if panel.camera_key == camera:
+                return panel.camera_name
+        return camera
+
+    def refresh_readiness_label(self):
+        names = {panel.camera_key: panel.camera_name for panel in self.camera_panels()}
+        lines = [self.readiness.summary_text(names)] if self.readiness else []
+        for camera, state in self.camera_connection_state.items():
+            lines.append(f"{names.get(camera, camera)}: {state}")
+        for camera, outages in self.camera_outages.items():
+            if outages:
+                lines.append(f"{names.get(camera, camera)}: {len(outages)} kesinti, son {outages[-1] / 1000:.1f} sn")
+        self.camera_status_label.setText("\n".join(lines))
+
+    def finish_readiness(self):
+        """Tüm kameralar hazır olduğunda ya da zaman aşımında TTFF'yi loglar"""
+        if self.readiness is None or self.readiness.logged:
+            return
+        self.readiness_timer.stop()
+        self.readiness.write_log()
+        ready = sum(1 for panel in self.camera_panels() if self.readiness.is_ready(panel.camera_key))
+        self._flash_title(f"Kameralar hazır: {ready}/{len(self.camera_panels())}")
+        if self.autostart:
+            self.finish_startup()
+
+    def update_camera_visibility(self):
+        """Küçültülmüş/örtülmüş pencere, ekran dışı karolar ve lazer modunda gereksiz video
+        çözmeyi durdurur; görünür karo sayısı bütçeyi aşarsa önceliği düşük olanlar duraklatılır.
+        Kaydedilen kameranın sayfası aboneliği bırakmaz, yalnızca karoya çizmeyi durdurur"""
+        if not hasattr(self, 'focused_camera'):
+            return
+        window_visible = self.isVisible() and not self.isMinimized()
+        handle = self.windowHandle()
+        if handle is not None and not handle.isExposed():
+            window_visible = False
+
+        visible = set()
+        for panel in self.camera_panels():
+            if not (window_visible and panel.isVisible() and self._tile_on_screen(panel)):
+                continue
+            if self.laser_mode and self.laser_only_video and panel is not self.laser_camera \
+                    and self.laser_camera is not None:
+                continue
+            visible.add(panel.camera_key)
+        decoded = select_decoded(self.cameras, visible, self.focused_camera.camera_key, self.max_decoded_videos)
+        for panel in self.camera_panels():
+            panel.set_video_visible(panel.camera_key in decoded)
+
+    def _tile_on_screen(self, panel):
+        """Karo pencerede kırpılmamış ve en az bir ekranla kesişiyor mu"""
+        if panel.visibleRegion().isEmpty():
+            return False
+        rect = QRect(panel.mapToGlobal(QPoint(0, 0)), panel.size())
+        return any(screen.geometry().intersects(rect) for screen in QApplication.screens())
+
+    def _camera_load_label(self):
+        streaming = [panel for panel in self.camera_panels() if panel.is_streaming]
+        if not streaming:
+            return None
+        decoded = [panel for panel in streaming if panel.video_visible]
+        high = sum(1 for panel in decoded if panel.high_quality)
+        return f"{len(decoded)}/{len(streaming)} video çözülüyor, {high} yüksek kalite"
+
+    def _sample_camera_cpu(self):
+        """CPU kullanımını ve toplam alım bant genişliğini o anki video yüküne göre kaydeder"""
+        label = self._camera_load_label()
+        cpu = self.cpu_sampler.sample()
+        self.visibility_cpu_stats.add(label or "yayın yok", cpu)
+        if self.render_auto and self.overload.sample(cpu):
+            load = self.overload.last
+            self.set_render_profile('performance', f"CPU %{load['cpu_percent']:.0f}, "
+                                                   f"kare gecikmesi {load['frame_late_ms']:.0f} ms")
+        if label is None:
+            return
+
+        # Her panelin istatistiği gelince toplam kbps tek örnek olarak eklenir
+        panels = [panel for panel in self.camera_panels() if panel.is_streaming]
+        self._pending_stream_stats = {}
+        for panel in panels:
+            panel.request_stream_stats(
+                lambda stats, p=panel, n=len(panels), lb=label: self._collect_stream_stats(p, stats, n, lb)
+            )
+
+    def _collect_stream_stats(self, panel, stats, expected, label):
+        self._pending_stream_stats[panel.camera_name] = stats or {}
+        if len(self._pending_stream_stats) == expected:
+            total = sum(s.get('receiveBitrate', 0) for s in self._pending_stream_stats.values()) / 1000.0
+            self.bandwidth_stats.add(label, total)
+            self._pending_stream_stats = {}
+
+    # ---------- Odak Kamera (dual stream) ----------
+    def set_focus_camera(self, panel):
+        """Odak paneline yüksek, diğerlerine düşük kalite akış atar"""
+        self.focused_camera = panel
+        for camera in self.camera_panels():
+            camera.set_high_quality(camera is panel)
+
+    def cycle_focus_camera(self):
+        panels = self.camera_panels()
+        index = panels.index(self.focused_camera) if self.focused_camera in panels else -1
+        self.set_focus_camera(panels[(index + 1) % len(panels)])
+        # Çözme bütçesi doluysa odaklanan karo öne alınır
+        self.update_camera_visibility()
+        self._flash_title(f"Odak: {self.focused_camera.camera_name}")
 
     # Camera
     def create_camera_panel(self):
@@ -986,16 +2692,32 @@ class IKADashboard(QMainWindow):
         layout = QVBoxLayout(panel)
         layout.setSpacing(14)
 
-        # Üst satır: Ön Kamera (Agora) + Vites Kontrolü
+        # Karolar kamera topolojisinden oluşturulur; roller ana, lazer ve hareket kamerasını belirler
+        self.panels_by_key = {}
+        for camera in self.cameras:
+            tile = AgoraCameraPanel(camera.name, camera.key)
+            tile.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            self.panels_by_key[camera.key] = tile
+        main = camera_with_role(self.cameras, 'main')
+        laser = camera_with_role(self.cameras, 'laser')
+        rear = camera_with_role(self.cameras, 'rear')
+        self.main_camera = self.panels_by_key[main.key]
+        self.laser_camera = self.panels_by_key[laser.key] if laser else None
+        self.rear_camera = self.panels_by_key[rear.key] if rear else None
+
+        # Alt satır(lar): diğer kameralar; sayı arttıkça sütunlar artar, karolar küçülür
+        others = [self.panels_by_key[camera.key] for camera in self.cameras if camera.key != main.key]
+        columns = grid_columns(len(others))
+        rows = (len(others) + columns - 1) // columns
+
+        # Üst satır: Ana Kamera (Agora) + Vites Kontrolü
         top_row = QHBoxLayout()
         top_row.setSpacing(20)  # 1440x900 için daha fazla boşluk
 
-        # Ön kamera yerine Agora kamera paneli kullan - 1440x900 için optimize
-        self.front_camera = AgoraCameraPanel("🚗 Ön Kamera")
-        self.front_camera.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.front_camera.setMinimumSize(800, 450)  # 1440x900 için optimize edilmiş minimum boyut
-        self.front_camera.setMaximumHeight(500)  # Maksimum yükseklik sınırı
-        top_row.addWidget(self.front_camera, 1)
+        # 1440x900 için optimize edilmiş minimum boyut; ikinci satır açılırsa alçalır
+        self.main_camera.setMinimumSize(800, 450 if rows <= 1 else 320)
+        self.main_camera.setMaximumHeight(500)  # Maksimum yükseklik sınırı
+        top_row.addWidget(self.main_camera, 1)
 
         self.gear_group = self.create_gear_group()
         self.gear_group.setMaximumWidth(180)  # 1440x900 için daha geniş
@@ -1003,26 +2725,17 @@ class IKADashboard(QMainWindow):
 
         layout.addLayout(top_row)
 
-                # Alt satır: Lazer Kamera ve Arka Kamera (Agora)
         grid = QGridLayout()
-        grid.setSpacing(20)  # 1440x900 için daha fazla boşluk
-
-        # Lazer Atış Kamera - Agora entegrasyonu (1440x900 için optimize)
-        self.laser_camera = AgoraCameraPanel("🎯 Lazer Atış Kamera")
-        self.laser_camera.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.laser_camera.setMinimumSize(600, 350)  # 1440x900 için optimize edilmiş boyut
-        self.laser_camera.setMaximumHeight(400)  # Maksimum yükseklik sınırı
-
-        # Arka Kamera - Agora entegrasyonu (1440x900 için optimize)
-        self.back_camera = AgoraCameraPanel("🔙 Arka Kamera")
-        self.back_camera.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.back_camera.setMinimumSize(600, 350)  # 1440x900 için optimize edilmiş boyut
-        self.back_camera.setMaximumHeight(400)  # Maksimum yükseklik sınırı
-
-        grid.addWidget(self.laser_camera, 0, 0)
-        grid.addWidget(self.back_camera, 0, 1)
-        grid.setColumnStretch(0, 1)
-        grid.setColumnStretch(1, 1)
+        grid.setSpacing(20 if columns <= 2 else 12)
+        for index, tile in enumerate(others):
+            if len(others) <= 2:
+                tile.setMinimumSize(600, 350)  # 1440x900 için optimize edilmiş boyut
+            else:
+                tile.setMinimumSize(280, 160)
+            tile.setMaximumHeight(400 if rows <= 1 else 240)
+            grid.addWidget(tile, index // columns, index % columns)
+        for column in range(columns):
+            grid.setColumnStretch(column, 1)
 
         layout.addLayout(grid)
         return panel
@@ -1043,7 +2756,7 @@ class IKADashboard(QMainWindow):
             (self.gearB_btn, "B"),
             (self.gearG_btn, "G"),
         ]:
-            btn.setStyleSheet("font-size:14px;font-weight:900;")
+            btn.setProperty("class", "control-key")
             btn.pressed.connect(lambda gear=gr: self.gear_pressed(gear))
             btn.released.connect(lambda gear=gr: self.gear_released(gear))
 
@@ -1058,7 +2771,7 @@ class IKADashboard(QMainWindow):
         throttle_layout.setContentsMargins(0, 8, 0, 0)
         
         throttle_label = QLabel("Gaz Kontrolü (↑↓)")
-        throttle_label.setStyleSheet("font-size:10px;font-weight:700;color:#cbd5e1;")
+        throttle_label.setObjectName("ThrottleLabel")
         throttle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         throttle_layout.addWidget(throttle_label)
         
@@ -1070,7 +2783,7 @@ class IKADashboard(QMainWindow):
         self.throttle_down_btn = QPushButton("-"); self.throttle_down_btn.setMinimumSize(30, 25)
         
         for b, name in [(self.throttle_up_btn,"up"),(self.throttle_down_btn,"down")]:
-            b.setStyleSheet("font-size:10px;font-weight:900;")
+            b.setProperty("class", "throttle-key")
             b.pressed.connect(lambda nm=name: self.throttle_pressed(nm))
             b.released.connect(lambda nm=name: self.throttle_released(nm))
         
@@ -1085,7 +2798,7 @@ class IKADashboard(QMainWindow):
         panel = QGroupBox("Sensör Verileri")
         layout = QVBoxLayout(panel)
         layout.setSpacing(4)
-        panel.setStyleSheet("QLabel { font-size:12px; }")
+        panel.setObjectName("SensorPanel")
 
         # IMU
         imu_group = QWidget()
@@ -1099,6 +2812,16 @@ class IKADashboard(QMainWindow):
         imu.addWidget(QLabel("Pitch (°):"), 1, 0); imu.addWidget(self.pitch_lcd, 1, 1)
         imu.addWidget(QLabel("Yaw (°):"), 2, 0); imu.addWidget(self.yaw_lcd, 2, 1)
 
+        # Geçmiş grafikleri (LCD'lerin yanında)
+        method = os.getenv('IKA_CHART_DECIMATION', 'minmax')
+        self.sparklines = {
+            name: SparklineWidget(self.telemetry_history[name], method)
+            for name in ('roll', 'pitch', 'yaw', 'alt', 'speed')
+        }
+        imu.addWidget(self.sparklines['roll'], 0, 2)
+        imu.addWidget(self.sparklines['pitch'], 1, 2)
+        imu.addWidget(self.sparklines['yaw'], 2, 2)
+
         layout.addWidget(imu_group)
 
         # GPS 
@@ -1114,8 +2837,14 @@ class IKADashboard(QMainWindow):
         gps.addWidget(QLabel("Longitude:"), 1, 0); gps.addWidget(self.lon_lcd, 1, 1)
         gps.addWidget(QLabel("Altitude (m):"), 2, 0); gps.addWidget(self.alt_lcd, 2, 1)
         gps.addWidget(QLabel("Speed (km/h):"), 3, 0); gps.addWidget(self.speed_lcd, 3, 1)
+        gps.addWidget(self.sparklines['alt'], 2, 2)
+        gps.addWidget(self.sparklines['speed'], 3, 2)
 
         layout.addWidget(gps_group)
+
+        # Araç izi
+        self.track_map = TrackMapWidget(self.gps_track)
+        layout.addWidget(self.track_map)
         
         # Kamera Kontrol Paneli
         camera_group = QGroupBox("📹 Kamera Kontrolü")
@@ -1125,39 +2854,29 @@ class IKADashboard(QMainWindow):
         # Yayın Başlatma Butonu
         self.start_all_streams_btn = QPushButton("🎥 Yayını Başlat")
         self.start_all_streams_btn.clicked.connect(self.start_all_camera_streams)
-        self.start_all_streams_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #4CAF50, stop:1 #45a049);
-                border: 1px solid #4CAF50; border-radius: 8px;
-                color: white; font-weight: 800; padding: 15px;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #45a049, stop:1 #4CAF50);
-            }
-        """)
+        self.start_all_streams_btn.setObjectName("StreamButton")
+        self.start_all_streams_btn.setProperty("state", "idle")
         camera_layout.addWidget(self.start_all_streams_btn)
         
         # Kaydetme Başlatma Butonu
         self.start_recording_btn = QPushButton("📹 Kaydetmeyi Başlat")
         self.start_recording_btn.clicked.connect(self.start_recording_all_cameras)
-        self.start_recording_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #2196F3, stop:1 #1976D2);
-                border: 1px solid #2196F3; border-radius: 8px;
-                color: white; font-weight: 800; padding: 15px;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1976D2, stop:1 #2196F3);
-            }
-        """)
+        self.start_recording_btn.setObjectName("RecordButton")
+        self.start_recording_btn.setProperty("state", "idle")
         camera_layout.addWidget(self.start_recording_btn)
         
+        # Kamera başına ilk kareye kadar geçen süre
+        self.camera_status_label = QLabel("")
+        self.camera_status_label.setProperty("class", "status-note")
+        self.camera_status_label.setWordWrap(True)
+        camera_layout.addWidget(self.camera_status_label)
+        
+        # Aşamalı açılışın ilerlemesi; bitince gizlenir
+        self.startup_label = QLabel("Açılış: alt sistemler başlatılıyor…")
+        self.startup_label.setProperty("class", "status-note")
+        self.startup_label.setWordWrap(True)
+        camera_layout.addWidget(self.startup_label)
+        
         layout.addWidget(camera_group)
         layout.addStretch()
         return panel
@@ -1218,7 +2937,7 @@ class IKADashboard(QMainWindow):
         self.right_btn = QPushButton("►\nD\nSağ"); self.right_btn.setMinimumSize(70, 70)
 
         for b, name in [(self.up_btn,"up"),(self.down_btn,"down"),(self.left_btn,"left"),(self.right_btn,"right")]:
-            b.setStyleSheet("font-size:14px;font-weight:900;")
+            b.setProperty("class", "control-key")
             b.pressed.connect(lambda nm=name: self.direction_pressed(nm))
             b.released.connect(lambda nm=name: self.direction_released(nm))
 
@@ -1238,16 +2957,15 @@ class IKADashboard(QMainWindow):
         self.laser_right_btn = QPushButton("►\nSağ"); self.laser_right_btn.setMinimumSize(70, 70)
         self.laser_fire_btn = QPushButton("🔥\nATEŞ!"); self.laser_fire_btn.setMinimumSize(70, 70)
 
-        redish = "font-size:12px;font-weight:900;"
         for b, nm in [
             (self.laser_up_btn,"up"), (self.laser_down_btn,"down"),
             (self.laser_left_btn,"left"), (self.laser_right_btn,"right")
         ]:
-            b.setStyleSheet(redish)
+            b.setProperty("class", "laser-key")
             b.pressed.connect(lambda name=nm: self.laser_direction_pressed(name))
             b.released.connect(lambda name=nm: self.laser_direction_released(name))
 
-        self.laser_fire_btn.setStyleSheet("font-size:14px;font-weight:1000;")
+        self.laser_fire_btn.setObjectName("LaserFire")
         self.laser_fire_btn.pressed.connect(self.laser_fire_pressed)
         self.laser_fire_btn.released.connect(self.laser_fire_released)
 
@@ -1265,6 +2983,25 @@ class IKADashboard(QMainWindow):
 
         layout.addStretch()
 
+        # Arayüz takılma göstergesi (bkz. setup_stall_watchdog)
+        self.stall_label = QLabel("⏱️ Arayüz akıcı")
+        self.stall_label.setObjectName("StallIndicator")
+        self.stall_label.setProperty("severity", "ok")
+        # Giriş gecikmesi tanılama penceresi (bkz. setup_input_latency)
+        self.latency_btn = QPushButton("📈 Gecikme")
+        self.latency_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.latency_btn.setToolTip("Tuştan veritabanı onayına komut gecikmeleri")
+        # Performans çizim profili (bkz. setup_render_profile)
+        self.render_profile_btn = QPushButton("⚡")
+        self.render_profile_btn.setCheckable(True)
+        self.render_profile_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.render_profile_btn.setToolTip("Performans profili: efektsiz, düz tema, sınırlı video yenileme")
+        diag_row = QHBoxLayout()
+        diag_row.addWidget(self.stall_label, 1)
+        diag_row.addWidget(self.render_profile_btn)
+        diag_row.addWidget(self.latency_btn)
+        layout.addLayout(diag_row)
+
         return panel
 
     # ---------- Klavye Kısayolları ----------
@@ -1286,10 +3023,7 @@ class IKADashboard(QMainWindow):
         if direction in button_map:
             button = button_map[direction]
             # Butonu vurgula - basılı tutma süresince kalacak
-
-            original_style = button.styleSheet()
-            button.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-            button.setProperty("original_style", original_style)
+            button.setDown(True)
 
     def _unhighlight_button(self, direction: str):
         """Tuş bırakıldığında butonun vurgusunu kaldır"""
@@ -1302,9 +3036,7 @@ class IKADashboard(QMainWindow):
         
         if direction in button_map:
             button = button_map[direction]
-            original_style = button.property("original_style")
-            if original_style:
-                button.setStyleSheet(original_style)
+            button.setDown(False)
 
     def _highlight_laser_button(self, direction: str):
         """Lazer modunda tuşa basınca ilgili butonu vurgula"""
@@ -1319,10 +3051,7 @@ class IKADashboard(QMainWindow):
         if direction in laser_button_map:
             button = laser_button_map[direction]
             # Butonu vurgula - basılı tutma süresince kalacak
-            original_style = button.styleSheet()
-            button.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-            # Butonun orijinal stilini sakla ki tuş bırakıldığında geri döndürebilelim
-            button.setProperty("original_style", original_style)
+            button.setDown(True)
 
     def _unhighlight_laser_button(self, direction: str):
         """Lazer modunda tuş bırakıldığında butonun vurgusunu kaldır"""
@@ -1335,9 +3064,7 @@ class IKADashboard(QMainWindow):
         
         if direction in laser_button_map:
             button = laser_button_map[direction]
-            original_style = button.property("original_style")
-            if original_style:
-                button.setStyleSheet(original_style)
+            button.setDown(False)
 
     def _highlight_gear_button(self, gear: str):
         """Vites tuşuna basınca ilgili butonu vurgula"""
@@ -1352,9 +3079,7 @@ class IKADashboard(QMainWindow):
         if gear in gear_button_map:
             button = gear_button_map[gear]
             # Butonu vurgula - basılı tutma süresince kalacak
-            original_style = button.styleSheet()
-            button.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-            button.setProperty("original_style", original_style)
+            button.setDown(True)
 
     def _unhighlight_gear_button(self, gear: str):
         """Vites tuşu bırakıldığında butonun vurgusunu kaldır"""
@@ -1367,35 +3092,27 @@ class IKADashboard(QMainWindow):
         
         if gear in gear_button_map:
             button = gear_button_map[gear]
-            original_style = button.property("original_style")
-            if original_style:
-                button.setStyleSheet(original_style)
+            button.setDown(False)
 
     def _highlight_laser_fire_button(self):
         """Lazer ateşleme butonunu vurgula"""
         if hasattr(self, 'laser_fire_btn'):
-            original_style = self.laser_fire_btn.styleSheet()
-            self.laser_fire_btn.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-            self.laser_fire_btn.setProperty("original_style", original_style)
+            self.laser_fire_btn.setDown(True)
 
     def _unhighlight_laser_fire_button(self):
         """Lazer ateşleme butonunun vurgusunu kaldır"""
         if hasattr(self, 'laser_fire_btn'):
-            original_style = self.laser_fire_btn.property("original_style")
-            if original_style:
-                self.laser_fire_btn.setStyleSheet(original_style)
+            self.laser_fire_btn.setDown(False)
 
     def _highlight_laser_toggle_button(self):
         """Lazer toggle butonunu vurgula"""
-        original_style = self.laser_btn.styleSheet()
-        self.laser_btn.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-        QTimer.singleShot(200, lambda: self.laser_btn.setStyleSheet(original_style))
+        self.laser_btn.setDown(True)
+        QTimer.singleShot(200, lambda: self.laser_btn.setDown(False))
 
     def _highlight_emergency_button(self):
         """Acil durdurma butonunu vurgula"""
-        original_style = self.emergency_btn.styleSheet()
-        self.emergency_btn.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-        QTimer.singleShot(200, lambda: self.emergency_btn.setStyleSheet(original_style))
+        self.emergency_btn.setDown(True)
+        QTimer.singleShot(200, lambda: self.emergency_btn.setDown(False))
 
 
 
@@ -1408,9 +3125,7 @@ class IKADashboard(QMainWindow):
         
         if direction in throttle_button_map:
             button = throttle_button_map[direction]
-            original_style = button.styleSheet()
-            button.setStyleSheet(original_style + "; border: 3px solid #4ecdc4; border-radius: 8px;")
-            button.setProperty("original_style", original_style)
+            button.setDown(True)
 
     def _unhighlight_throttle_button(self, direction: str):
         """Gaz butonunun vurgusunu kaldır"""
@@ -1421,9 +3136,7 @@ class IKADashboard(QMainWindow):
         
         if direction in throttle_button_map:
             button = throttle_button_map[direction]
-            original_style = button.property("original_style")
-            if original_style:
-                button.setStyleSheet(original_style)
+            button.setDown(False)
     # ---------- Sensörler ----------
     def build_sensors(self):
         self.sensor_thread = SensorThread()
@@ -1434,109 +3147,211 @@ class IKADashboard(QMainWindow):
 
     def update_sensor_data(self, data):
         """Sensör verilerini UI'da güncelle"""
+        if self.flight_recorder is not None:
+            self.flight_recorder.record_sensors(data)
+        now = time.time()
+        self.telemetry_history.add(now, data)
+        gps = data.get('gps') if isinstance(data, dict) else None
+        if isinstance(gps, dict) and 'latitude' in gps and 'longitude' in gps:
+            try:
+                self.gps_track.add(now, float(gps['latitude']), float(gps['longitude']))
+            except (TypeError, ValueError):
+                pass
         try:
+            # LCD'ler burada güncellenmez; değerler işaretlenir, kare zamanlayıcısı uygular
             if 'imu' in data and isinstance(data['imu'], dict):
                 imu = data['imu']
                 if 'roll' in imu:
-                    self.roll_lcd.display(f"{float(imu['roll']):.1f}")
+                    self.ui_scheduler.set('roll', f"{float(imu['roll']):.1f}")
                 if 'pitch' in imu:
-                    self.pitch_lcd.display(f"{float(imu['pitch']):.1f}")
+                    self.ui_scheduler.set('pitch', f"{float(imu['pitch']):.1f}")
                 if 'yaw' in imu:
-                    self.yaw_lcd.display(f"{float(imu['yaw']):.1f}")
+                    self.ui_scheduler.set('yaw', f"{float(imu['yaw']):.1f}")
             
             if 'gps' in data and isinstance(data['gps'], dict):
                 gps = data['gps']
                 if 'latitude' in gps:
-                    self.lat_lcd.display(f"{float(gps['latitude']):.6f}")
+                    self.ui_scheduler.set('lat', f"{float(gps['latitude']):.6f}")
                 if 'longitude' in gps:
-                    self.lon_lcd.display(f"{float(gps['longitude']):.6f}")
+                    self.ui_scheduler.set('lon', f"{float(gps['longitude']):.6f}")
                 if 'altitude' in gps:
-                    self.alt_lcd.display(f"{float(gps['altitude']):.1f}")
+                    self.ui_scheduler.set('alt', f"{float(gps['altitude']):.1f}")
                 if 'speed' in gps:
-                    self.speed_lcd.display(f"{float(gps['speed']):.1f}")
+                    self.ui_scheduler.set('speed', f"{float(gps['speed']):.1f}")
             
         except Exception as e:
             # Sensör verisi güncellenirken hata oluştu, sessizce geç!! BURAYA TEKRAR BAK
             pass
 
+    # ---------- Aşamalı Açılış ----------
+    def start_subsystems(self):
+        """Pencere gösterildikten sonra alt sistemleri başlatır: Firebase ve dosya sunucusu
+        arka plan thread'lerinde, WebView'ler GUI thread'inde her olay döngüsü turunda bir tane"""
+        timeline = self.startup_timeline
+        self._pending_webviews = list(self.camera_panels())
+        keys = [panel.camera_key for panel in self._pending_webviews]
+        timeline.expect('file_server', *(f'webview:{k}' for k in keys), *(f'page:{k}' for k in keys))
+        if self.replay is None:
+            timeline.expect('firebase_init')
+        self.file_server_ready.connect(self.on_file_server_ready)
+        self.init_firebase()
+        self.start_file_server()
+        QTimer.singleShot(0, self._attach_next_webview)
+        self.refresh_startup_progress()
+
+    def _attach_next_webview(self):
+        """Arada çizim ve tuş olayları işlensin diye WebView'ler tek tek oluşturulur"""
+        if not self._pending_webviews:
+            return
+        panel = self._pending_webviews.pop(0)
+        key = panel.camera_key
+        if QWebEngineView is None:
+            with self.startup_timeline.phase('webengine_import'):
+                load_webengine()
+        self.startup_timeline.begin(f'webview:{key}')
+        panel.attach_webview()
+        self.startup_timeline.end(f'webview:{key}')
+        # Sayfa Chromium sürecinde yüklenir; diğer aşamalarla eşzamanlı sürer
+        self.startup_timeline.begin(f'page:{key}')
+        panel.webview.loadFinished.connect(lambda ok, k=key: self._on_page_loaded(k, ok))
+        self.refresh_startup_progress()
+        if self._pending_webviews:
+            QTimer.singleShot(0, self._attach_next_webview)
+
+    def _on_page_loaded(self, key, ok):
+        self.startup_timeline.end(f'page:{key}', ok)
+        self.refresh_startup_progress()
+
+    def refresh_startup_progress(self):
+        timeline = self.startup_timeline
+        if timeline.logged:
+            return
+        self.startup_label.setText(timeline.summary_text())
+        if timeline.is_complete():
+            timeline.write_log()
+            self._flash_title(timeline.summary_text())
+            QTimer.singleShot(5000, self.startup_label.hide)
+            if self.autostart and self.replay is None:
+                # İlk kare gelince (ya da hazırlık zaman aşımında) finish_startup çağrılır
+                self.start_all_camera_streams()
+            else:
+                self.finish_startup()
+
+    def finish_startup(self):
+        """Açılış (ve --autostart ile ilk kareler) tamamlandı: profil yazılır, istenirse çıkılır"""
+        if self._startup_finished:
+            return
+        self._startup_finished = True
+        if self.profile_path:
+            self.dump_startup_profile(self.profile_path)
+        if self.quit_after_startup:
+            QTimer.singleShot(0, self.close)
+
+    def dump_startup_profile(self, path):
+        """--profile-startup: import ve kurulum sürelerinin dökümü (konsol + JSON)"""
+        timeline = self.startup_timeline
+        first_frames = [timeline.start_ms(name) for name in timeline.phases if name.startswith('first_frame:')]
+        profile = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'time_to_window_visible_ms': timeline.start_ms('window_exposed'),
+            'time_to_first_frame_ms': min(first_frames) if first_frames else None,
+            'startup_total_ms': round(timeline.total_ms(), 1),
+            'phases': [
+                {'name': name, 'start_ms': round(start, 1), 'duration_ms': round(duration, 1),
+                 'thread': thread, 'ok': ok, 'detail': detail}
+                for name, start, duration, thread, ok, detail in timeline.rows()
+            ],
+            'imports': IMPORT_PROFILER.summary() if IMPORT_PROFILER is not None else [],
+        }
+        print("\n".join(timeline.report_lines()))
+        if IMPORT_PROFILER is not None:
+            print("\n".join(IMPORT_PROFILER.report_lines()))
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(profile, f, ensure_ascii=False, indent=2)
+            print(f"✅ Açılış profili yazıldı: {path}")
+        except OSError as e:
+            logging.error(f"Açılış profili yazılamadı: {e}")
+
     # Firebase Entegrasyonu!! BURAYI MUTLAKA KONTOL ET
     def init_firebase(self):
-        # Firebase thread'i her zaman oluştur (hata önleme için)
+        if self.replay is not None:
+            # Oynatma modunda Firebase'e bağlanılmaz
+            self.firebase_thread = None
+            return
+        
+        # Firebase yalnızca FirebaseThread içinde başlatılır; GUI thread'i ağ isteği beklemez
         try:
-            self.firebase_thread = FirebaseThread()
+            self.firebase_thread = FirebaseThread(self.startup_timeline)
             self.firebase_thread.data_received.connect(self.handle_firebase_data)
+            self.firebase_thread.initialized.connect(self.on_firebase_initialized)
+            self.firebase_thread.cleanup_finished.connect(lambda ok: self.refresh_startup_progress())
             self.firebase_thread.start()
         except Exception as e:
-            # Firebase thread oluşturulamazsa boş bir thread oluştur
+            logging.error(f"Firebase thread'i başlatılamadı: {e}")
             self.firebase_thread = None
-        
-        if FIREBASE_AVAILABLE:
-            try:
-                if self.initialize_firebase():
-                    if hasattr(self, 'sensor_thread'):
-                        self.sensor_thread.set_firebase_initialized(True)
-                else:
-                    if hasattr(self, 'sensor_thread'):
-                        self.sensor_thread.set_firebase_initialized(False)
-            except Exception as e:
-                if hasattr(self, 'sensor_thread'):
-                    self.sensor_thread.set_firebase_initialized(False)
-        else:
-            if hasattr(self, 'sensor_thread'):
-                self.sensor_thread.set_firebase_initialized(False)
-        
-        # Dosya sunucusu başlat
-        self.file_server = FileServer(port=8080, recordings_dir="recordings")
-        if self.file_server.start():
+            self.startup_timeline.begin('firebase_init')
+            self.startup_timeline.end('firebase_init', False, 'thread başlatılamadı')
+
+    def on_firebase_initialized(self, ok):
+        self.firebase_initialized = ok
+        self.sensor_thread.set_firebase_initialized(ok)
+        self.refresh_startup_progress()
+
+    def start_file_server(self):
+        # Dosya sunucusu (kare musluğu da aynı sunucuyu kullanır); soket açılışı arka planda
+        self.file_server = FileServer(port=8080, recordings_dir="recordings", frame_tap=self.frame_tap,
+                                      token_provider=self.token_provider, **token_endpoint_options(self.cameras))
+
+        def start():
+            self.startup_timeline.begin('file_server')
+            ok = self.file_server.start()
+            self.startup_timeline.end('file_server', ok)
+            self.file_server_ready.emit(ok)
+
+        self._file_server_thread = threading.Thread(target=start, name='FileServerStart', daemon=True)
+        self._file_server_thread.start()
+
+    def on_file_server_ready(self, ok):
+        if ok:
             logging.info("Dosya sunucusu başlatıldı")
+            for panel in self.camera_panels():
+                panel.file_server_port = self.file_server.port
         else:
             logging.error("Dosya sunucusu başlatılamadı")
-    
-    def initialize_firebase(self):
-        """Firebase'i başlat"""
-        if not FIREBASE_AVAILABLE:
-            self.firebase_initialized = False
-            return False
-            
-        try:
-            if firebase_admin._apps:
-                for app in firebase_admin._apps.copy().values():
-                    firebase_admin.delete_app(app)
-            
-            cred = credentials.Certificate('ika-db-eb609-firebase-adminsdk-fbsvc-27327d9168.json')
-            firebase_admin.initialize_app(cred, {
-                'databaseURL': 'https://ika-db-eb609-default-rtdb.europe-west1.firebasedatabase.app/'
-            })
-            self.firebase_initialized = True
-            return True
-            
-        except Exception as e:
-            self.firebase_initialized = False
-            return False
+        self.refresh_startup_progress()
     
     def send_to_firebase(self, path, data):
         """Firebase'e veri gönder"""
+        if self.flight_recorder is not None:
+            self.flight_recorder.record_command(path, data)
+        
         if not FIREBASE_AVAILABLE:
             return True
             
         if not self.firebase_initialized:
             return True
             
-        try:
-            # Tüm verilere timestamp ekle zamanlama için lazım
-            data['timestamp'] = time.time()
-            
-            ref = db.reference(path)
-            ref.set(data)
-            return True
-        except Exception as e:
-            return True
+        # Tüm verilere timestamp ekle zamanlama için lazım
+        data['timestamp'] = time.time()
+        # Ağ çağrısı GUI thread'ini bekletmez; gönderim sırası korunur
+        stamp = self.input_latency.stamp() if self.input_latency is not None else None
+        self.command_sender.submit(path, data, stamp)
+        return True
+
+    def _write_to_firebase(self, path, data):
+        """CommandSender thread'inde çalışır; set() sunucu yazmayı onaylayınca döner"""
+        db.reference(path).set(data)
     
     def handle_firebase_data(self, firebase_data):
         """Firebase'den gelen verileri işle"""
         data_type = firebase_data.get('type')
         data = firebase_data.get('data')
         
+        # Sensörler update_sensor_data'da kaydedilir; diğerleri komutların yankısıdır
+        if self.flight_recorder is not None and data is not None and data_type != 'sensors':
+            self.flight_recorder.record_state(data_type, data)
+        
         if data_type == 'sensors' and data:
             self.update_sensor_data(data)
             
@@ -1613,77 +3428,62 @@ class IKADashboard(QMainWindow):
         # Buton metnini kontrol et
         if "Başlat" in self.start_all_streams_btn.text():
             try:
-                # Her kamera için ayrı kanal ve token - config.env'den alınır
+                # Her kamera için ayrı kanal - kamera topolojisinden alınır
                 camera_configs = [
                     {
-                        'camera': self.front_camera,
-                        'channel': os.getenv('AGORA_CHANNEL_ONE', 'channel_one'),
-                        'token': os.getenv('AGORA_TOKEN_ONE', AGORA_TOKEN)
-                    },
-                    {
-                        'camera': self.laser_camera,
-                        'channel': os.getenv('AGORA_CHANNEL_TWO', 'channel_two'),
-                        'token': os.getenv('AGORA_TOKEN_TWO', AGORA_TOKEN)
-                    },
-                    {
-                        'camera': self.back_camera,
-                        'channel': os.getenv('AGORA_CHANNEL_THREE', 'channel_three'),
-                        'token': os.getenv('AGORA_TOKEN_THREE', AGORA_TOKEN)
+                        'camera': self.panels_by_key[camera.key],
+                        'channel': camera.channel
                     }
+                    for camera in self.cameras
                 ]
+                # Token'lar sağlayıcıdan alınır (config.env, izlenen dosya veya yerel üreteç)
+                for config in camera_configs:
+                    config['token'] = self.token_provider.get_token(config['channel'], 0) or AGORA_TOKEN
+                missing = missing_credentials({config['channel']: config['token'] for config in camera_configs})
+                if missing:
+                    self.report_missing_credentials(missing)
+                    return
                 
-                # Tüm kameraları başlat
+                # Tüm kameraları başlat - runJavaScript beklemediği için üç sayfa aynı anda bağlanır,
+                # hazır olma durumu sayfalardan gelen aşama bildirimleriyle takip edilir
+                self.begin_readiness()
                 for config in camera_configs:
                     config['camera'].start_stream(AGORA_APP_ID, config['token'], config['channel'])
+                self.start_frame_taps()
                 
                 # Buton metnini güncelle
                 self.start_all_streams_btn.setText("⏹️ Yayını Durdur")
-                self.start_all_streams_btn.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #f44336, stop:1 #d32f2f);
-                        border: 1px solid #f44336; border-radius: 8px;
-                        color: white; font-weight: 800; padding: 15px;
-                        font-size: 16px;
-                    }
-                    QPushButton:hover {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #d32f2f, stop:1 #f44336);
-                    }
-                """)
-                
-                QMessageBox.information(self, "Başarılı", "Tüm kameralar başlatıldı!")
+                self._set_style_state(self.start_all_streams_btn, "state", "active")
                 
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Kamera başlatma hatası: {str(e)}")
         else:
             # Tüm kameraları durdur
             try:
-                self.front_camera.stop_stream()
-                self.laser_camera.stop_stream()
-                self.back_camera.stop_stream()
+                self.finish_readiness()
+                for panel in self.camera_panels():
+                    panel.stop_stream()
                 
                 # Buton metnini güncelle
                 self.start_all_streams_btn.setText("🎥 Yayını Başlat")
-                self.start_all_streams_btn.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #4CAF50, stop:1 #45a049);
-                        border: 1px solid #4CAF50; border-radius: 8px;
-                        color: white; font-weight: 800; padding: 15px;
-                        font-size: 16px;
-                    }
-                    QPushButton:hover {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #45a049, stop:1 #4CAF50);
-                    }
-                """)
+                self._set_style_state(self.start_all_streams_btn, "state", "idle")
                 
                 QMessageBox.information(self, "Başarılı", "Tüm kameralar durduruldu!")
                 
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Kamera durdurma hatası: {str(e)}")
 
+    def report_missing_credentials(self, missing):
+        """Eksik Agora kimlik bilgisi: yayın başlatılmaz, arayüz açık kalır"""
+        message = f"{' ve '.join(missing)} bulunamadı; yayın başlatılamadı."
+        logging.error(message)
+        if self.autostart:
+            # Açılış profili kimlik bilgisi olmadan da tamamlanır
+            self._flash_title(message)
+            self.finish_startup()
+        else:
+            QMessageBox.warning(self, "Eksik Yapılandırma", f"{message}\n📝 Lütfen config.env dosyasını kontrol edin.")
+
     def start_recording_all_cameras(self):
         """Tüm kameraları kaydetmeye başlatır"""
         # Buton metnini kontrol et
@@ -1693,41 +3493,39 @@ class IKADashboard(QMainWindow):
                 recordings_dir = os.path.join(os.path.dirname(__file__), 'recordings')
                 os.makedirs(recordings_dir, exist_ok=True)
                 
-                # Her kamera için kaydetme başlat
+                # Her kamera için kaydetme başlat - dosya adları kamera topolojisinden
                 camera_recordings = [
                     {
-                        'camera': self.front_camera,
-                        'filename': 'on-cam.webm'
-                    },
-                    {
-                        'camera': self.laser_camera,
-                        'filename': 'lazer-cam.webm'
-                    },
-                    {
-                        'camera': self.back_camera,
-                        'filename': 'arka-cam.webm'
+                        'camera': self.panels_by_key[camera.key],
+                        'filename': camera.file
                     }
+                    for camera in self.cameras
                 ]
                 
+                # Önceki oturumun manifesti henüz yazılmadıysa şimdiki haliyle yaz
+                if getattr(self, 'recording_session', None) is not None:
+                    self.recording_session.write_manifest()
+                
+                # Ortak oturum saati: tüm sayfalar kaydı aynı anda başlatır, parçalar zaman damgalı gelir
+                self.recording_session = RecordingSession(
+                    {r['camera'].camera_key: r['filename'] for r in camera_recordings},
+                    recordings_dir="recordings",
+                )
+                if hasattr(self, 'file_server'):
+                    self.file_server.attach_session(self.recording_session)
+                
                 for recording in camera_recordings:
                     # Sadece dosya adını gönder, tam yolu değil
-                    recording['camera'].start_recording(recording['filename'])
+                    recording['camera'].start_recording(
+                        recording['filename'],
+                        session_id=self.recording_session.session_id,
+                        start_at_ms=self.recording_session.start_epoch_ms,
+                    )
+                logging.info(f"Kayıt oturumu başladı: {self.recording_session.session_id}")
                 
                 # Buton metnini güncelle
                 self.start_recording_btn.setText("⏹️ Kaydetmeyi Durdur")
-                self.start_recording_btn.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #f44336, stop:1 #d32f2f);
-                        border: 1px solid #f44336; border-radius: 8px;
-                        color: white; font-weight: 800; padding: 15px;
-                        font-size: 16px;
-                    }
-                    QPushButton:hover {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #d32f2f, stop:1 #f44336);
-                    }
-                """)
+                self._set_style_state(self.start_recording_btn, "state", "active")
                 
                 QMessageBox.information(self, "Başarılı", "Tüm kameralar kaydedilmeye başlandı!")
                 
@@ -1736,25 +3534,15 @@ class IKADashboard(QMainWindow):
         else:
             # Kaydetmeyi durdur
             try:
-                self.front_camera.stop_recording()
-                self.laser_camera.stop_recording()
-                self.back_camera.stop_recording()
+                # Son parçalar yazılıp dosyalar kapanınca manifest yazılır
+                if getattr(self, 'recording_session', None) is not None:
+                    self.recording_session.stop()
+                for panel in self.camera_panels():
+                    panel.stop_recording()
                 
                 # Buton metnini güncelle
                 self.start_recording_btn.setText("📹 Kaydetmeyi Başlat")
-                self.start_recording_btn.setStyleSheet("""
-                    QPushButton {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #2196F3, stop:1 #1976D2);
-                        border: 1px solid #2196F3; border-radius: 8px;
-                        color: white; font-weight: 800; padding: 15px;
-                        font-size: 16px;
-                    }
-                    QPushButton:hover {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #1976D2, stop:1 #2196F3);
-                    }
-                """)
+                self._set_style_state(self.start_recording_btn, "state", "idle")
                 
                 QMessageBox.information(self, "Başarılı", "Tüm kayıtlar durduruldu!")
                 
@@ -1782,11 +3570,15 @@ class IKADashboard(QMainWindow):
             self.laser_direction_group.show()
             self.laser_btn.setText("🔄 NORMAL MODA DÖN")
             self.send_to_firebase('laser_mode', {'active': True})
+            if self.laser_camera is not None:
+                self.set_focus_camera(self.laser_camera)
         else:
             self.laser_direction_group.hide()
             self.direction_group.show()
             self.laser_btn.setText("LAZER ATIŞ MODU")
             self.send_to_firebase('laser_mode', {'active': False})
+            self.set_focus_camera(self.main_camera)
+        self.update_camera_visibility()
 
     def direction_pressed(self, direction):
         if direction == 'up':
@@ -1878,6 +3670,21 @@ class IKADashboard(QMainWindow):
         self.apply_theme(self.current_theme)
 
     def closeEvent(self, event):
+        self.cpu_timer.stop()
+        self.ui_timer.stop()
+        if self.stall_watchdog is not None:
+            self.heartbeat_timer.stop()
+            self.stall_watchdog.stop()
+            self.stall_watchdog.log_summary()
+        self.log_ui_update_stats()
+        self.visibility_cpu_stats.log_summary("Kamera görünürlüğüne göre CPU kullanımı")
+        self.bandwidth_stats.log_summary("Kamera yüküne göre toplam alım", unit="kbps")
+        if self.motion_detector is not None:
+            self.log_motion_latency()
+            self.motion_detector.shutdown()
+        # Kuyruktaki komutlar gönderilir, ardından gecikme özeti yazılır
+        self.command_sender.stop()
+        self.export_input_latency()
         self.sensor_thread.stop()
         if hasattr(self, 'firebase_thread') and self.firebase_thread is not None:
             self.firebase_thread.stop()
@@ -1885,29 +3692,22 @@ class IKADashboard(QMainWindow):
         if hasattr(self, 'firebase_thread') and self.firebase_thread is not None:
             self.firebase_thread.wait()
         
-        # Dosya sunucusunu durdur
+        # Dosya sunucusunu durdur (açık kayıt dosyaları kapatılır); açılış sürüyorsa beklenir
+        if getattr(self, '_file_server_thread', None) is not None:
+            self._file_server_thread.join(timeout=2)
+        session = getattr(self, 'recording_session', None)
+        if session is not None:
+            session.stop()
         if hasattr(self, 'file_server'):
             self.file_server.stop()
+        if session is not None:
+            # Son parçalar gelmediyse manifest eksik haliyle yazılır
+            session.write_manifest()
+        if self.flight_recorder is not None:
+            self.flight_recorder.close()
         
         event.accept()
 
-    def cleanup_firebase_data(self):
-        """Firebase'deki eski dalları temizle"""
-        if not self.firebase_initialized:
-            return False
-            
-        try:
-           
-            ref = db.reference('throttle')
-            ref.delete()
-            
-            ref = db.reference('command')
-            ref.delete()
-            
-            return True
-        except Exception as e:
-            return False
-
     def keyPressEvent(self, event: QKeyEvent):
         """Tuş basma olayını yakala"""
         key = event.key()
@@ -1916,6 +3716,7 @@ class IKADashboard(QMainWindow):
         if event.isAutoRepeat():
             event.accept()
             return
+        self.mark_input('key')
         
         # WASD ile yürütme kontrolü
         if key == Qt.Key.Key_W:
@@ -2014,6 +3815,9 @@ class IKADashboard(QMainWindow):
             self.emergency_btn.click()
             self._highlight_emergency_button()
         
+        elif key == Qt.Key.Key_F:
+            self.cycle_focus_camera()
+        
 
         
 
@@ -2028,6 +3832,7 @@ class IKADashboard(QMainWindow):
         if event.isAutoRepeat():
             event.accept()
             return
+        self.mark_input('key')
         
         # WASD ile yürütme kontrolü
         if key == Qt.Key.Key_W:
@@ -2122,9 +3927,270 @@ class IKADashboard(QMainWindow):
         event.accept()
 
 
+# Arayüzsüz kayıt düğümü (--headless)
+class HeadlessRecorder(QObject):
+    """Operatör arayüzü olmadan topolojideki kanallara katılır ve kaydeder. Kamera sayfaları hiç
+    gösterilmeyen AgoraCameraPanel'lerde çalışır (gizli sayfa Chromium'da boyanmaz);
+    sensör/Firebase thread'leri, arayüz zamanlayıcıları, kare musluğu ve hareket
+    algılama kurulmaz. Durum dosya sunucusunun GET /status adresinden okunur."""
+
+    def __init__(self, cameras=None, port=DEFAULT_HEADLESS_PORT):
+        super().__init__()
+        self.started_at = time.time()
+        self.cameras = cameras if cameras is not None else load_topology()
+        self.token_provider = create_token_provider(self.cameras)
+        self.panels = {camera.key: AgoraCameraPanel(camera.name, camera.key) for camera in self.cameras}
+        self.channels = {camera.key: camera.channel for camera in self.cameras}
+        self.filenames = {camera.key: camera.file for camera in self.cameras}
+        self.camera_state = {key: "sayfa yükleniyor" for key in self.panels}
+        self.outages = {key: 0 for key in self.panels}
+        # İlk karesi gelmiş ve o zamandan beri kopmamış kameralar
+        self.receiving = set()
+        self.session = None
+        self.session_count = 0
+        self.finished_sessions = []
+        self.cpu_sampler = CpuSampler()
+        self.load = {'cpu_percent': 0.0, 'memory_mb': 0.0}
+        self.file_server = FileServer(port=port, recordings_dir="recordings", token_provider=self.token_provider,
+                                      status_provider=self.status, **token_endpoint_options(self.cameras))
+
+        # Tüm kameralar görüntü verince (ya da zaman aşımında gelenlerle) kayıt başlar
+        self.ready_timer = QTimer(self)
+        self.ready_timer.setSingleShot(True)
+        self.ready_timer.timeout.connect(self.start_session)
+        # Geç gelen ya da yeniden bağlanan kamera için oturum yenilenir; art arda olaylar birleştirilir
+        self.rotate_timer = QTimer(self)
+        self.rotate_timer.setSingleShot(True)
+        self.rotate_timer.timeout.connect(self.start_session)
+        self.load_timer = QTimer(self)
+        self.load_timer.timeout.connect(self._sample_load)
+        self.token_watch_timer = QTimer(self)
+        self.token_watch_timer.timeout.connect(self._check_token_source)
+
+    def start(self):
+        missing = missing_credentials({channel: self.token_provider.get_token(channel, 0) or AGORA_TOKEN
+                                       for channel in self.channels.values()})
+        if missing:
+            logging.error(f"Kayıt düğümü başlatılamadı: {' ve '.join(missing)} bulunamadı (config.env)")
+            return False
+        if not self.file_server.start():
+            logging.error("Dosya sunucusu başlatılamadı")
+            return False
+        load_webengine()
+        for panel in self.panels.values():
+            panel.file_server_port = self.file_server.port
+            panel.phase_reported.connect(self.on_camera_phase)
+            panel.attach_webview()
+            # Kayıt düğümünde ses çalınmaz; kayda giren akış etkilenmez
+            panel.page.setAudioMuted(True)
+            panel.webview.loadFinished.connect(lambda ok, p=panel: self._on_page_loaded(p, ok))
+        self.load_timer.start(5000)
+        self.token_watch_timer.start(5000)
+        logging.info(f"Kayıt düğümü başladı, durum: http://localhost:{self.file_server.port}/status")
+        return True
+
+    def _on_page_loaded(self, panel, ok):
+        key = panel.camera_key
+        if not ok:
+            self.camera_state[key] = "sayfa yüklenemedi"
+            logging.error(f"{panel.camera_name}: sayfa yüklenemedi")
+            return
+        channel = self.channels[key]
+        panel.start_stream(AGORA_APP_ID, self.token_provider.get_token(channel, 0) or AGORA_TOKEN, channel)
+        self.camera_state[key] = "bağlanıyor"
+        if self.session is None and not self.ready_timer.isActive():
+            self.ready_timer.start(int(os.getenv('IKA_CAMERA_READY_TIMEOUT_MS', '20000')))
+
+    def on_camera_phase(self, camera, phase, elapsed_ms, detail):
+        name = self.panels[camera].camera_name
+        if phase in ('token_will_expire', 'token_expired'):
+            self.renew_camera_token(camera)
+        elif phase == 'first_frame':
+            self.camera_state[camera] = "görüntü alınıyor"
+            self.receiving.add(camera)
+            if self.session is None and self.receiving == set(self.panels):
+                self.start_session()
+            elif self.session is not None or not self.ready_timer.isActive():
+                # Geç gelen kamera ya da yeniden abone olunan yeni video track'i
+                # mevcut kaydedicilere bağlı değil: oturum yenilenir
+                self.rotate_timer.start(2000)
+        elif phase == 'outage':
+            self.camera_state[camera] = "bağlantı koptu"
+            self.outages[camera] += 1
+            self.receiving.discard(camera)
+            logging.warning(f"{name}: bağlantı koptu ({detail})")
+        elif phase == 'reconnecting':
+            self.camera_state[camera] = f"yeniden bağlanıyor ({detail})"
+        elif phase == 'recovered':
+            self.camera_state[camera] = "bağlandı"
+            logging.info(f"{name}: yeniden bağlandı, kesinti {elapsed_ms / 1000:.2f} sn")
+        elif phase == 'failed':
+            self.camera_state[camera] = f"hata: {detail}"
+            self.receiving.discard(camera)
+            logging.error(f"{name}: bağlanamadı ({detail})")
+        elif phase != 'token_renewed' and camera not in self.receiving:
+            self.camera_state[camera] = phase
+
+    def start_session(self):
+        """Görüntü alan kameralarla yeni kayıt oturumu; önceki oturum kapatılır"""
+        self.ready_timer.stop()
+        self.rotate_timer.stop()
+        cameras = [key for key in self.panels if key in self.receiving]
+        if not cameras:
+            logging.warning("Kaydedilecek görüntü yok; ilk kare bekleniyor")
+            return
+        self.stop_session()
+        # Oturum klasörü saniye çözünürlüklüdür; aynı saniyede ikinci oturum açılmaz
+        self.session = RecordingSession({key: self.filenames[key] for key in cameras}, recordings_dir="recordings")
+        self.session_count += 1
+        self.file_server.attach_session(self.session)
+        for key in cameras:
+            self.panels[key].start_recording(self.filenames[key], session_id=self.session.session_id,
+                                             start_at_ms=self.session.start_epoch_ms)
+        missing = [key for key in self.panels if key not in cameras]
+        logging.info(f"Kayıt oturumu başladı: {self.session.session_id} ({', '.join(cameras)})"
+                     + (f", görüntü yok: {', '.join(missing)}" if missing else ""))
+
+    def stop_session(self):
+        session = self.session
+        if session is None:
+            return
+        session.stop()
+        for key in session.tracks:
+            self.panels[key].stop_recording()
+        # Son parçaları gelmeyen (track'i kopmuş) kayıtlar beklenmeden manifest yazılır
+        QTimer.singleShot(5000, session.write_manifest)
+        self.finished_sessions.append(session)
+        self.session = None
+
+    def renew_camera_token(self, camera):
+        panel = self.panels[camera]
+        token = self.token_provider.get_token(self.channels[camera], 0)
+        if token:
+            panel.renew_token(token)
+        else:
+            logging.error(f"{panel.camera_name}: yeni token alınamadı ({self.channels[camera]})")
+
+    def _check_token_source(self):
+        if self.token_provider.poll_changed():
+            for key, panel in self.panels.items():
+                if panel.is_streaming:
+                    self.renew_camera_token(key)
+
+    def _sample_load(self):
+        self.load = {'cpu_percent': round(self.cpu_sampler.sample(), 1),
+                     'memory_mb': round(self.cpu_sampler.memory_mb(), 1)}
+
+    def status(self):
+        """GET /status yanıtı; HTTP thread'inde çağrılır, durumu yalnızca okur"""
+        session = self.session
+        recording = None
+        if session is not None:
+            recording = {
+                'session': session.session_id,
+                'elapsed_s': round(session.elapsed(), 1),
+                'files': {camera: {'file': track['file'], 'bytes': track['bytes'], 'complete': track['complete']}
+                          for camera, track in session.manifest()['cameras'].items()},
+            }
+        return {
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'cameras': {key: {'channel': self.channels[key], 'state': self.camera_state[key],
+                              'receiving': key in self.receiving, 'outages': self.outages[key]}
+                        for key in self.panels},
+            'recording': recording,
+            'sessions': self.session_count,
+            'load': self.load,
+        }
+
+    def shutdown(self, quit_delay_ms=2000):
+        """Kayıtları durdurur; son parçaların yüklenmesi için olay döngüsü bir süre daha çalışır"""
+        logging.info("Kayıt düğümü kapatılıyor")
+        self.stop_session()
+        for panel in self.panels.values():
+            panel.stop_stream()
+        QTimer.singleShot(quit_delay_ms, QApplication.instance().quit)
+
+    def close(self):
+        """Olay döngüsü bittikten sonra: açık dosyalar kapatılır, manifest yazılır"""
+        self.stop_session()
+        self.file_server.stop()
+        # Zaten yazılmış manifestler atlanır
+        for session in self.finished_sessions:
+            session.write_manifest()
+        for panel in self.panels.values():
+            panel.close()
+
+
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    timeline = StartupTimeline(STARTUP_T0)
+    timeline.record('imports', STARTUP_T0)
+    parser = argparse.ArgumentParser(description="İKA Kontrol Arayüzü")
+    parser.add_argument('--replay', metavar='LOG',
+                        help="Firebase yerine telemetri logunu oynat (.ikt dosyası ya da klasör)")
+    parser.add_argument('--speed', type=float, default=1.0, help="Oynatma hızı çarpanı (0.25 - 50)")
+    parser.add_argument('--profile-startup', nargs='?', const=DEFAULT_PROFILE_PATH, metavar='JSON',
+                        help=f"Import ve kurulum sürelerini dök (varsayılan {DEFAULT_PROFILE_PATH})")
+    parser.add_argument('--autostart', action='store_true',
+                        help="Açılış bitince yayınları başlat (ilk kareye kadar geçen süre ölçülür)")
+    parser.add_argument('--quit-after-startup', action='store_true',
+                        help="Açılış (ve --autostart ile ilk kareler) bitince çık; benchmark için")
+    parser.add_argument('--headless', action='store_true',
+                        help="Arayüzsüz kayıt düğümü: kanallara katıl, kaydet, durumu GET /status ile ver")
+    parser.add_argument('--port', type=int, default=DEFAULT_HEADLESS_PORT,
+                        help=f"--headless: dosya/durum sunucusu portu (varsayılan {DEFAULT_HEADLESS_PORT})")
+    args, qt_args = parser.parse_known_args()
+
+    with timeline.phase('config'):
+        log_pipeline = setup_logging()
+        missing = load_config()
+        try:
+            cameras = load_topology()
+        except ValueError as e:
+            print(f"❌ HATA: Kamera yapılandırması geçersiz: {e}")
+            log_pipeline.stop()
+            sys.exit(1)
+    # Kimlik bilgileri yayın başlarken kontrol edilir; oynatma ve açılış profili onlarsız da çalışır
+    if missing:
+        logging.warning(f"{' ve '.join(missing)} config.env'de bulunamadı; yayın başlatılırken yeniden kontrol edilecek")
+
+    if args.headless:
+        # Ekransız makinede de çalışır; sayfalar zaten hiç gösterilmez
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+        app = QApplication(sys.argv[:1] + qt_args)
+        node = HeadlessRecorder(cameras, port=args.port)
+        if not node.start():
+            log_pipeline.stop()
+            sys.exit(1)
+        # Qt olay döngüsü sürerken Python sinyal işleyicilerinin çalışabilmesi için
+        signal_timer = QTimer()
+        signal_timer.timeout.connect(lambda: None)
+        signal_timer.start(500)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: node.shutdown())
+        exit_code = app.exec()
+        node.close()
+        log_pipeline.stop()
+        sys.exit(exit_code)
+
+    replay = None
+    if args.replay:
+        replay = TelemetryReplay.from_path(args.replay, args.speed)
+        if not len(replay):
+            print(f"❌ Oynatılacak telemetri kaydı bulunamadı: {args.replay}")
+            log_pipeline.stop()
+            sys.exit(1)
+
+    timeline.begin('qt_app')
+    # QtWebEngine sonradan (ilk kamera sayfasında) import edildiği için gerekli
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
-    win = IKADashboard()
-    win.show()
-    sys.exit(app.exec())
+    timeline.end('qt_app')
+    win = IKADashboard(replay=replay, timeline=timeline, autostart=args.autostart,
+                       profile_path=args.profile_startup, quit_after_startup=args.quit_after_startup,
+                       cameras=cameras)
+    exit_code = app.exec()
+    # Kuyrukta kalan log kayıtları yazılır
+    log_pipeline.stop()
+    sys.exit(exit_code)
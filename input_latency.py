@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Giriş Gecikmesi Ölçümü
+Bir tuş/fare olayından veritabanının yazmayı onaylamasına kadar geçen süreyi
+dört zaman damgasıyla ölçer: giriş (olay yakalandı), kuyruk (komut gönderim
+kuyruğuna bırakıldı), gönderim (ağ çağrısı başladı) ve onay (set() döndü).
+Aşama süreleri komut başına HDR tarzı histogramlarda tutulur; oturum sonunda
+JSON olarak dışa aktarılır. Qt'den bağımsızdır.
+"""
+
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+DEFAULT_LATENCY_EXPORT = 'ika_input_latency.json'
+# Kuyrukta bekleyen diğer komutların önüne geçen yollar (acil durdurma)
+PRIORITY_PATHS = ('emergency',)
+# Her 2'nin kuvveti aralığı 2^SUB_BUCKET_BITS eşit kovaya bölünür (göreli hata ≤ %3)
+SUB_BUCKET_BITS = 5
+PERCENTILES = (50, 95, 99)
+# Aşama: (başlangıç damgası, bitiş damgası)
+STAGES = {
+    'handle': ('input', 'enqueue'),     # olay işleyicisi (GUI thread'i)
+    'queue': ('enqueue', 'send'),       # gönderim kuyruğunda bekleme
+    'network': ('send', 'ack'),         # ağ gidiş-dönüşü
+    'total': ('input', 'ack'),          # uçtan uca
+}
+
+
+class LatencyHistogram:
+    """HDR Histogram benzeri log-doğrusal kovalar; değerler µs cinsinden tamsayıya yuvarlanır.
+    Yüzdelikler kovanın üst sınırıyla (en fazla %3 yukarı) raporlanır, en büyük değer kesindir."""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    @staticmethod
+    def _bucket(value):
+        # Küçük değerler kesin; büyüklerde en anlamlı SUB_BUCKET_BITS+1 bit tutulur
+        shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+        return shift, value >> shift
+
+    @staticmethod
+    def _upper(bucket):
+        shift, mantissa = bucket
+        return ((mantissa + 1) << shift) - 1
+
+    def add(self, seconds):
+        value = max(0, int(seconds * 1e6))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total_us += value
+        self.max_us = max(self.max_us, value)
+
+    def percentile(self, p):
+        """p. yüzdelik (µs); boşsa 0"""
+        if not self.count:
+            return 0
+        rank = max(1, int(-(-p * self.count // 100)))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._upper(bucket), self.max_us)
+        return self.max_us
+
+    def summary(self):
+        """Yüzdelikler ve en büyük değer (ms)"""
+        result = {'count': self.count,
+                  'mean_ms': round(self.total_us / self.count / 1000.0, 3) if self.count else 0.0}
+        for p in PERCENTILES:
+            result[f'p{p}_ms'] = round(self.percentile(p) / 1000.0, 3)
+        result['max_ms'] = round(self.max_us / 1000.0, 3)
+        return result
+
+
+def command_name(path, data):
+    """Histogram anahtarı: 'movement:forward', 'gear:2', 'control:manual' gibi"""
+    for field in ('command', 'gear', 'mode', 'active', 'action'):
+        if field in data:
+            return f"{path}:{data[field]}"
+    return path
+
+
+class InputLatencyTracker:
+    """Komut -> aşama -> LatencyHistogram. Giriş damgası GUI thread'inde, tamamlanma
+    gönderim thread'inde yazılır."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.failures = {}
+        self.superseded = {}
+        self.sources = {}
+        self.started_at = time.time()
+        self._input = None
+        self._lock = threading.Lock()
+
+    # --- GUI thread ---
+    def mark_input(self, source):
+        """Olay işleyicisinin başı; aynı olay üst widget'lara yayılırken ilk damga korunur.
+        Yeni damga konduysa True (çağıran bir sonraki olay döngüsü turunda clear_input çağırmalı)."""
+        if self._input is not None:
+            return False
+        self._input = (time.perf_counter(), source)
+        return True
+
+    def clear_input(self):
+        self._input = None
+
+    def stamp(self):
+        """Komut kuyruğa bırakılırken çağrılır; olaydan gelmeyen komutlar 'program' sayılır"""
+        now = time.perf_counter()
+        t_input, source = self._input or (now, 'program')
+        return {'source': source, 'input': t_input, 'enqueue': now}
+
+    # --- Gönderim thread'i ---
+    def complete(self, command, stamp, ok=True):
+        """stamp'te 'send' ve 'ack' damgaları da bulunmalı; başarısız gönderimler ayrı sayılır"""
+        with self._lock:
+            self.sources[stamp['source']] = self.sources.get(stamp['source'], 0) + 1
+            if not ok:
+                self.failures[command] = self.failures.get(command, 0) + 1
+                return
+            stages = self.histograms.get(command)
+            if stages is None:
+                stages = self.histograms[command] = {name: LatencyHistogram() for name in STAGES}
+            for name, (start, end) in STAGES.items():
+                stages[name].add(stamp[end] - stamp[start])
+
+    def supersede(self, command):
+        """Kuyrukta aynı yola gelen daha yeni bir komut bunu gönderilmeden geçersiz kıldı"""
+        with self._lock:
+            self.superseded[command] = self.superseded.get(command, 0) + 1
+
+    # --- Rapor ---
+    def snapshot(self):
+        """{komut: {aşama: özet}} — toplam süreye göre en yavaş komut önce"""
+        with self._lock:
+            rows = {command: {name: h.summary() for name, h in stages.items()}
+                    for command, stages in self.histograms.items()}
+        return dict(sorted(rows.items(), key=lambda item: item[1]['total']['p95_ms'], reverse=True))
+
+    def sample_count(self):
+        with self._lock:
+            return sum(stages['total'].count for stages in self.histograms.values())
+
+    def report_lines(self):
+        lines = [f"Giriş gecikmesi (girişten onaya, ms): {'p50':>8} {'p95':>8} {'p99':>8} {'maks':>8}  n"]
+        for command, stages in self.snapshot().items():
+            s = stages['total']
+            lines.append(f"  {command:<32} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} "
+                         f"{s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}  {s['count']}")
+        return lines
+
+    def export(self, path=DEFAULT_LATENCY_EXPORT):
+        """Oturum özetini JSON olarak yazar; yazılan yolu (hata olursa None) döndürür"""
+        with self._lock:
+            failures = dict(self.failures)
+            superseded = dict(self.superseded)
+            sources = dict(self.sources)
+        record = {
+            'session_start': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'stages': {name: f"{start} -> {end}" for name, (start, end) in STAGES.items()},
+            'sources': sources,
+            'failures': failures,
+            'superseded': superseded,
+            'commands': self.snapshot(),
+        }
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logging.error(f"Giriş gecikmesi dışa aktarılamadı: {e}")
+            return None
+        return path
+
+
+class CommandSender:
+    """Komutları tek bir arka plan thread'inde gönderir; GUI thread'i ağ çağrısını
+    beklemez. send(path, data) döndüğünde yazma onaylanmış sayılır.
+    Her yol son yazılan değeri tutar: kuyrukta bekleyen komutun yerine aynı yola gelen
+    yenisi geçer (sırası korunur), PRIORITY_PATHS'teki komutlar kuyruğun önüne alınır.
+    Böylece acil durdurma eski hareket komutlarının arkasında beklemez."""
+
+    def __init__(self, send, tracker=None, priority_paths=PRIORITY_PATHS):
+        self.send = send
+        self.tracker = tracker
+        self.priority_paths = frozenset(priority_paths)
+        # yol -> (veri, damga)
+        self.pending = OrderedDict()
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='CommandSender', daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data, stamp=None):
+        with self._cond:
+            previous = self.pending.get(path)
+            self.pending[path] = (data, stamp)
+            if path in self.priority_paths:
+                self.pending.move_to_end(path, last=False)
+            self._cond.notify()
+        if previous is not None and self.tracker is not None:
+            self.tracker.supersede(command_name(path, previous[0]))
+
+    def stop(self, timeout=2.0):
+        """Kuyrukta kalan komutlar gönderildikten sonra durur"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.pending and not self._stopping:
+                    self._cond.wait()
+                if not self.pending:
+                    return
+                path, (data, stamp) = self.pending.popitem(last=False)
+            send_at = time.perf_counter()
+            try:
+                self.send(path, data)
+                ok = True
+            except Exception as e:
+                logging.warning(f"Komut gönderilemedi ({command_name(path, data)}): {e}")
+                ok = False
+            if stamp is not None and self.tracker is not None:
+                stamp['send'] = send_at
+                stamp['ack'] = time.perf_counter()
+                self.tracker.complete(command_name(path, data), stamp, ok)
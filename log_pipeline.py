@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Log Hattı
+Uygulama thread'leri yalnızca kayıtları bir kuyruğa bırakır (QueueHandler);
+konsola ve dosyaya yazma ayrı bir dinleyici thread'inde (QueueListener) yapılır.
+Log dosyası hem boyuta hem zamana göre döndürülür. Kamera sayfalarının JS
+konsol satırları sayfa başına hız sınırlı ve örneklenmiş olarak loglanır.
+"""
+
+import os
+import time
+import queue
+import logging
+import logging.handlers
+
+DEFAULT_LOG_FILE = 'ika_app.log'
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_ROTATE_WHEN = 'midnight'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# JS konsolu: sayfa başına saniyede en fazla bu kadar satır (kısa patlamalara izin verilir),
+# sınır aşılınca her N satırdan biri örneklenir
+DEFAULT_JS_RATE = 5.0
+DEFAULT_JS_BURST = 20
+DEFAULT_JS_SAMPLE_EVERY = 50
+JS_REPORT_INTERVAL = 30.0
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Zamanı gelince (ör. gece yarısı) ya da dosya max_bytes'ı aşınca döndürür"""
+
+    def __init__(self, filename, max_bytes=DEFAULT_MAX_BYTES, when=DEFAULT_ROTATE_WHEN,
+                 backup_count=DEFAULT_BACKUP_COUNT, encoding='utf-8'):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+
+    def rotation_filename(self, default_name):
+        # Aynı zaman diliminde boyuttan dolayı birden çok dönüş olabilir: sıra numarası eklenir
+        name, n = default_name, 1
+        while os.path.exists(name):
+            name = f"{default_name}.{n}"
+            n += 1
+        return name
+
+    def getFilesToDelete(self):
+        # Sıra numaralı dosyalar da yedek sayısına dahil edilir
+        directory, base = os.path.split(self.baseFilename)
+        prefix = base + '.'
+        files = sorted(
+            (os.path.join(directory, f) for f in os.listdir(directory or '.') if f.startswith(prefix)),
+            key=os.path.getmtime,
+        )
+        return files[:max(0, len(files) - self.backupCount)]
+
+
+class LogPipeline:
+    """Kök logger'a QueueHandler bağlar; gerçek handler'lar dinleyici thread'inde çalışır"""
+
+    def __init__(self, log_file=DEFAULT_LOG_FILE, max_bytes=DEFAULT_MAX_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, when=DEFAULT_ROTATE_WHEN, level=logging.INFO):
+        formatter = logging.Formatter(LOG_FORMAT)
+        self.handlers = [logging.StreamHandler()]
+        if log_file:
+            self.handlers.append(SizedTimedRotatingFileHandler(log_file, max_bytes, when, backup_count))
+        for handler in self.handlers:
+            handler.setFormatter(formatter)
+        # Sınırsız kuyruk: log çağıran thread hiçbir zaman beklemez
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.level = level
+
+    def start(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(self.level)
+        self.listener.start()
+        return self
+
+    def stop(self):
+        """Kuyrukta kalanları yazar ve dosyayı kapatır"""
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+class JsConsoleLimiter:
+    """Sayfa başına jeton kovası; kova boşken her sample_every satırdan biri geçer.
+    Bastırılan satır sayısı periyodik olarak tek satırla bildirilir."""
+
+    def __init__(self, name, rate=DEFAULT_JS_RATE, burst=DEFAULT_JS_BURST,
+                 sample_every=DEFAULT_JS_SAMPLE_EVERY, logger=None):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = max(1, sample_every)
+        self.logger = logger or logging.getLogger(f'ika.js.{name}')
+        self.tokens = float(burst)
+        self._last = time.monotonic()
+        self._over = 0
+        self.suppressed = 0
+        self.sampled = 0
+        self.passed = 0
+        self._last_report = self._last
+
+    def allow(self, now=None):
+        """Satır loglanmalı mı? (True: kovadan ya da örnekleme ile geçti)"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.passed += 1
+            return True
+        self._over += 1
+        if self._over % self.sample_every == 0:
+            self.sampled += 1
+            return True
+        self.suppressed += 1
+        return False
+
+    def log(self, level, message, line=0):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if self.allow(now):
+            self.logger.log(level, f"JS [{self.name} L{line}] {message}")
+        if self.suppressed and now - self._last_report >= JS_REPORT_INTERVAL:
+            self.logger.info(f"JS [{self.name}] son {now - self._last_report:.0f} sn'de "
+                             f"{self.suppressed} satır bastırıldı ({self.sampled} örneklendi)")
+            self.suppressed = 0
+            self.sampled = 0
+            self._last_report = now
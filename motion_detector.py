@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Hareket Algılama
+Kare musluğundan gelen küçültülmüş kareleri süreç havuzunda NumPy ile
+arka plan modeline göre karşılaştırır ve hareketli bölgeleri döndürür
+"""
+
+import threading
+import time
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# RGB -> gri ton ağırlıkları (ITU-R BT.601)
+GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def downscale_gray(frame, factor=2):
+    """RGBA kareyi blok ortalamasıyla küçültüp gri tona çevirir (yeni dizi döner)"""
+    h = frame.shape[0] // factor
+    w = frame.shape[1] // factor
+    rgb = frame[:h * factor, :w * factor, :3].reshape(h, factor, w, factor, 3)
+    return rgb.mean(axis=(1, 3), dtype=np.float32) @ GRAY_WEIGHTS
+
+
+def find_regions(active):
+    """Aktif hücre ızgarasında komşu hücreleri gruplayıp (satır0, sütun0, satır1, sütun1) kutuları döndürür"""
+    rows, cols = active.shape
+    seen = np.zeros_like(active, dtype=bool)
+    regions = []
+    for r, c in zip(*np.nonzero(active)):
+        if seen[r, c]:
+            continue
+        stack = [(r, c)]
+        seen[r, c] = True
+        r0, c0, r1, c1 = r, c, r, c
+        while stack:
+            y, x = stack.pop()
+            r0, c0, r1, c1 = min(r0, y), min(c0, x), max(r1, y), max(c1, x)
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if 0 <= ny < rows and 0 <= nx < cols and active[ny, nx] and not seen[ny, nx]:
+                    seen[ny, nx] = True
+                    stack.append((ny, nx))
+        regions.append((int(r0), int(c0), int(r1) + 1, int(c1) + 1))
+    return regions
+
+
+def analyse_frame(gray, background, alpha=0.05, threshold=25.0, cell=10, min_fraction=0.2):
+    """Süreç havuzunda çalışır: fark maskesi, güncel arka plan ve normalize kutular (x, y, w, h) döndürür"""
+    if background is None or background.shape != gray.shape:
+        return gray, [], 0.0
+
+    moving = np.abs(gray - background) > threshold
+
+    # Hareketli pikselleri arka plana daha yavaş kat ki nesne hemen "arka plan" olmasın
+    rate = np.where(moving, alpha * 0.1, alpha).astype(np.float32)
+    new_background = background + (gray - background) * rate
+
+    h, w = gray.shape
+    gh, gw = h // cell, w // cell
+    cells = moving[:gh * cell, :gw * cell].reshape(gh, cell, gw, cell).mean(axis=(1, 3))
+    active = cells > min_fraction
+
+    boxes = [
+        (c0 / gw, r0 / gh, (c1 - c0) / gw, (r1 - r0) / gh)
+        for r0, c0, r1, c1 in find_regions(active)
+    ]
+    return new_background, boxes, float(moving.mean())
+
+
+class MotionDetector:
+    """Kare musluğu abonesi; GUI thread'ini meşgul etmeden hareket analizi yapar.
+    Kamera başına aynı anda tek iş vardır, meşgulken gelen kareler atılır."""
+
+    def __init__(self, on_result, max_workers=1, downscale=2, threshold=25.0):
+        self.on_result = on_result
+        self.max_workers = max_workers
+        self.downscale = downscale
+        self.threshold = threshold
+        self.executor = None
+        self.closed = False
+        self.backgrounds = {}
+        self.busy = set()
+        self.processed = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=500)
+        self._lock = threading.Lock()
+
+    def on_frame(self, camera, frame, timestamp):
+        """FrameTap callback'i (sunucu thread'inde çalışır)"""
+        with self._lock:
+            if self.closed:
+                return
+            if camera in self.busy:
+                self.dropped += 1
+                return
+            self.busy.add(camera)
+            if self.executor is None:
+                # Qt/WebEngine thread'leri varken fork çocukta kilitlenebilir; işçiler temiz başlatılır
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+
+        # Küçültme halka tamponundan kopya alır, yuva hemen serbest kalır
+        gray = downscale_gray(frame, self.downscale)
+        started = time.perf_counter()
+        try:
+            future = self.executor.submit(
+                analyse_frame, gray, self.backgrounds.get(camera), threshold=self.threshold
+            )
+        except RuntimeError:
+            # Havuz kapatıldı
+            with self._lock:
+                self.busy.discard(camera)
+            return
+        future.add_done_callback(lambda f: self._finished(camera, f, started, timestamp))
+
+    def _finished(self, camera, future, started, timestamp):
+        try:
+            background, boxes, ratio = future.result()
+        except Exception as e:
+            logging.error(f"Hareket analizi hatası ({camera}): {e}")
+            with self._lock:
+                self.busy.discard(camera)
+            return
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.backgrounds[camera] = background
+            self.busy.discard(camera)
+            self.processed += 1
+            self.latencies.append(latency)
+        self.on_result(camera, boxes, latency)
+
+    def latency_summary(self):
+        """Kare başı işlem gecikmesi (ms): ortalama, p95, maksimum"""
+        with self._lock:
+            values = sorted(self.latencies)
+        if not values:
+            return None
+        return {
+            'mean_ms': sum(values) / len(values) * 1000,
+            'p95_ms': values[max(0, int(len(values) * 0.95) - 1)] * 1000,
+            'max_ms': values[-1] * 1000,
+            'processed': self.processed,
+            'dropped': self.dropped,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            self.closed = True
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
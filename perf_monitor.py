@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Performans Ölçüm Yardımcıları
+Uygulama ve WebEngine alt süreçlerinin CPU kullanımını örnekler; kare
+gecikmesi ve CPU eşiği sürekli aşıldığında aşırı yükü bildirir
+"""
+
+import os
+import time
+import logging
+
+# psutil opsiyonel: yoksa sadece bu sürecin CPU zamanı ölçülür
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class CpuSampler:
+    """Süreç + alt süreçlerin (QtWebEngineProcess) CPU yüzdesini örnekler"""
+
+    def __init__(self):
+        self._last_wall = time.perf_counter()
+        self._last_cpu = time.process_time()
+        self._known = {}
+        if PSUTIL_AVAILABLE:
+            self._process = psutil.Process(os.getpid())
+            self._process.cpu_percent(None)
+
+    def sample(self):
+        """Son örnekten bu yana ortalama CPU yüzdesini döndürür (tek çekirdek = %100)"""
+        if PSUTIL_AVAILABLE:
+            try:
+                total = self._process.cpu_percent(None)
+                alive = {}
+                for child in self._process.children(recursive=True):
+                    proc = self._known.get(child.pid)
+                    if proc is None:
+                        # İlk ölçüm her zaman 0 döner, bir sonraki örnekte sayılır
+                        proc = child
+                        proc.cpu_percent(None)
+                    else:
+                        total += proc.cpu_percent(None)
+                    alive[child.pid] = proc
+                self._known = alive
+                return total
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return 0.0
+
+        now_wall = time.perf_counter()
+        now_cpu = time.process_time()
+        elapsed = now_wall - self._last_wall
+        percent = (now_cpu - self._last_cpu) / elapsed * 100.0 if elapsed > 0 else 0.0
+        self._last_wall = now_wall
+        self._last_cpu = now_cpu
+        return percent
+
+    def memory_mb(self):
+        """Süreç + bilinen alt süreçlerin toplam RSS'i (MB); psutil yoksa bu sürecin tepe RSS'i"""
+        if PSUTIL_AVAILABLE:
+            total = 0
+            for proc in [self._process] + list(self._known.values()):
+                try:
+                    total += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            return total / (1024 * 1024)
+        try:
+            import resource
+            # Linux'ta KB cinsinden
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        except (ImportError, OSError):
+            return 0.0
+
+
+# Aşırı yük eşikleri: makinenin toplam CPU kapasitesine göre yüzde, kare zamanlayıcısının
+# periyodunun ötesindeki gecikme (p90) ve eşiğin art arda aşılması gereken örnek sayısı
+DEFAULT_CPU_THRESHOLD = 85.0
+DEFAULT_FRAME_LATE_MS = 40.0
+DEFAULT_SUSTAIN = 3
+
+
+class OverloadDetector:
+    """Kare zamanlayıcısının gecikmesi ya da CPU eşiği art arda `sustain` örnekte aşılırsa
+    aşırı yük bildirir (kısa sıçramalar sayılmaz)"""
+
+    def __init__(self, cpu_threshold=DEFAULT_CPU_THRESHOLD, frame_late_ms=DEFAULT_FRAME_LATE_MS,
+                 sustain=DEFAULT_SUSTAIN, cores=None):
+        self.cpu_threshold = cpu_threshold
+        self.frame_late = frame_late_ms / 1000.0
+        self.sustain = sustain
+        self.cores = cores or os.cpu_count() or 1
+        self.strikes = 0
+        self.last = {}
+        self._late = []
+        self._last_tick = None
+
+    def tick(self, period, now=None):
+        """Kare zamanlayıcısının her tetiklenişinde; period: beklenen aralık (sn)"""
+        now = time.perf_counter() if now is None else now
+        if self._last_tick is not None:
+            self._late.append(max(0.0, now - self._last_tick - period))
+        self._last_tick = now
+
+    def sample(self, cpu_percent):
+        """Periyodik CPU örneğiyle (tek çekirdek = %100) değerlendirir; aşırı yükse True"""
+        late = sorted(self._late)
+        self._late = []
+        frame_late = late[min(len(late) - 1, int(len(late) * 0.9))] if late else 0.0
+        cpu = cpu_percent / self.cores
+        self.last = {'cpu_percent': cpu, 'frame_late_ms': frame_late * 1000.0}
+        if cpu >= self.cpu_threshold or frame_late >= self.frame_late:
+            self.strikes += 1
+        else:
+            self.strikes = 0
+        return self.strikes >= self.sustain
+
+
+class LabeledStats:
+    """Ölçüm örneklerini bir duruma (örn. görünür panel sayısı) göre gruplar"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, label, value):
+        total, count = self.samples.get(label, (0.0, 0))
+        self.samples[label] = (total + value, count + 1)
+
+    def averages(self):
+        return {label: total / count for label, (total, count) in self.samples.items() if count}
+
+    def log_summary(self, title, unit="% CPU"):
+        averages = self.averages()
+        if not averages:
+            return
+        logging.info(f"{title}:")
+        for label in sorted(averages, key=str):
+            total, count = self.samples[label]
+            logging.info(f"  {label}: ortalama {averages[label]:.1f} {unit} ({count} örnek)")
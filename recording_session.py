@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Kayıt Oturumu Koordinatörü
+Üç kameranın kaydı ortak bir oturum saatine göre aynı anda başlatılır;
+her parça yakalama zamanıyla işaretlenir ve oturum sonunda dosyaları ve
+telemetriyi kare hizalı oynatmak için bir manifest yazılır
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+
+# Sayfalara başlangıç anı bildirilir; runJavaScript gecikmesini karşılayacak pay
+DEFAULT_START_DELAY = 0.5
+MANIFEST_NAME = 'session.json'
+
+
+def new_session_id(recordings_dir):
+    """Milisaniyeli zaman damgası; klasör oluşturularak ayrılır, aynı adla klasör varsa sonek eklenir"""
+    now = time.time()
+    base = time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+    session_id, suffix = base, 1
+    while True:
+        try:
+            os.makedirs(os.path.join(recordings_dir, session_id))
+            return session_id
+        except FileExistsError:
+            suffix += 1
+            session_id = f"{base}-{suffix}"
+
+
+class RecordingSession:
+    """Tek bir kayıt oturumu: kamera anahtarı -> dosya adı.
+    Zamanlar Unix epoch (ms) cinsinden tutulur; sayfalar aynı makinede çalıştığı için
+    Date.now() ile Python'un time.time()'ı aynı saati okur. Telemetri kayıtlarındaki
+    'timestamp' alanı da aynı saattir, bu yüzden oturum başlangıcına göre hizalanabilir."""
+
+    def __init__(self, files, recordings_dir="recordings", start_delay=DEFAULT_START_DELAY):
+        # Aynı saniyede başlayan oturumlar (ör. arayüzsüz düğümde yenileme) ayrı klasöre yazar
+        self.session_id = new_session_id(recordings_dir)
+        self.recordings_dir = recordings_dir
+        # Ortak başlangıç anı: duvar saati (sayfalar için) ve monoton saat (Python tarafı için)
+        self.start_epoch = time.time() + start_delay
+        self.start_monotonic = time.monotonic() + start_delay
+        self.stopped_at = None
+        self.manifest_written = False
+        self.tracks = {
+            camera: {
+                'file': filename,
+                'key': f"{self.session_id}/{filename}",
+                'recorder_start': None,
+                'chunks': [],
+                'bytes': 0,
+                'closed': False,
+            }
+            for camera, filename in files.items()
+        }
+        self._by_key = {track['key']: track for track in self.tracks.values()}
+        self._lock = threading.Lock()
+
+    @property
+    def start_epoch_ms(self):
+        return int(self.start_epoch * 1000)
+
+    def elapsed(self):
+        """Oturum başlangıcından bu yana geçen süre (sn, monoton saat)"""
+        return time.monotonic() - self.start_monotonic
+
+    def owns(self, key):
+        return key in self._by_key
+
+    def on_chunk(self, key, seq, offset, size, meta):
+        """RecordingWriter callback'i (yazıcı thread'inde): parçanın dosyadaki yerini ve zamanını kaydeder"""
+        track = self._by_key.get(key)
+        if track is None:
+            return
+        meta = meta or {}
+        with self._lock:
+            if meta.get('start') is not None and track['recorder_start'] is None:
+                track['recorder_start'] = meta['start']
+            track['chunks'].append({
+                'seq': seq,
+                'offset': offset,
+                'size': size,
+                't0': self._relative(meta.get('t0')),
+                't1': self._relative(meta.get('t1')),
+            })
+            track['bytes'] = offset + size
+
+    def on_close(self, key, stats):
+        """Dosya kapandığında çağrılır; tüm kameralar kapandıysa manifest yazılır"""
+        track = self._by_key.get(key)
+        if track is None:
+            return
+        with self._lock:
+            track['closed'] = True
+            done = self.stopped_at is not None and all(t['closed'] for t in self.tracks.values())
+        if done:
+            self.write_manifest()
+
+    def stop(self):
+        self.stopped_at = time.time()
+
+    def _relative(self, epoch_ms):
+        """Epoch ms -> oturum başlangıcına göre saniye"""
+        if epoch_ms is None:
+            return None
+        return round(epoch_ms / 1000.0 - self.start_epoch, 4)
+
+    def manifest(self):
+        with self._lock:
+            cameras = {}
+            for camera, track in self.tracks.items():
+                cameras[camera] = {
+                    'file': track['file'],
+                    'recorder_start_ms': track['recorder_start'],
+                    # Kaydın oturum başlangıcına göre kayması; oynatıcı bu kadar öteler
+                    'start_offset': self._relative(track['recorder_start']),
+                    'bytes': track['bytes'],
+                    'complete': track['closed'],
+                    'chunks': list(track['chunks']),
+                }
+        return {
+            'session': self.session_id,
+            'time_base': 'unix_epoch_ms',
+            'start_epoch_ms': self.start_epoch_ms,
+            'stop_epoch_ms': int(self.stopped_at * 1000) if self.stopped_at else None,
+            'cameras': cameras,
+        }
+
+    def manifest_path(self):
+        return os.path.join(self.recordings_dir, self.session_id, MANIFEST_NAME)
+
+    def write_manifest(self):
+        """Manifesti bir kez yazar (son parçalar gelmezse kapanışta eksik haliyle yazılır)"""
+        if self.manifest_written:
+            return None
+        self.manifest_written = True
+        path = self.manifest_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest(), f, ensure_ascii=False, indent=2)
+            offsets = {c: t['start_offset'] for c, t in self.manifest()['cameras'].items()}
+            logging.info(f"Kayıt oturumu manifesti yazıldı: {path}, başlangıç kaymaları (sn): {offsets}")
+            return path
+        except OSError as e:
+            logging.error(f"Kayıt manifesti yazılamadı: {e}")
+            return None
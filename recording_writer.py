@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Parça Parça Kayıt Yazıcısı
+MediaRecorder'ın her saniyelik parçası geldiği anda sınırlı bir kuyruğa
+alınır ve ayrı bir yazıcı thread'i tarafından diske eklenir
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+class RecordingWriter:
+    """Tek yazıcı thread'i; kuyruk dolarsa gönderen (HTTP thread'i) bekler"""
+
+    def __init__(self, recordings_dir="recordings", max_queue=DEFAULT_QUEUE_SIZE):
+        self.recordings_dir = recordings_dir
+        os.makedirs(recordings_dir, exist_ok=True)
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.files = {}
+        self.stats = {}
+        # max_depth birden çok HTTP thread'inden güncellenir
+        self.max_depth = 0
+        self.dropped = 0
+        self._depth_lock = threading.Lock()
+        # Yazıcı thread'inde çağrılır: on_chunk(dosya, seq, ofset, boyut, meta), on_close(dosya, istatistik)
+        self.on_chunk = None
+        self.on_close = None
+        self.thread = threading.Thread(target=self._run, name="RecordingWriter", daemon=True)
+        self.thread.start()
+
+    def path_for(self, filename):
+        """'oturum/dosya.webm' gibi göreli yollar kabul edilir, '..' ve mutlak yollar atılır"""
+        parts = [os.path.basename(p) for p in filename.replace('\\', '/').split('/') if p not in ('', '.', '..')]
+        return os.path.join(self.recordings_dir, *parts)
+
+    def write(self, filename, seq, data, meta=None, timeout=5.0):
+        """Parçayı kuyruğa ekler; seq 0 dosyayı baştan açar. Kuyruk timeout boyunca
+        dolu kalırsa parça alınmaz ve False döner (gönderen tekrar denemeli)"""
+        try:
+            self.queue.put(('chunk', filename, seq, data, meta), timeout=timeout)
+        except queue.Full:
+            with self._depth_lock:
+                self.dropped += 1
+            logging.error(f"Kayıt kuyruğu dolu, parça alınmadı: {filename} seq={seq} ({len(data)} bytes)")
+            return False
+        depth = self.queue.qsize()
+        with self._depth_lock:
+            self.max_depth = max(self.max_depth, depth)
+        return True
+
+    def close(self, filename, timeout=5.0):
+        """Dosyayı kapatma isteği; kuyruk dolu kalırsa False döner"""
+        try:
+            self.queue.put(('close', filename, None, None, None), timeout=timeout)
+        except queue.Full:
+            logging.error(f"Kayıt kuyruğu dolu, dosya kapatılamadı: {filename}")
+            return False
+        return True
+
+    def stop(self):
+        """Bekleyen parçaları yazıp thread'i sonlandırır"""
+        self.queue.put(('stop', None, None, None, None))
+        self.thread.join(timeout=10)
+
+    def _run(self):
+        while True:
+            kind, filename, seq, data, meta = self.queue.get()
+            try:
+                if kind == 'stop':
+                    for name in list(self.files):
+                        self._close(name)
+                    return
+                if kind == 'close':
+                    self._close(filename)
+                else:
+                    self._write(filename, seq, data, meta)
+            except Exception as e:
+                logging.error(f"Kayıt yazma hatası ({filename}): {e}")
+            finally:
+                self.queue.task_done()
+
+    def _write(self, filename, seq, data, meta=None):
+        f = self.files.get(filename)
+        if f is None or seq == 0:
+            path = self.path_for(filename)
+            if f is not None:
+                f.close()
+                logging.warning(f"Kayıt baştan başladı (seq 0), önceki parçaların üzerine yazılıyor: {path}")
+            elif os.path.exists(path) and os.path.getsize(path) > 0:
+                logging.warning(f"Var olan kayıt dosyasının üzerine yazılıyor: {path}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, 'wb')
+            self.files[filename] = f
+            self.stats[filename] = {'chunks': 0, 'bytes': 0, 'next_seq': 0, 'started': time.time()}
+        stats = self.stats[filename]
+        if seq is not None and seq != stats['next_seq']:
+            logging.warning(f"Kayıt parçası sırası bozuk ({filename}): beklenen {stats['next_seq']}, gelen {seq}")
+        offset = stats['bytes']
+        f.write(data)
+        stats['chunks'] += 1
+        stats['bytes'] += len(data)
+        stats['next_seq'] = (seq if seq is not None else stats['next_seq']) + 1
+        if self.on_chunk is not None:
+            self.on_chunk(filename, seq, offset, len(data), meta)
+
+    def _close(self, filename):
+        f = self.files.pop(filename, None)
+        if f is None:
+            # Kaydedici başlamadan durduruldu (yalnızca boş son parça geldi); oturum yine de
+            # dosyayı kapanmış saymalı ki manifest beklemesin
+            stats = self.stats.setdefault(filename, {'chunks': 0, 'bytes': 0, 'next_seq': 0, 'started': None})
+            logging.info(f"Kayıt parçası gelmeden kapatıldı: {self.path_for(filename)}")
+        else:
+            f.close()
+            stats = self.stats.get(filename, {})
+            print(f"✅ Dosya kaydedildi: {self.path_for(filename)} "
+                  f"({stats.get('chunks', 0)} parça, {stats.get('bytes', 0)} bytes)")
+        if self.on_close is not None:
+            self.on_close(filename, stats)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Arayüz Takılma Bekçisi
+GUI thread'i kısa aralıklarla beat() çağırır (Qt zamanlayıcısı). Ayrı bir bekçi
+thread'i son kalp atışından bu yana geçen süreyi izler; eşik aşılınca GUI
+thread'inin Python yığınını sys._current_frames ile örnekler. Olay döngüsü
+tekrar döndüğünde takılma süresi histogramlanır ve yığınıyla birlikte
+JSONL takılma loguna yazılır. Qt'den bağımsızdır.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import traceback
+from collections import Counter, deque
+
+DEFAULT_THRESHOLD_MS = 250
+DEFAULT_HEARTBEAT_MS = 50
+DEFAULT_STALL_LOG = 'ika_stalls.jsonl'
+# Histogram kova üst sınırları (ms); sonuncusunun üstü ayrı kovadır
+HISTOGRAM_BOUNDS_MS = (250, 500, 1000, 2000, 5000)
+MAX_STACK_SAMPLES = 20
+MAX_STACK_DEPTH = 40
+RECENT_STALLS = 100
+
+
+class StallHistogram:
+    """Takılma sürelerinin kovalara dağılımı"""
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, duration_ms):
+        i = 0
+        while i < len(self.bounds) and duration_ms >= self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def labels(self):
+        edges = (0,) + self.bounds
+        labels = [f"{lo}-{hi} ms" for lo, hi in zip(edges[:-1], edges[1:])]
+        return labels + [f"{self.bounds[-1]}+ ms"]
+
+    def buckets(self):
+        """Boş olmayan (etiket, sayı) kovaları"""
+        return [(label, count) for label, count in zip(self.labels(), self.counts) if count]
+
+
+class StallWatchdog:
+    """threshold_ms'den uzun süre kalp atışı gelmezse GUI thread'inin yığınını örnekler"""
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, log_path=DEFAULT_STALL_LOG,
+                 app_root=None, thread_ident=None):
+        self.threshold = threshold_ms / 1000.0
+        self.log_path = log_path
+        # Suçlu çerçeve: yığında bu klasördeki en derin çağrı (yoksa en derin çerçeve)
+        self.app_root = os.path.abspath(app_root) if app_root else None
+        # Varsayılan olarak oluşturan thread (GUI thread'i) izlenir
+        self.thread_ident = thread_ident or threading.get_ident()
+        self.histogram = StallHistogram()
+        self.recent = deque(maxlen=RECENT_STALLS)
+        self.last_beat = None
+        self._modal = False
+        self._samples = []
+        self._next_sample = self.threshold
+        self._finished = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.running = False
+
+    # --- GUI thread ---
+    def beat(self, modal=False):
+        """Kalp atışı; modal=True iken (açık modal pencere) olay döngüsü dönse de
+        arayüz kullanıcıya kapalı sayılır ve süre takılmaya eklenir.
+        Biten takılma varsa kaydını döndürür."""
+        now = time.monotonic()
+        if self._thread is None:
+            # Bekçi ilk kalp atışında (olay döngüsü başlayınca) başlar
+            self.last_beat = now
+            self._start()
+            return None
+        if modal:
+            self._modal = True
+            return None
+
+        with self._lock:
+            gap = now - self.last_beat
+            self.last_beat = now
+            samples, self._samples = self._samples, []
+            self._next_sample = self.threshold
+        if gap < self.threshold:
+            self._modal = False
+            return None
+
+        stall = self._make_record(gap * 1000.0, samples, 'modal' if self._modal else 'blocked')
+        self._modal = False
+        self.histogram.add(stall['duration_ms'])
+        self.recent.append(stall)
+        with self._lock:
+            self._finished.append(stall)
+        self._wake.set()
+        return stall
+
+    # --- Bekçi thread'i ---
+    def _start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name='StallWatchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._write_finished()
+
+    def _run(self):
+        interval = max(0.01, self.threshold / 4)
+        while self.running:
+            self._wake.wait(interval)
+            self._wake.clear()
+            self._write_finished()
+            with self._lock:
+                last = self.last_beat
+                if last is None:
+                    continue
+                gap = time.monotonic() - last
+                if gap >= self._next_sample:
+                    self._sample()
+                    # Uzun takılmada her eşik süresinde bir örnek daha alınır
+                    self._next_sample = gap + self.threshold
+
+    def _sample(self):
+        """GUI thread'inin o anki yığını (kilit tutulurken çağrılır)"""
+        if len(self._samples) >= MAX_STACK_SAMPLES:
+            return
+        frame = sys._current_frames().get(self.thread_ident)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)[-MAX_STACK_DEPTH:]
+        self._samples.append([(f.filename, f.lineno, f.name) for f in stack])
+
+    def _culprit(self, stack):
+        if not stack:
+            return None
+        chosen = stack[-1]
+        if self.app_root:
+            # Modül seviyesi (app.exec() satırı) suçlu sayılmaz; o zaman en derin çerçeve kalır
+            for frame in reversed(stack):
+                if frame[2] != '<module>' and os.path.abspath(frame[0]).startswith(self.app_root):
+                    chosen = frame
+                    break
+        return f"{chosen[2]} ({os.path.basename(chosen[0])}:{chosen[1]})"
+
+    def _make_record(self, duration_ms, samples, kind):
+        culprits = Counter(self._culprit(stack) for stack in samples)
+        culprit = culprits.most_common(1)[0][0] if culprits else None
+        stack = samples[0] if samples else []
+        return {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'duration_ms': round(duration_ms, 1),
+            'kind': kind,
+            'culprit': culprit,
+            'samples': len(samples),
+            'culprits': dict(culprits),
+            'stack': [f"{os.path.basename(f)}:{line} {name}" for f, line, name in stack],
+        }
+
+    def _write_finished(self):
+        with self._lock:
+            finished = list(self._finished)
+            self._finished.clear()
+        if not finished or not self.log_path:
+            return
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                for stall in finished:
+                    f.write(json.dumps(stall, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.error(f"Takılma logu yazılamadı: {e}")
+
+    # --- Rapor ---
+    def last_stall(self):
+        return self.recent[-1] if self.recent else None
+
+    def log_summary(self):
+        if not len(self.histogram):
+            logging.info("Arayüz takılması yok")
+            return
+        h = self.histogram
+        logging.info(f"Arayüz takılmaları: {len(h)} kez, toplam {h.total_ms / 1000:.1f} sn, "
+                     f"en uzun {h.max_ms:.0f} ms")
+        for label, count in h.buckets():
+            logging.info(f"  {label}: {count}")
+        culprits = Counter()
+        for stall in self.recent:
+            culprits[stall['culprit']] += 1
+        for culprit, count in culprits.most_common(5):
+            logging.info(f"  {count}× {culprit}")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Açılış Zaman Çizelgesi
+Açılıştaki her aşamanın (kabuk, kamera sayfaları, dosya sunucusu, Firebase,
+eski dalların temizliği) başlangıç ve bitişini kaydeder. Aşamalar farklı
+thread'lerden işaretlenebilir; hepsi bitince süreler ve çakışmaları gösteren
+rapor loglanır ve regresyon takibi için JSON satırı olarak eklenir.
+"""
+
+import sys
+import json
+import time
+import logging
+import builtins
+import threading
+from contextlib import contextmanager
+
+DEFAULT_STARTUP_LOG = 'ika_startup.jsonl'
+REPORT_WIDTH = 40
+
+
+class StartupTimeline:
+    """Aşama adı -> (başlangıç, bitiş) perf_counter zamanları; t0 süreç başlangıcına yakın alınır"""
+
+    def __init__(self, t0=None, log_path=DEFAULT_STARTUP_LOG):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.started_at = time.time() - (time.perf_counter() - self.t0)
+        self.log_path = log_path
+        self.phases = {}
+        self.order = []
+        self.expected = set()
+        self.logged = False
+        self._lock = threading.Lock()
+
+    def expect(self, *names):
+        """Rapor yazılmadan önce bitmesi beklenen aşamalar"""
+        with self._lock:
+            self.expected.update(names)
+
+    def begin(self, name, thread=None):
+        """thread verilmezse çağıran thread'in adı yazılır (QThread'ler için ad verilmeli)"""
+        with self._lock:
+            if name not in self.phases:
+                self.order.append(name)
+            self.phases[name] = {
+                'start': time.perf_counter(), 'end': None,
+                'thread': thread or threading.current_thread().name, 'ok': None, 'detail': '',
+            }
+
+    def end(self, name, ok=True, detail=''):
+        with self._lock:
+            phase = self.phases.get(name)
+            if phase is None or phase['end'] is not None:
+                return
+            phase['end'] = time.perf_counter()
+            phase['ok'] = ok
+            phase['detail'] = detail
+
+    def record(self, name, start, end=None, ok=True, detail='', thread=None):
+        """Dışarıda ölçülmüş aşama (ör. timeline oluşturulmadan önceki importlar)"""
+        self.begin(name, thread)
+        with self._lock:
+            self.phases[name]['start'] = start
+        self.end(name, ok, detail)
+        if end is not None:
+            with self._lock:
+                self.phases[name]['end'] = end
+
+    def mark(self, name, detail=''):
+        """Süresiz an (ör. pencere gösterildi); ilk işaret korunur"""
+        if name in self.phases:
+            return
+        self.begin(name)
+        self.end(name, True, detail)
+
+    @contextmanager
+    def phase(self, name, thread=None):
+        self.begin(name, thread)
+        try:
+            yield
+        except Exception as e:
+            self.end(name, False, str(e))
+            raise
+        self.end(name)
+
+    def start_ms(self, name):
+        """Aşamanın t0'dan itibaren başladığı an (ms); yoksa None"""
+        phase = self.phases.get(name)
+        return None if phase is None else (phase['start'] - self.t0) * 1000.0
+
+    def duration_ms(self, name):
+        phase = self.phases.get(name)
+        if phase is None or phase['end'] is None:
+            return None
+        return (phase['end'] - phase['start']) * 1000.0
+
+    def pending(self):
+        with self._lock:
+            return sorted(n for n in self.expected
+                          if n not in self.phases or self.phases[n]['end'] is None)
+
+    def is_complete(self):
+        return not self.pending()
+
+    def progress(self):
+        """(biten, beklenen) aşama sayısı"""
+        with self._lock:
+            done = sum(1 for n in self.expected if n in self.phases and self.phases[n]['end'] is not None)
+            return done, len(self.expected)
+
+    def total_ms(self):
+        ends = [p['end'] for p in self.phases.values() if p['end'] is not None]
+        return (max(ends) - self.t0) * 1000.0 if ends else 0.0
+
+    def rows(self):
+        """(ad, başlangıç ms, süre ms, thread, ok, detay) — başlangıca göre sıralı"""
+        with self._lock:
+            phases = [(name, dict(self.phases[name])) for name in self.order]
+        rows = []
+        for name, p in phases:
+            end = p['end'] if p['end'] is not None else time.perf_counter()
+            rows.append((name, (p['start'] - self.t0) * 1000.0, (end - p['start']) * 1000.0,
+                         p['thread'], p['ok'], p['detail']))
+        return sorted(rows, key=lambda r: r[1])
+
+    def report_lines(self):
+        rows = self.rows()
+        total = max([start + duration for _, start, duration, *_ in rows] + [1.0])
+        scale = REPORT_WIDTH / total
+        lines = [f"Açılış zaman çizelgesi (toplam {total:.0f} ms):"]
+        for name, start, duration, thread, ok, detail in rows:
+            offset = int(start * scale)
+            bar = '▏' if duration * scale < 1 else '█' * int(round(duration * scale))
+            status = '⏳' if ok is None else ('✅' if ok else '❌')
+            line = (f"  {status} {name:<32} +{start:7.0f} ms {duration:8.1f} ms  "
+                    f"{' ' * offset}{bar:<{REPORT_WIDTH - offset}}  [{thread}]")
+            if detail:
+                line += f" {detail}"
+            lines.append(line)
+        return lines
+
+    def summary_text(self):
+        done, expected = self.progress()
+        pending = self.pending()
+        if not pending:
+            return f"Açılış tamamlandı: {self.total_ms() / 1000:.2f} sn"
+        return f"Açılış {done}/{expected}: {', '.join(pending)} bekleniyor"
+
+    def write_log(self):
+        """Raporu loglar ve oturumu JSON satırı olarak ekler (bir kez)"""
+        if self.logged:
+            return
+        self.logged = True
+        for line in self.report_lines():
+            logging.info(line)
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'total_ms': round(self.total_ms(), 1),
+            'phases': {
+                name: {'start_ms': round(start, 1), 'duration_ms': round(duration, 1),
+                       'thread': thread, 'ok': ok, 'detail': detail}
+                for name, start, duration, thread, ok, detail in self.rows()
+            },
+        }
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.error(f"Açılış logu yazılamadı: {e}")
+
+
+class ImportProfiler:
+    """builtins.__import__'u sarar ve her modülün import süresini ölçer (-X importtime benzeri).
+    Kümülatif süre alt importları da içerir, öz süre yalnızca modülün kendi kodudur.
+    Yalnızca --profile-startup ile, uygulama importlarından önce kurulur."""
+
+    def __init__(self):
+        self.modules = {}           # ad -> [kümülatif sn, öz sn, thread]
+        self._local = threading.local()
+        self._original = None
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Zaten yüklü modüller ölçülmez (yalnızca sözlük araması)
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            entry = self.modules.setdefault(name, [0.0, 0.0, threading.current_thread().name])
+            entry[0] += elapsed
+            entry[1] += elapsed - children
+
+    def summary(self, top=40):
+        """Kümülatif süreye göre en pahalı importlar (ms)"""
+        rows = sorted(self.modules.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return [
+            {'module': name, 'cumulative_ms': round(cum * 1000.0, 2),
+             'self_ms': round(own * 1000.0, 2), 'thread': thread}
+            for name, (cum, own, thread) in rows
+        ]
+
+    def report_lines(self, top=25):
+        lines = [f"Import süreleri (en pahalı {top}):", f"  {'kümülatif ms':>12} {'öz ms':>9}  modül"]
+        for row in self.summary(top):
+            lines.append(f"  {row['cumulative_ms']:>12.1f} {row['self_ms']:>9.1f}  {row['module']}"
+                         + (f" [{row['thread']}]" if row['thread'] != 'MainThread' else ''))
+        return lines
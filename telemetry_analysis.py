@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Telemetri Analizi
+Uçuş kaydedicisi loglarını sütunlu NumPy (.npz) dosyalarına çevirir ve her
+koşu için vektörel analizler yapar: hız profili, IMU roll/pitch uçları, GPS
+iz uzunluğu ve komut -> yankı gecikmesi. Koşular süreç havuzunda paralel işlenir.
+
+Kullanım: python telemetry_analysis.py telemetry/ [--export-dir exports] [--workers 4] [--json rapor.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from flight_recorder import (
+    CHANNELS, KIND_COMMAND, KIND_SENSORS, KIND_STATE, RECORD_DTYPE, RUN_PATTERN, list_logs, load_logs,
+)
+
+EARTH_RADIUS_M = 6371008.8
+MOVING_SPEED = 0.5          # bu hızın üstü "hareket halinde" sayılır (m/s)
+
+# .npz'ye yazılan sütunlar (dolgu alanı hariç)
+COLUMNS = tuple(name for name in RECORD_DTYPE.names if not name.startswith('_'))
+
+
+def group_runs(paths):
+    """Log dosyalarını koşulara ayırır: aynı açılışın dönen dosyaları tek koşudur"""
+    runs = defaultdict(list)
+    for path in paths:
+        for log in list_logs(path):
+            match = RUN_PATTERN.match(os.path.basename(log))
+            runs[match.group(1) if match else os.path.splitext(os.path.basename(log))[0]].append(log)
+    return {run: sorted(files) for run, files in sorted(runs.items())}
+
+
+def to_columns(records):
+    """Kayıt dizisini sütun sözlüğüne çevirir (her alan ayrı, bitişik dizi)"""
+    return {name: np.ascontiguousarray(records[name]) for name in COLUMNS}
+
+
+def export_npz(columns, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(path, **columns)
+    return path
+
+
+def _stats(values):
+    if not len(values):
+        return None
+    return {
+        'min': float(values.min()),
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+        'max': float(values.max()),
+    }
+
+
+def speed_profile(c):
+    sensors = c['kind'] == KIND_SENSORS
+    valid = sensors & ~np.isnan(c['speed'])
+    t, speed = c['t'][valid], c['speed'][valid].astype(np.float64)
+    result = _stats(speed)
+    if result is None:
+        return None
+    # Örnek aralıklarıyla ağırlıklandırılmış hareket süresi
+    dt = np.diff(t)
+    result['moving_s'] = float(dt[speed[:-1] > MOVING_SPEED].sum())
+    result['duration_s'] = float(t[-1] - t[0])
+    return result
+
+
+def imu_extremes(c):
+    result = {}
+    sensors = c['kind'] == KIND_SENSORS
+    for axis in ('roll', 'pitch'):
+        valid = sensors & ~np.isnan(c[axis])
+        values, t = c[axis][valid], c['t'][valid]
+        if not len(values):
+            continue
+        lo, hi = int(values.argmin()), int(values.argmax())
+        result[axis] = {
+            'min': float(values[lo]), 'min_t': float(t[lo]),
+            'max': float(values[hi]), 'max_t': float(t[hi]),
+            'abs_p95': float(np.percentile(np.abs(values), 95)),
+        }
+    return result or None
+
+
+def track_length(c):
+    """Ardışık geçerli GPS noktaları arasındaki haversine mesafelerinin toplamı (m)"""
+    sensors = c['kind'] == KIND_SENSORS
+    valid = sensors & ~np.isnan(c['lat']) & ~np.isnan(c['lon'])
+    lat = np.radians(c['lat'][valid])
+    lon = np.radians(c['lon'][valid])
+    if len(lat) < 2:
+        return None
+    dlat = np.diff(lat)
+    dlon = np.diff(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    steps = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return {'length_m': float(steps.sum()), 'points': int(len(lat))}
+
+
+def echo_latency(c):
+    """Komutun gönderildiği an (yankıdaki 'timestamp') ile Firebase'den geri okunduğu an arası.
+    Aynı komutun tekrarlanan okumalarından yalnızca ilki sayılır."""
+    echoes = (c['kind'] == KIND_STATE) & ~np.isnan(c['ref_t'])
+    if not echoes.any():
+        return None
+    channel, ref_t, t = c['channel'][echoes], c['ref_t'][echoes], c['t'][echoes]
+    # (kanal, ref_t) çiftinin ilk görüldüğü kayıtlar
+    keys = np.stack([channel.astype(np.float64), ref_t], axis=1)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    latency_ms = (t[first] - ref_t[first]) * 1000.0
+    result = {'all': _stats(latency_ms)}
+    for code in np.unique(channel[first]):
+        name = CHANNELS[code - 1] if 0 < code <= len(CHANNELS) else str(code)
+        result[name] = _stats(latency_ms[channel[first] == code])
+    return result
+
+
+def analyse_run(run, files, export_dir=None):
+    """Süreç havuzunda çalışır: tek koşuyu yükler, isteğe bağlı dışa aktarır ve analiz eder"""
+    columns = to_columns(load_logs(files))
+    report = {
+        'run': run,
+        'files': len(files),
+        'records': int(len(columns['t'])),
+        'sensor_records': int((columns['kind'] == KIND_SENSORS).sum()),
+        'commands': int((columns['kind'] == KIND_COMMAND).sum()),
+        'speed': speed_profile(columns),
+        'imu': imu_extremes(columns),
+        'track': track_length(columns),
+        'echo_latency_ms': echo_latency(columns),
+    }
+    if export_dir:
+        report['export'] = export_npz(columns, os.path.join(export_dir, f"{run}.npz"))
+    return report
+
+
+def _fmt(value, spec='.2f'):
+    return '-' if value is None else format(value, spec)
+
+
+def print_report(reports):
+    print(f"{'koşu':<22} {'kayıt':>7} {'komut':>6} {'ort. hız':>9} {'maks hız':>9} "
+          f"{'iz (m)':>9} {'roll min/maks':>15} {'pitch min/maks':>15} {'yankı p95 ms':>13}")
+    for r in reports:
+        speed = r['speed'] or {}
+        imu = r['imu'] or {}
+        roll = imu.get('roll') or {}
+        pitch = imu.get('pitch') or {}
+        echo = (r['echo_latency_ms'] or {}).get('all') or {}
+        print(f"{r['run']:<22} {r['records']:>7} {r['commands']:>6} {_fmt(speed.get('mean')):>9} "
+              f"{_fmt(speed.get('max')):>9} {_fmt((r['track'] or {}).get('length_m'), '.1f'):>9} "
+              f"{_fmt(roll.get('min'), '.1f') + '/' + _fmt(roll.get('max'), '.1f'):>15} "
+              f"{_fmt(pitch.get('min'), '.1f') + '/' + _fmt(pitch.get('max'), '.1f'):>15} "
+              f"{_fmt(echo.get('p95'), '.1f'):>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetri loglarını dışa aktarır ve analiz eder")
+    parser.add_argument('paths', nargs='+', help=".ikt dosyaları ya da telemetri klasörleri")
+    parser.add_argument('--export-dir', help="Her koşu için sütunlu .npz dosyalarının yazılacağı klasör")
+    parser.add_argument('--workers', type=int, default=None, help="Süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument('--json', dest='json_path', help="Raporu JSON olarak da yaz")
+    args = parser.parse_args()
+
+    runs = group_runs(args.paths)
+    if not runs:
+        print("❌ Telemetri logu bulunamadı")
+        sys.exit(1)
+
+    reports = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            run: executor.submit(analyse_run, run, files, args.export_dir)
+            for run, files in runs.items()
+        }
+        for run, future in futures.items():
+            try:
+                reports.append(future.result())
+            except (OSError, ValueError) as e:
+                print(f"❌ {run} analiz edilemedi: {e}")
+
+    print_report(reports)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"✅ Rapor yazıldı: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Telemetri Geçmişi
+Her sinyal için önceden ayrılmış NumPy halka tamponu ve çizim için seyreltme
+(min/maks ve LTTB). Grafik hep piksel sayısı kadar nokta çizer; geçmiş bir
+dakika da olsa bir saat de olsa çizim maliyeti sabit kalır.
+"""
+
+import numpy as np
+
+# 10 Hz telemetride yaklaşık bir saat
+DEFAULT_HISTORY_CAPACITY = 36000
+
+# Grafiği çizilen sinyaller: (sinyal, sensör grubu, alan)
+HISTORY_SIGNALS = (
+    ('roll', 'imu', 'roll'),
+    ('pitch', 'imu', 'pitch'),
+    ('yaw', 'imu', 'yaw'),
+    ('alt', 'gps', 'altitude'),
+    ('speed', 'gps', 'speed'),
+)
+
+
+class SignalHistory:
+    """Sabit kapasiteli (zaman, değer) halka tamponu; dolunca en eskinin üzerine yazar"""
+
+    def __init__(self, capacity=DEFAULT_HISTORY_CAPACITY):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float32)
+        self.head = 0
+        self.count = 0
+        self.version = 0    # her eklemede artar; grafik değişmediyse yeniden çizilmez
+
+    def append(self, t, value):
+        self.times[self.head] = t
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.version += 1
+
+    def __len__(self):
+        return self.count
+
+    def ordered(self):
+        """Eskiden yeniye (zaman, değer) dizileri; sarılmadıysa kopyasız görünüm"""
+        if self.count < self.capacity:
+            return self.times[:self.count], self.values[:self.count]
+        return (np.concatenate((self.times[self.head:], self.times[:self.head])),
+                np.concatenate((self.values[self.head:], self.values[:self.head])))
+
+    def latest(self):
+        if not self.count:
+            return None
+        return float(self.values[(self.head - 1) % self.capacity])
+
+
+def minmax_decimate(t, v, buckets):
+    """Her kovadan en küçük ve en büyük noktayı (zaman sırasıyla) tutar: en fazla 2 * buckets nokta.
+    Sivri uçlar kaybolmaz; tamamen vektöreldir."""
+    n = len(v)
+    if buckets <= 0 or n <= 2 * buckets:
+        return t, v
+    size = n // buckets
+    start = n - size * buckets      # artan en eski örnekler atlanır
+    block = v[start:].reshape(buckets, size)
+    imin = block.argmin(axis=1)
+    imax = block.argmax(axis=1)
+    pair = np.stack((np.minimum(imin, imax), np.maximum(imin, imax)), axis=1)
+    index = (pair + (np.arange(buckets) * size)[:, None]).ravel() + start
+    return t[index], v[index]
+
+
+def lttb_decimate(t, v, points):
+    """Largest-Triangle-Three-Buckets: görsel şekli koruyan `points` nokta seçer"""
+    n = len(v)
+    if points < 3 or n <= points:
+        return t, v
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    index = np.empty(points, dtype=np.int64)
+    index[0] = 0
+    index[-1] = n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Sonraki kovanın ortalaması üçüncü köşe olur
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_t = t[nlo:nhi].mean() if nhi > nlo else t[-1]
+        avg_v = v[nlo:nhi].mean() if nhi > nlo else v[-1]
+        area = np.abs((t[a] - avg_t) * (v[lo:hi] - v[a]) - (t[a] - t[lo:hi]) * (avg_v - v[a]))
+        a = lo + int(area.argmax())
+        index[i + 1] = a
+    return t[index], v[index]
+
+
+def decimate(t, v, points, method='minmax'):
+    if method == 'lttb':
+        return lttb_decimate(t, v, points)
+    return minmax_decimate(t, v, points // 2)
+
+
+class TelemetryHistory:
+    """Sensör sözlüklerinden sinyal geçmişlerini doldurur"""
+
+    def __init__(self, capacity=DEFAULT_HISTORY_CAPACITY, signals=HISTORY_SIGNALS):
+        self.signals = signals
+        self.series = {name: SignalHistory(capacity) for name, _, _ in signals}
+
+    def add(self, t, data):
+        """update_sensor_data'nın aldığı {'imu': {...}, 'gps': {...}} sözlüğü"""
+        for name, group, field in self.signals:
+            section = data.get(group)
+            if isinstance(section, dict) and field in section:
+                try:
+                    self.series[name].append(t, float(section[field]))
+                except (TypeError, ValueError):
+                    pass
+
+    def __getitem__(self, name):
+        return self.series[name]
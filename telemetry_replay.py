@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Telemetri Oynatma
+Uçuş kaydedicisinin loglarını orijinal zamanlamasıyla, hız çarpanı
+uygulanarak yeniden üretir. Zaman indeksi (sıralı zaman dizisi üzerinde
+ikili arama) sayesinde uzun bir logun herhangi bir anına anında atlanır.
+"""
+
+import time
+
+import numpy as np
+
+from flight_recorder import (
+    CHANNELS, KIND_SENSORS, KIND_STATE, decode_value, list_logs, load_logs,
+)
+
+MIN_SPEED = 0.25
+MAX_SPEED = 50.0
+SPEED_STEPS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+# Durum kanalında değerin sözlükteki anahtarı (handle_firebase_data'nın beklediği biçim)
+STATE_KEYS = {
+    'control': 'mode',
+    'gear': 'gear',
+    'emergency': 'emergency',
+    'vehicle_engine': 'engine_running',
+    'laser_mode': 'active',
+    'laser': 'command',
+    'commands': 'command',
+    'movement': 'command',
+    'steering': 'command',
+    'gas': 'command',
+}
+
+SENSOR_FIELDS = (
+    ('imu', 'roll', 'roll'), ('imu', 'pitch', 'pitch'), ('imu', 'yaw', 'yaw'),
+    ('gps', 'latitude', 'lat'), ('gps', 'longitude', 'lon'),
+    ('gps', 'altitude', 'alt'), ('gps', 'speed', 'speed'),
+)
+
+
+def format_position(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class TelemetryReplay:
+    """Oynatma saati ve zaman indeksi; Qt'den bağımsızdır, GUI bir zamanlayıcıyla
+    due_events() ve next_delay() çağırarak sürer"""
+
+    def __init__(self, records, speed=1.0):
+        # Yalnızca oynatılan kayıtlar: sensörler ve durum yankıları (giden komutlar arayüze geri beslenmez)
+        kinds = np.asarray(records['kind'])
+        self.records = records[(kinds == KIND_SENSORS) | (kinds == KIND_STATE)]
+        self.times = np.ascontiguousarray(self.records['t'], dtype=np.float64)
+        self.start_t = float(self.times[0]) if len(self.times) else 0.0
+        self.duration = float(self.times[-1] - self.start_t) if len(self.times) else 0.0
+
+        # Kanal bazında kayıt indeksleri; atlamada her kanalın son durumu bulunur
+        channels = np.asarray(self.records['channel'])
+        self.channel_index = {
+            int(code): np.flatnonzero(channels == code) for code in np.unique(channels)
+        }
+
+        self.speed = self._clamp(speed)
+        self.cursor = 0
+        self.playing = False
+        self._anchor_log = self.start_t    # oynatma saatinin bağlandığı log zamanı
+        self._anchor_wall = time.monotonic()
+
+    @classmethod
+    def from_path(cls, path, speed=1.0):
+        """Tek bir .ikt dosyası ya da telemetri klasörü"""
+        return cls(load_logs(list_logs(path)), speed)
+
+    @staticmethod
+    def _clamp(speed):
+        return min(MAX_SPEED, max(MIN_SPEED, float(speed)))
+
+    def __len__(self):
+        return len(self.times)
+
+    # --- Saat ---
+    def log_time(self, now=None):
+        """Şu an oynatılması gereken log zamanı (epoch sn)"""
+        if not self.playing:
+            return self._anchor_log
+        now = time.monotonic() if now is None else now
+        return self._anchor_log + (now - self._anchor_wall) * self.speed
+
+    def position(self):
+        """Log başından itibaren saniye"""
+        return min(self.duration, max(0.0, self.log_time() - self.start_t))
+
+    def _rebase(self, log_t):
+        self._anchor_log = log_t
+        self._anchor_wall = time.monotonic()
+
+    def play(self):
+        if not self.playing:
+            self._rebase(self._anchor_log)
+            self.playing = True
+
+    def pause(self):
+        if self.playing:
+            self._rebase(self.log_time())
+            self.playing = False
+
+    def set_speed(self, speed):
+        # Hız değişince o anki konum korunur
+        self._rebase(self.log_time())
+        self.speed = self._clamp(speed)
+
+    def is_finished(self):
+        return self.cursor >= len(self.times)
+
+    # --- Olaylar ---
+    def seek(self, seconds):
+        """Konumu değiştirir ve o andaki durumu kuracak olayları döndürür"""
+        target = self.start_t + min(self.duration, max(0.0, seconds))
+        self.cursor = int(np.searchsorted(self.times, target, side='right'))
+        self._rebase(target)
+
+        # Her kanalın hedeften önceki son kaydı: O(kanal sayısı * log n)
+        latest = []
+        for indices in self.channel_index.values():
+            j = int(np.searchsorted(indices, self.cursor)) - 1
+            if j >= 0:
+                latest.append(int(indices[j]))
+        return [self.event(i) for i in sorted(latest)]
+
+    def due_events(self, now=None):
+        """Oynatma saatine göre zamanı gelmiş olaylar"""
+        end = int(np.searchsorted(self.times, self.log_time(now), side='right'))
+        events = [self.event(i) for i in range(self.cursor, end)]
+        self.cursor = max(self.cursor, end)
+        return events
+
+    def next_delay(self):
+        """Bir sonraki kayda kadar gerçek zamanda beklenecek süre (sn); bittiyse None"""
+        if self.is_finished() or not self.playing:
+            return None
+        return max(0.0, (self.times[self.cursor] - self.log_time()) / self.speed)
+
+    def event(self, i):
+        """Kaydı ('sensors', sözlük) ya da ('firebase', {'type', 'data'}) olarak çözer"""
+        record = self.records[i]
+        if record['kind'] == KIND_SENSORS:
+            data = {}
+            for group, key, field in SENSOR_FIELDS:
+                value = float(record[field])
+                if not np.isnan(value):
+                    data.setdefault(group, {})[key] = value
+            return 'sensors', data
+
+        channel = CHANNELS[record['channel'] - 1] if 0 < record['channel'] <= len(CHANNELS) else None
+        value = decode_value(float(record['value']), int(record['value_type']))
+        data = {STATE_KEYS.get(channel, 'command'): value}
+        if not np.isnan(record['ref_t']):
+            data['timestamp'] = float(record['ref_t'])
+        return 'firebase', {'type': channel, 'data': data}
@@ -7,9 +7,12 @@
 import webbrowser
 import os
 import sys
+import json
 import tempfile
 from dotenv import load_dotenv
 
+from camera_topology import load_topology
+
 def main():
     """Çoklu kamera gönderici sayfasını açar ve kimlik bilgilerini otomatik doldurur"""
 
@@ -20,13 +23,17 @@ def main():
     agora_app_id = os.getenv('AGORA_APP_ID')
     agora_token = os.getenv('AGORA_TOKEN')
     
-    # Çoklu kamera kanal ve token bilgileri
-    channel_one = os.getenv('AGORA_CHANNEL_ONE', 'channel_one')
-    token_one = os.getenv('AGORA_TOKEN_ONE', agora_token)
-    channel_two = os.getenv('AGORA_CHANNEL_TWO', 'channel_two')
-    token_two = os.getenv('AGORA_TOKEN_TWO', agora_token)
-    channel_three = os.getenv('AGORA_CHANNEL_THREE', 'channel_three')
-    token_three = os.getenv('AGORA_TOKEN_THREE', agora_token)
+    # Kamera kanal, uid ve token bilgileri - alıcıyla aynı topoloji (cameras.json ya da config.env)
+    try:
+        cameras = load_topology()
+    except ValueError as e:
+        print(f"❌ HATA: Kamera yapılandırması geçersiz: {e}")
+        return
+
+    # Token yenileme adresi - İKA uygulaması çalışırken dosya sunucusu token dağıtır
+    token_endpoint = os.getenv('IKA_TOKEN_ENDPOINT', 'http://localhost:8080/token')
+    # Dosya sunucusu /token isteklerini yalnızca bu anahtarla kabul eder
+    token_key = os.getenv('IKA_TOKEN_KEY', '')
 
     if not agora_app_id or not agora_token:
         print("❌ HATA: AGORA_APP_ID veya AGORA_TOKEN bulunamadı!")
@@ -60,13 +67,12 @@ def main():
     html_content = html_content.replace("let AGORA_APP_ID = '';", f"let AGORA_APP_ID = '{agora_app_id}';")
     html_content = html_content.replace("let AGORA_TOKEN = '';", f"let AGORA_TOKEN = '{agora_token}';")
 
-    # Placeholder'ları config.env'deki değerlerle değiştir
-    html_content = html_content.replace('{{CHANNEL_ONE}}', channel_one)
-    html_content = html_content.replace('{{TOKEN_ONE}}', token_one)
-    html_content = html_content.replace('{{CHANNEL_TWO}}', channel_two)
-    html_content = html_content.replace('{{TOKEN_TWO}}', token_two)
-    html_content = html_content.replace('{{CHANNEL_THREE}}', channel_three)
-    html_content = html_content.replace('{{TOKEN_THREE}}', token_three)
+    # Placeholder'ları yapılandırmadaki değerlerle değiştir
+    publishers = json.dumps([camera.publisher(agora_app_id, agora_token) for camera in cameras], ensure_ascii=False)
+    # JSON <script> bloğuna gömülür; '</' bloğu erken kapatmasın
+    html_content = html_content.replace('{{PUBLISHERS}}', publishers.replace('</', '<\\/'))
+    html_content = html_content.replace('{{TOKEN_ENDPOINT}}', token_endpoint)
+    html_content = html_content.replace('{{TOKEN_KEY}}', token_key.replace('\\', '\\\\').replace("'", "\\'"))
 
     # Tarayıcının dosyayı okuyabilmesi için 'delete=False' olarak ayarlanmış geçici bir HTML dosyası oluştur
     # İşletim sistemi bu dosyayı daha sonra otomatik olarak temizleyecektir
@@ -86,9 +92,8 @@ def main():
     print("3. '🚀 Tüm Kameraları Başlat' butonuna basın")
     print("4. Veya her kamera için ayrı ayrı 'Başlat' butonuna basın")
     print("5. Farklı kameralar farklı kanallara yayın yapacak:")
-    print(f"   - Ön Kamera: {channel_one} (UID: 1)")
-    print(f"   - Lazer Kamera: {channel_two} (UID: 2)")
-    print(f"   - Arka Kamera: {channel_three} (UID: 3)")
+    for camera in cameras:
+        print(f"   - {camera.name}: {camera.channel} (UID: {camera.uid})")
     print("\n💻 İKA Uygulamasında:")
     print("1. python ika-app.py çalıştırın")
     print("2. '🎥 Yayını Başlat' butonuna basın")
@@ -0,0 +1,53 @@
+import importlib.util
+import os
+
+# Arayüz testleri ekransız çalışır; QtWebEngine yüklenmez, kamera sayfaları oluşturulmaz
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    """ika-app.py modülü; arka plan süreçleri ve thread'leri başlatan özellikler kapalı"""
+    for name in ('IKA_MOTION_DETECTION', 'IKA_FLIGHT_RECORDER', 'IKA_STALL_WATCHDOG'):
+        os.environ[name] = '0'
+    spec = importlib.util.spec_from_file_location('ika_app', os.path.join(ROOT, 'ika-app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def make_dashboard(app_module, qapp, tmp_path, monkeypatch):
+    """Firebase, sensör ve yayın alt sistemleri başlatılmayan pencere üretir"""
+    monkeypatch.chdir(tmp_path)
+    created = []
+
+    class TestDashboard(app_module.IKADashboard):
+        def start_subsystems(self):
+            pass
+
+    def make(**kwargs):
+        dashboard = TestDashboard(**kwargs)
+        qapp.processEvents()
+        created.append(dashboard)
+        return dashboard
+
+    yield make
+    for dashboard in created:
+        dashboard.close()
+    qapp.processEvents()
+
+
+@pytest.fixture
+def dashboard(make_dashboard):
+    return make_dashboard()
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from camera_topology import (
+    MAX_CAMERAS, CameraSpec, camera_with_role, grid_columns, legacy_cameras, load_topology,
+    parse_cameras, select_decoded,
+)
+
+
+def entry(key, **fields):
+    return {'key': key, 'channel': f"ch-{key}", **fields}
+
+
+def test_parse_cameras_defaults():
+    cameras = parse_cameras({'cameras': [entry('front', role='main'), entry('side', name='Yan', uid=9)]})
+    front, side = cameras
+    assert (front.key, front.name, front.uid, front.priority, front.role) == ('front', 'front', 1, 1, 'main')
+    assert (side.name, side.uid, side.priority, side.role) == ('Yan', 9, 2, 'aux')
+    assert side.file == 'side-cam.webm' and side.token is None
+    assert parse_cameras([entry('front')])[0].channel == 'ch-front'
+
+
+@pytest.mark.parametrize('data, message', [
+    ({'items': []}, "'cameras' listesi"),
+    (['front'], 'bir nesne değil'),
+    ([{'key': 'front'}], 'eksik alan: channel'),
+    ([{'channel': 'ch'}], 'eksik alan: key'),
+    ([entry('front', uid='x')], 'tamsayı'),
+    ([], '1 ile'),
+    ([entry(f"cam{i}") for i in range(MAX_CAMERAS + 1)], '1 ile'),
+    ([entry('Front')], 'Geçersiz kamera anahtarı'),
+    ([entry('front'), entry('front')], 'Aynı anahtarla'),
+    ([entry('front'), {'key': 'back', 'channel': 'ch-front'}], 'kanalı başka'),
+    ([entry('front', role='driver')], 'bilinmeyen rol'),
+    ([entry('a', role='main'), entry('b', role='main')], "'main' rolünde"),
+    ([entry('a', role='laser'), entry('b', role='laser')], "'laser' rolünde"),
+])
+def test_parse_cameras_rejects_invalid_config(data, message):
+    with pytest.raises(ValueError, match=message):
+        parse_cameras(data)
+
+
+def test_load_topology_falls_back_to_legacy(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGORA_CHANNEL_TWO', 'lazer')
+    cameras = load_topology(str(tmp_path / 'missing.json'))
+    assert [c.key for c in cameras] == ['front', 'laser', 'back']
+    assert cameras[1].channel == 'lazer'
+    assert [c.file for c in cameras] == [c.file for c in legacy_cameras()]
+
+    path = tmp_path / 'cameras.json'
+    path.write_text(json.dumps({'cameras': [entry('front')]}), encoding='utf-8')
+    assert [c.key for c in load_topology(str(path))] == ['front']
+    path.write_text('{', encoding='utf-8')
+    with pytest.raises(ValueError, match='okunamadı'):
+        load_topology(str(path))
+
+
+def cameras(count):
+    return [CameraSpec(f"cam{i}", f"Kamera {i}", f"ch{i}", i, priority=i) for i in range(1, count + 1)]
+
+
+def test_select_decoded_respects_budget_and_priority():
+    cams = cameras(6)
+    visible = {c.key for c in cams}
+    assert select_decoded(cams, visible, budget=3) == {'cam1', 'cam2', 'cam3'}
+    assert select_decoded(cams, visible, focused='cam6', budget=3) == {'cam6', 'cam1', 'cam2'}
+    assert select_decoded(cams, {'cam4', 'cam5'}, budget=3) == {'cam4', 'cam5'}
+    assert select_decoded(cams, visible, budget=0) == visible
+    # Görünmeyen odak kamerası bütçeden yer almaz
+    assert select_decoded(cams, {'cam2', 'cam3'}, focused='cam1', budget=1) == {'cam2'}
+
+
+def test_camera_with_role_falls_back_to_first_for_main():
+    cams = cameras(3)
+    assert camera_with_role(cams, 'main') is cams[0]
+    assert camera_with_role(cams, 'laser') is None
+    cams[2].role = 'main'
+    assert camera_with_role(cams, 'main') is cams[2]
+
+
+@pytest.mark.parametrize('count, columns', [(0, 1), (1, 1), (3, 3), (4, 2), (5, 3), (7, 4), (8, 4)])
+def test_grid_columns(count, columns):
+    assert grid_columns(count) == columns
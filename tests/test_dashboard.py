@@ -0,0 +1,105 @@
+def test_theme_stylesheet_is_built_once(dashboard):
+    qss = dashboard.theme_qss("Glass")
+    assert dashboard.theme_qss("Glass") is qss
+    assert qss.endswith(dashboard.control_qss())
+    assert dashboard.theme_qss("NeoDark") != qss
+
+
+def test_apply_theme_skips_current_theme(dashboard, monkeypatch):
+    applied = []
+    monkeypatch.setattr(dashboard, 'setStyleSheet', applied.append)
+    dashboard.apply_theme(dashboard.current_theme)
+    assert applied == []
+    dashboard.apply_theme("Glass")
+    dashboard.apply_theme("Glass")
+    assert applied == [dashboard.theme_qss("Glass")]
+
+
+def test_style_state_repolishes_only_on_change(dashboard, monkeypatch):
+    button = dashboard.start_all_streams_btn
+    assert button.property("state") == "idle"
+    polished = []
+    style = button.style()
+    monkeypatch.setattr(style, 'polish', lambda widget: polished.append(widget))
+    dashboard._set_style_state(button, "state", "active")
+    dashboard._set_style_state(button, "state", "active")
+    assert button.property("state") == "active"
+    assert polished == [button]
+
+
+def test_key_highlight_presses_button(dashboard):
+    dashboard._highlight_button('up')
+    assert dashboard.up_btn.isDown() and dashboard.up_btn.styleSheet() == ""
+    dashboard._unhighlight_button('up')
+    assert not dashboard.up_btn.isDown()
+
+
+def test_performance_profile_caps_tiles_and_flattens_theme(dashboard, monkeypatch):
+    rates = []
+    for panel in dashboard.camera_panels():
+        monkeypatch.setattr(panel, 'set_render_rate', lambda fps, key=panel.camera_key: rates.append((key, fps)))
+    dashboard.set_render_profile('performance', "test")
+    assert dashboard._applied_theme == "Flat"
+    assert dashboard.render_profile_btn.isChecked()
+    assert rates == [(panel.camera_key, dashboard.perf_video_fps) for panel in dashboard.camera_panels()]
+    # Profil açıkken tema değiştirmek düz temayı bozmaz
+    dashboard.apply_theme("Glass")
+    assert dashboard._applied_theme == "Flat"
+
+    rates.clear()
+    dashboard.set_render_profile('quality')
+    assert dashboard._applied_theme == dashboard.current_theme
+    assert not dashboard.render_profile_btn.isChecked()
+    assert {fps for _, fps in rates} == {0}
+
+
+def test_manual_toggle_disables_automatic_profile(dashboard):
+    assert dashboard.render_auto and dashboard.render_profile == 'quality'
+    dashboard.render_profile_btn.setChecked(True)
+    assert dashboard.render_profile == 'performance' and not dashboard.render_auto
+
+
+def test_render_profile_from_environment(make_dashboard, monkeypatch):
+    monkeypatch.setenv('IKA_RENDER_PROFILE', 'performance')
+    monkeypatch.setenv('IKA_PERF_VIDEO_FPS', '8')
+    dashboard = make_dashboard()
+    assert dashboard.render_profile == 'performance' and not dashboard.render_auto
+    assert dashboard.perf_video_fps == 8
+    assert all(panel.render_fps == 8 for panel in dashboard.camera_panels())
+
+
+def stub_streams(dashboard, monkeypatch):
+    started = []
+    for panel in dashboard.camera_panels():
+        monkeypatch.setattr(panel, 'start_stream', lambda app_id, token, channel: started.append((app_id, token, channel)))
+    return started
+
+
+def test_streams_need_agora_credentials(dashboard, app_module, monkeypatch):
+    started = stub_streams(dashboard, monkeypatch)
+    warnings = []
+    monkeypatch.setattr(app_module, 'AGORA_APP_ID', None)
+    monkeypatch.setattr(app_module, 'AGORA_TOKEN', None)
+    monkeypatch.setattr(app_module.QMessageBox, 'warning', lambda parent, title, text: warnings.append(text))
+    dashboard.start_all_camera_streams()
+    assert started == []
+    assert dashboard.start_all_streams_btn.property("state") == "idle"
+    assert len(warnings) == 1 and 'AGORA_APP_ID' in warnings[0] and 'AGORA_TOKEN' in warnings[0]
+
+
+def test_streams_start_with_credentials(dashboard, app_module, monkeypatch):
+    started = stub_streams(dashboard, monkeypatch)
+    monkeypatch.setattr(app_module, 'AGORA_APP_ID', 'app')
+    monkeypatch.setattr(app_module, 'AGORA_TOKEN', 'token')
+    dashboard.start_all_camera_streams()
+    assert started == [('app', 'token', camera.channel) for camera in dashboard.cameras]
+    assert dashboard.start_all_streams_btn.property("state") == "active"
+
+
+def test_startup_profile_finishes_without_credentials(make_dashboard, app_module, monkeypatch):
+    dashboard = make_dashboard(autostart=True)
+    monkeypatch.setattr(app_module, 'AGORA_APP_ID', None)
+    finished = []
+    monkeypatch.setattr(dashboard, 'finish_startup', lambda: finished.append(True))
+    dashboard.start_all_camera_streams()
+    assert finished == [True]
@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+
+from flight_recorder import (
+    CHANNEL_CODES, KIND_COMMAND, KIND_SENSORS, KIND_STATE, RECORD_DTYPE, VALUE_BOOL, VALUE_CODE,
+    FlightRecorder, decode_value, encode_value, list_logs, load_logs, open_log,
+)
+
+
+def test_value_encoding_round_trip():
+    for data, expected in (({'command': 'forward'}, 'forward'), ({'active': True}, True),
+                           ({'gear': '2'}, '2'), ({'mode': 'semi_auto'}, 'semi_auto')):
+        assert decode_value(*encode_value(data)) == expected
+    assert encode_value({'active': False}) == (0.0, VALUE_BOOL)
+    assert encode_value({'command': 'unknown'}) == (-1.0, VALUE_CODE)
+    assert decode_value(*encode_value({'command': 'unknown'})) is None
+
+
+def test_write_read_round_trip(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), flush_interval=0.01)
+    recorder.record_sensors({'imu': {'roll': 1.5, 'pitch': -2.0, 'yaw': 90.0},
+                             'gps': {'latitude': 39.9, 'longitude': 32.8, 'speed': 4.0}})
+    recorder.record_command('movement', {'command': 'forward', 'timestamp': 1234.5})
+    recorder.record_state('laser_mode', {'active': True})
+    recorder.close()
+
+    records = load_logs(list_logs(str(tmp_path)))
+    assert records.dtype == RECORD_DTYPE
+    assert list(records['kind']) == [KIND_SENSORS, KIND_COMMAND, KIND_STATE]
+    assert list(records['seq']) == [0, 1, 2]
+
+    sensors, command, state = records
+    assert sensors['channel'] == CHANNEL_CODES['sensors']
+    assert (sensors['lat'], sensors['lon']) == (39.9, 32.8)
+    assert sensors['roll'] == np.float32(1.5) and sensors['yaw'] == np.float32(90.0)
+    assert math.isnan(sensors['alt'])
+
+    assert command['channel'] == CHANNEL_CODES['movement']
+    assert command['ref_t'] == 1234.5
+    assert decode_value(command['value'], command['value_type']) == 'forward'
+    assert decode_value(state['value'], state['value_type']) is True
+
+
+def test_repeated_state_is_skipped(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), flush_interval=0.01)
+    for gear in ('1', '1', '1', '2', '2'):
+        recorder.record_state('gear', {'gear': gear})
+    recorder.close()
+
+    records = load_logs(list_logs(str(tmp_path)))
+    assert [decode_value(r['value'], r['value_type']) for r in records] == ['1', '2']
+    assert recorder.skipped == 3
+
+
+def test_rotation_keeps_all_records_and_prunes(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), max_bytes=64 + RECORD_DTYPE.itemsize * 2, max_files=2,
+                              flush_interval=60, batch_size=1000)
+    for i in range(6):
+        recorder.record_command('gas', {'command': 'increase'})
+        recorder.record_command('gas', {'command': 'increase'})
+        recorder._flush()
+    recorder.close()
+
+    logs = list_logs(str(tmp_path))
+    assert len(logs) == 2
+    assert all(len(open_log(path)) == 2 for path in logs)
+
+
+def test_concurrent_recorders_do_not_overwrite(tmp_path):
+    first = FlightRecorder(str(tmp_path), flush_interval=60)
+    second = FlightRecorder(str(tmp_path), flush_interval=60)
+    # Aynı saniyede aynı süreçte başlamış gibi
+    second.run_id = first.run_id
+    first.record_command('gear', {'gear': '1'})
+    second.record_command('gear', {'gear': '2'})
+    first.close()
+    second.close()
+
+    assert first.current_path != second.current_path
+    records = load_logs(list_logs(str(tmp_path)))
+    assert sorted(decode_value(r['value'], r['value_type']) for r in records) == ['1', '2']
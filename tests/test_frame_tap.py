@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+import pytest
+
+from frame_tap import FrameTap
+
+
+def frame_bytes(value, width=4, height=2):
+    return np.full((height, width, 4), value, dtype=np.uint8).tobytes()
+
+
+def write(tap, camera, value, timestamp, width=4, height=2):
+    data = frame_bytes(value, width, height)
+    tap.write_from(camera, width, height, io.BytesIO(data), len(data), timestamp)
+
+
+def test_write_from_fills_ring_buffer_and_notifies_subscribers():
+    tap = FrameTap(capacity=4)
+    received = []
+    tap.subscribe('laser', lambda camera, frame, t: received.append((camera, frame.copy(), t)))
+
+    write(tap, 'laser', 7, 12.5)
+
+    frame, timestamp = tap.latest('laser')
+    assert frame.shape == (2, 4, 4)
+    assert (frame == 7).all()
+    assert timestamp == 12.5
+    assert not frame.flags.writeable
+    assert len(received) == 1 and received[0][0] == 'laser' and (received[0][1] == 7).all()
+    assert tap.stats['laser'] == {'frames': 1, 'bytes': 32, 'rejected': 0}
+
+
+def test_ring_buffer_wraps_and_keeps_latest():
+    tap = FrameTap(capacity=2)
+    for value in (1, 2, 3):
+        write(tap, 'front', value, float(value))
+    frame, timestamp = tap.latest('front')
+    assert (frame == 3).all() and timestamp == 3.0
+    assert tap.buffers['front'].count == 3
+
+
+def test_size_mismatch_is_rejected():
+    tap = FrameTap()
+    with pytest.raises(ValueError):
+        tap.write_from('front', 4, 2, io.BytesIO(b'\0' * 10), 10)
+    assert tap.stats['front']['rejected'] == 1
+    assert tap.latest('front') is None
+
+
+def test_truncated_body_raises():
+    tap = FrameTap()
+    data = frame_bytes(1)
+    with pytest.raises(ValueError):
+        tap.write_from('front', 4, 2, io.BytesIO(data[:-4]), len(data))
+
+
+def test_resolution_change_reallocates_buffer():
+    tap = FrameTap()
+    write(tap, 'back', 1, 1.0)
+    first = tap.buffers['back']
+    write(tap, 'back', 2, 2.0, width=8, height=4)
+    assert tap.buffers['back'] is not first
+    assert tap.latest('back')[0].shape == (4, 8, 4)
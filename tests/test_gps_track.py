@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from gps_track import INITIAL_CAPACITY, GpsTrack, douglas_peucker
+
+LAT0, LON0 = 39.9, 32.8
+
+
+def random_track(n=3000, seed=1):
+    rng = np.random.default_rng(seed)
+    track = GpsTrack()
+    # Yaklaşık 1 m'lik adımlarla rastgele yürüyüş ve birkaç kilometre ötede ayrı bir parça
+    steps = rng.normal(scale=1e-5, size=(n, 2)).cumsum(axis=0)
+    steps[n // 2:] += 0.03
+    for i, (dlat, dlon) in enumerate(steps):
+        track.add(float(i), LAT0 + dlat, LON0 + dlon)
+    return track, rng
+
+
+def test_duplicate_point_is_not_added():
+    track = GpsTrack()
+    assert track.add(0.0, LAT0, LON0)
+    assert not track.add(1.0, LAT0, LON0)
+    assert track.add(2.0, LAT0 + 1e-5, LON0)
+    assert len(track) == 2
+    assert track.point(0)['x'] == 0.0 and track.point(0)['y'] == 0.0
+    assert track.point(1)['y'] == pytest.approx(1.11, abs=0.01)
+
+
+def test_arrays_grow_past_initial_capacity():
+    track, _ = random_track(INITIAL_CAPACITY + 10)
+    assert len(track) == INITIAL_CAPACITY + 10
+    assert track.point(INITIAL_CAPACITY + 9)['t'] == INITIAL_CAPACITY + 9
+
+
+def test_nearest_matches_brute_force():
+    track, rng = random_track()
+    xy = track.xy[:track.count]
+    min_x, min_y, max_x, max_y = track.bounds
+    queries = np.column_stack((rng.uniform(min_x - 500, max_x + 500, 300),
+                               rng.uniform(min_y - 500, max_y + 500, 300)))
+    for x, y in queries:
+        expected = np.hypot(xy[:, 0] - x, xy[:, 1] - y).min()
+        i = track.nearest(x, y)
+        assert np.hypot(xy[i, 0] - x, xy[i, 1] - y) == pytest.approx(expected)
+
+
+def test_hit_test_respects_radius():
+    track, _ = random_track(200)
+    p = track.point(100)
+    assert track.hit_test(p['x'] + 0.1, p['y'], radius=1.0) is not None
+    far_x = track.bounds[2] + 50.0
+    assert track.hit_test(far_x, p['y'], radius=10.0) is None
+    assert GpsTrack().nearest(0.0, 0.0) is None
+
+
+def test_simplified_ends_at_last_point():
+    track, _ = random_track()
+    last = track.xy[track.count - 1]
+    for mpp in (0.1, 2.0, 50.0, 1e6):
+        points = track.simplified(mpp)
+        assert np.array_equal(points[-1], last)
+        assert np.array_equal(points[0], track.xy[0])
+    assert len(track.simplified(50.0)) < len(track.simplified(0.1))
+
+    # Artımlı güncelleme yeni noktayı da içerir
+    track.add(9999.0, LAT0 + 0.1, LON0 + 0.1)
+    assert np.array_equal(track.simplified(50.0)[-1], track.xy[track.count - 1])
+
+
+def test_douglas_peucker_keeps_endpoints_and_corners():
+    xy = np.array([(0, 0), (1, 0.01), (2, 0), (3, 0), (3, 1), (3, 2)], dtype=np.float64)
+    assert list(douglas_peucker(xy, 0.1)) == [0, 3, 5]
+    assert list(douglas_peucker(xy, 0.001)) == [0, 1, 2, 3, 5]
+    assert list(douglas_peucker(xy[:2], 1.0)) == [0, 1]
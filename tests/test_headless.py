@@ -0,0 +1,58 @@
+import json
+import urllib.request
+
+import pytest
+
+
+@pytest.fixture
+def node(app_module, qapp, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recorder = app_module.HeadlessRecorder(port=0)
+    recorder.started_recordings = []
+    for key, panel in recorder.panels.items():
+        monkeypatch.setattr(panel, 'start_recording',
+                            lambda filename, key=key, **kwargs: recorder.started_recordings.append((key, filename)))
+        monkeypatch.setattr(panel, 'stop_recording', lambda: None)
+    yield recorder
+    recorder.file_server.stop()
+
+
+def test_session_starts_when_every_camera_has_a_frame(node):
+    keys = list(node.panels)
+    for key in keys[:-1]:
+        node.on_camera_phase(key, 'first_frame', 900, '')
+    assert node.session is None
+    node.on_camera_phase(keys[-1], 'first_frame', 1200, '')
+    assert node.session is not None and node.session_count == 1
+    assert node.started_recordings == [(key, node.filenames[key]) for key in keys]
+    assert set(node.session.tracks) == set(keys)
+
+
+def test_outage_is_counted_and_reported(node):
+    key = next(iter(node.panels))
+    node.on_camera_phase(key, 'first_frame', 900, '')
+    node.on_camera_phase(key, 'outage', 0, 'ağ')
+    node.on_camera_phase(key, 'reconnecting', 0, '2/5')
+
+    camera = node.status()['cameras'][key]
+    assert camera == {'channel': node.channels[key], 'state': 'yeniden bağlanıyor (2/5)',
+                      'receiving': False, 'outages': 1}
+    assert node.status()['recording'] is None
+
+
+def test_status_is_served_over_http(node):
+    for key in node.panels:
+        node.on_camera_phase(key, 'first_frame', 900, '')
+    assert node.file_server.start()
+    with urllib.request.urlopen(f"http://localhost:{node.file_server.port}/status", timeout=5) as response:
+        status = json.loads(response.read())
+    assert status['sessions'] == 1
+    assert status['recording']['session'] == node.session.session_id
+    assert set(status['recording']['files']) == set(node.panels)
+    assert all(camera['receiving'] for camera in status['cameras'].values())
+
+
+def test_node_does_not_start_without_credentials(node, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'AGORA_APP_ID', None)
+    assert not node.start()
+    assert node.file_server.server is None
@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+
+import pytest
+
+from input_latency import CommandSender, InputLatencyTracker, LatencyHistogram, command_name
+
+
+def test_histogram_exact_for_small_values_and_bounded_error():
+    histogram = LatencyHistogram()
+    for us in range(1, 11):
+        histogram.add(us / 1e6)
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(100) == 10
+
+    histogram = LatencyHistogram()
+    values = [1234, 56789, 250000, 1999999]
+    for us in values:
+        histogram.add(us / 1e6)
+    for p, expected in zip((25, 50, 75), values):
+        assert expected <= histogram.percentile(p) <= expected * 1.03
+    assert histogram.percentile(99) == histogram.max_us == 1999999
+    summary = histogram.summary()
+    assert summary['count'] == 4 and summary['max_ms'] == 1999.999
+    assert LatencyHistogram().summary()['p95_ms'] == 0.0
+
+
+def test_command_name():
+    assert command_name('movement', {'command': 'forward', 'timestamp': 1}) == 'movement:forward'
+    assert command_name('gear', {'gear': '2'}) == 'gear:2'
+    assert command_name('emergency', {'emergency': True}) == 'emergency'
+
+
+def test_tracker_keeps_first_input_stamp():
+    tracker = InputLatencyTracker()
+    assert tracker.mark_input('key')
+    assert not tracker.mark_input('mouse')
+    stamp = tracker.stamp()
+    assert stamp['source'] == 'key' and stamp['enqueue'] >= stamp['input']
+    tracker.clear_input()
+    assert tracker.stamp()['source'] == 'program'
+
+
+def test_tracker_stages_failures_and_export(tmp_path):
+    tracker = InputLatencyTracker()
+    stamp = {'source': 'key', 'input': 0.0, 'enqueue': 0.001, 'send': 0.004, 'ack': 0.024}
+    tracker.complete('movement:forward', stamp)
+    tracker.complete('movement:forward', dict(stamp, source='mouse'), ok=False)
+
+    stages = tracker.snapshot()['movement:forward']
+    assert stages['handle']['max_ms'] == pytest.approx(1.0, abs=0.01)
+    assert stages['queue']['max_ms'] == pytest.approx(3.0, abs=0.01)
+    assert stages['network']['max_ms'] == pytest.approx(20.0, abs=0.5)
+    assert stages['total']['count'] == 1
+    assert tracker.sample_count() == 1
+    assert 'movement:forward' in tracker.report_lines()[1]
+
+    path = tracker.export(str(tmp_path / 'latency.json'))
+    exported = json.loads(open(path, encoding='utf-8').read())
+    assert exported['failures'] == {'movement:forward': 1}
+    assert exported['sources'] == {'key': 1, 'mouse': 1}
+    assert list(exported['commands']) == ['movement:forward']
+    assert tracker.export(str(tmp_path / 'missing' / 'latency.json')) is None
+
+
+def test_sender_sends_in_order_and_records_latency():
+    sent = []
+    tracker = InputLatencyTracker()
+    sender = CommandSender(lambda path, data: sent.append((path, data)), tracker)
+    for i, path in enumerate(('movement', 'gear', 'laser')):
+        sender.submit(path, {'command': str(i)}, tracker.stamp())
+    sender.stop()
+    assert sent == [('movement', {'command': '0'}), ('gear', {'command': '1'}), ('laser', {'command': '2'})]
+    assert tracker.sample_count() == 3
+
+
+def test_sender_counts_failed_sends(caplog):
+    def send(path, data):
+        raise ConnectionError('ağ yok')
+
+    tracker = InputLatencyTracker()
+    sender = CommandSender(send, tracker)
+    sender.submit('gas', {'command': 'increase'}, tracker.stamp())
+    sender.stop()
+    assert tracker.failures == {'gas:increase': 1}
+    assert tracker.sample_count() == 0
+    assert any(r.levelname == 'WARNING' and 'ağ yok' in r.getMessage() for r in caplog.records)
+
+
+def blocked_sender(tracker=None):
+    """İlk gönderimi serbest bırakılana kadar bekleyen gönderici; kuyruk bu sırada dolar"""
+    sent = []
+    first_started = threading.Event()
+    release = threading.Event()
+
+    def send(path, data):
+        if not sent:
+            first_started.set()
+            release.wait(5)
+        sent.append((path, data))
+
+    sender = CommandSender(send, tracker)
+    sender.submit('steering', {'command': 'left'})
+    assert first_started.wait(5)
+    return sender, sent, release
+
+
+def test_sender_coalesces_pending_commands_per_path():
+    tracker = InputLatencyTracker()
+    sender, sent, release = blocked_sender(tracker)
+    sender.submit('movement', {'command': 'forward'})
+    sender.submit('gear', {'gear': '1'})
+    sender.submit('movement', {'command': 'backward'})
+    sender.submit('movement', {'command': 'null'})
+    release.set()
+    sender.stop()
+    # Bekleyen hareket komutunun yerine son değer geçer, sırası korunur
+    assert sent == [('steering', {'command': 'left'}), ('movement', {'command': 'null'}), ('gear', {'gear': '1'})]
+    assert tracker.superseded == {'movement:forward': 1, 'movement:backward': 1}
+
+
+def test_sender_sends_emergency_first():
+    sender, sent, release = blocked_sender()
+    sender.submit('movement', {'command': 'forward'})
+    sender.submit('gas', {'command': 'increase'})
+    sender.submit('emergency', {'emergency': True})
+    release.set()
+    sender.stop()
+    assert [path for path, _ in sent] == ['steering', 'emergency', 'movement', 'gas']
+
+
+def test_sender_stop_drains_queue():
+    sender, sent, release = blocked_sender()
+    for i in range(5):
+        sender.submit(f"path{i}", {'command': 'x'})
+    threading.Timer(0.05, release.set).start()
+    start = time.monotonic()
+    sender.stop()
+    assert len(sent) == 6
+    assert time.monotonic() - start < 2.0
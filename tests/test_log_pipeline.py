@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+
+from log_pipeline import JsConsoleLimiter, LogPipeline, SizedTimedRotatingFileHandler
+
+
+def record(message):
+    return logging.LogRecord('ika', logging.INFO, __file__, 1, message, None, None)
+
+
+def log_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith('ika.log'))
+
+
+def test_handler_rotates_by_size_and_keeps_backup_count(tmp_path):
+    path = tmp_path / 'ika.log'
+    handler = SizedTimedRotatingFileHandler(str(path), max_bytes=200, backup_count=2)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    try:
+        for i in range(20):
+            handler.emit(record(f"satır {i:02d} " + 'x' * 40))
+    finally:
+        handler.close()
+
+    files = log_files(tmp_path)
+    # Güncel dosya + en fazla 2 yedek; aynı gün içindeki dönüşler sıra numarası alır
+    assert len(files) == 3
+    assert all(os.path.getsize(tmp_path / name) <= 200 for name in files)
+    assert path.read_text(encoding='utf-8').splitlines()[-1].startswith('satır 19')
+
+
+def test_handler_rotates_when_time_is_due(tmp_path):
+    path = tmp_path / 'ika.log'
+    handler = SizedTimedRotatingFileHandler(str(path), max_bytes=0, backup_count=5)
+    try:
+        handler.emit(record('dün'))
+        handler.rolloverAt = 0
+        handler.emit(record('bugün'))
+    finally:
+        handler.close()
+    assert len(log_files(tmp_path)) == 2
+    assert path.read_text(encoding='utf-8').strip() == 'bugün'
+
+
+def test_pipeline_writes_from_other_threads_and_flushes_on_stop(tmp_path):
+    path = tmp_path / 'ika.log'
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    pipeline = LogPipeline(str(path)).start()
+    try:
+        assert root.handlers == [pipeline.queue_handler]
+        workers = [threading.Thread(target=logging.info, args=(f"thread {i}",)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        logging.debug('görünmez')
+    finally:
+        pipeline.stop()
+        root.handlers[:] = saved[0]
+        root.setLevel(saved[1])
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert sorted(line.rsplit(' - ', 1)[1] for line in lines) == [f"thread {i}" for i in range(4)]
+    assert all(' - INFO - ' in line for line in lines)
+
+
+def test_js_limiter_allows_burst_then_samples():
+    limiter = JsConsoleLimiter('front', rate=2.0, burst=5, sample_every=10)
+    allowed = [limiter.allow(now=limiter._last) for _ in range(35)]
+    assert allowed[:5] == [True] * 5
+    # Kova boşken her 10 satırdan biri örneklenir
+    assert [i for i, ok in enumerate(allowed[5:]) if ok] == [9, 19, 29]
+    assert (limiter.passed, limiter.sampled, limiter.suppressed) == (5, 3, 27)
+
+    # 1 sn sonra kovaya 2 jeton dolmuş olur
+    later = limiter._last + 1.0
+    assert [limiter.allow(now=later) for _ in range(3)] == [True, True, False]
+
+
+def test_js_limiter_reports_suppressed_lines(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('log_pipeline.time.monotonic', lambda: now[0])
+    messages = []
+
+    class Collector(logging.Handler):
+        def emit(self, rec):
+            messages.append(rec.getMessage())
+
+    logger = logging.getLogger('ika.js.test')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = Collector()
+    logger.addHandler(handler)
+    try:
+        limiter = JsConsoleLimiter('laser', rate=0.0, burst=2, sample_every=1000, logger=logger)
+        for i in range(10):
+            limiter.log(logging.INFO, f"mesaj {i}", line=i)
+        now[0] += 31.0
+        limiter.log(logging.INFO, 'son')
+    finally:
+        logger.removeHandler(handler)
+
+    assert messages[:2] == ['JS [laser L0] mesaj 0', 'JS [laser L1] mesaj 1']
+    assert messages[2] == "JS [laser] son 31 sn'de 9 satır bastırıldı (0 örneklendi)"
+    assert limiter.suppressed == 0
@@ -0,0 +1,69 @@
+import threading
+
+import numpy as np
+
+from motion_detector import MotionDetector, analyse_frame, downscale_gray, find_regions
+
+
+def test_downscale_gray_averages_blocks():
+    frame = np.zeros((4, 4, 4), dtype=np.uint8)
+    frame[:2, :2, :3] = 255
+    gray = downscale_gray(frame, factor=2)
+    assert gray.shape == (2, 2)
+    assert gray[0, 0] == np.float32(255) * np.float32(0.299 + 0.587 + 0.114)
+    assert gray[1, 1] == 0
+
+
+def test_find_regions_groups_neighbouring_cells():
+    active = np.zeros((5, 5), dtype=bool)
+    active[0:2, 0:2] = True
+    active[4, 4] = True
+    assert sorted(find_regions(active)) == [(0, 0, 2, 2), (4, 4, 5, 5)]
+
+
+def test_analyse_frame_without_background_only_seeds_model():
+    gray = np.zeros((40, 40), dtype=np.float32)
+    background, boxes, ratio = analyse_frame(gray, None)
+    assert background is gray
+    assert boxes == [] and ratio == 0.0
+
+
+def test_analyse_frame_reports_moving_block_as_normalized_box():
+    background = np.zeros((40, 40), dtype=np.float32)
+    gray = background.copy()
+    gray[10:20, 20:30] = 200.0
+    new_background, boxes, ratio = analyse_frame(gray, background, cell=10)
+    assert boxes == [(0.5, 0.25, 0.25, 0.25)]
+    assert ratio == 100 / 1600
+    # Hareketli pikseller arka plana yavaş katılır
+    assert 0 < new_background[15, 25] < 200.0 * 0.05
+
+
+def test_detector_runs_analysis_in_worker_pool():
+    results = []
+    done = threading.Event()
+
+    def on_result(camera, boxes, latency):
+        results.append((camera, boxes))
+        done.set()
+
+    detector = MotionDetector(on_result)
+    try:
+        frame = np.zeros((80, 80, 4), dtype=np.uint8)
+        detector.on_frame('back', frame, 0.0)
+        assert done.wait(60)
+        done.clear()
+
+        moved = frame.copy()
+        moved[20:40, 40:60, :3] = 255
+        detector.on_frame('back', moved, 0.1)
+        assert done.wait(60)
+    finally:
+        detector.shutdown()
+
+    assert results[0] == ('back', [])
+    camera, boxes = results[1]
+    assert camera == 'back' and len(boxes) == 1
+    x, y, w, h = boxes[0]
+    assert (x, y, w, h) == (0.5, 0.25, 0.25, 0.25)
+    assert detector.latency_summary()['processed'] == 2
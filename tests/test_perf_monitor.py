@@ -0,0 +1,52 @@
+import logging
+
+from perf_monitor import CpuSampler, LabeledStats, OverloadDetector
+
+
+def test_overload_needs_sustained_strikes():
+    detector = OverloadDetector(cpu_threshold=80, sustain=3, cores=2)
+    assert not detector.sample(170)
+    assert not detector.sample(170)
+    # Kısa bir düşüş sayacı sıfırlar
+    assert not detector.sample(100)
+    assert detector.last['cpu_percent'] == 50
+    assert [detector.sample(170) for _ in range(3)] == [False, False, True]
+
+
+def test_frame_lateness_uses_p90_of_ticks():
+    detector = OverloadDetector(cpu_threshold=1000, frame_late_ms=40, sustain=1, cores=1)
+    now = 0.0
+    detector.tick(0.033, now)
+    for gap in [0.033] * 19 + [0.2]:
+        now += gap
+        detector.tick(0.033, now)
+    # Tek bir uzun kare p90'a girmez
+    assert not detector.sample(0)
+    assert detector.last['frame_late_ms'] < 1
+
+    for gap in [0.1] * 10:
+        now += gap
+        detector.tick(0.033, now)
+    assert detector.sample(0)
+    assert abs(detector.last['frame_late_ms'] - 67) < 1
+    # Örnekler arası tick yoksa gecikme sıfır sayılır
+    assert not detector.sample(0)
+
+
+def test_labeled_stats_averages_and_summary(caplog):
+    stats = LabeledStats()
+    for label, value in [(3, 30.0), (3, 50.0), (1, 10.0)]:
+        stats.add(label, value)
+    assert stats.averages() == {3: 40.0, 1: 10.0}
+    with caplog.at_level(logging.INFO):
+        stats.log_summary("Görünür panel")
+    assert [r.getMessage() for r in caplog.records] == [
+        "Görünür panel:", "  1: ortalama 10.0 % CPU (1 örnek)", "  3: ortalama 40.0 % CPU (2 örnek)"]
+
+
+def test_memory_counts_this_process():
+    sampler = CpuSampler()
+    sampler.sample()
+    blob = bytearray(32 * 1024 * 1024)
+    assert sampler.memory_mb() > 32
+    del blob
@@ -0,0 +1,61 @@
+import json
+import os
+
+import pytest
+
+from recording_session import MANIFEST_NAME, RecordingSession, new_session_id
+from recording_writer import RecordingWriter
+
+FILES = {'front': 'front.webm', 'back': 'back.webm'}
+
+
+def test_chunks_are_timed_relative_to_session_start(tmp_path):
+    session = RecordingSession(FILES, str(tmp_path), start_delay=0)
+    start = session.start_epoch * 1000
+    key = f"{session.session_id}/front.webm"
+    assert session.owns(key) and not session.owns('front.webm')
+
+    session.on_chunk(key, 0, 0, 100, {'start': start + 250, 't0': start + 250, 't1': start + 1250})
+    session.on_chunk(key, 1, 100, 50, {'t0': start + 1250, 't1': start + 2250})
+    session.on_chunk('other/front.webm', 0, 0, 10, {})
+
+    front = session.manifest()['cameras']['front']
+    assert front['start_offset'] == pytest.approx(0.25, abs=0.001)
+    assert front['bytes'] == 150 and not front['complete']
+    assert [(c['seq'], c['offset']) for c in front['chunks']] == [(0, 0), (1, 100)]
+    times = [t for c in front['chunks'] for t in (c['t0'], c['t1'])]
+    assert times == pytest.approx([0.25, 1.25, 1.25, 2.25], abs=0.001)
+    assert session.manifest()['cameras']['back']['chunks'] == []
+
+
+def test_manifest_written_once_all_tracks_close_after_stop(tmp_path):
+    writer = RecordingWriter(str(tmp_path))
+    session = RecordingSession(FILES, str(tmp_path), start_delay=0)
+    writer.on_chunk = session.on_chunk
+    writer.on_close = session.on_close
+    front, back = (session.tracks[c]['key'] for c in ('front', 'back'))
+
+    writer.write(front, 0, b'x' * 10, {'start': session.start_epoch_ms})
+    writer.close(front)
+    writer.stop()
+    # Oturum durdurulmadan kapanan dosya manifesti tetiklemez
+    assert not os.path.exists(session.manifest_path())
+
+    session.stop()
+    # Hiç parça göndermeden durdurulan kaydedici de kapanmış sayılır
+    session.on_close(back, {'chunks': 0, 'bytes': 0})
+    path = session.manifest_path()
+    assert path == os.path.join(str(tmp_path), session.session_id, MANIFEST_NAME)
+    manifest = json.loads(open(path, encoding='utf-8').read())
+    assert manifest['session'] == session.session_id
+    assert manifest['stop_epoch_ms'] >= manifest['start_epoch_ms']
+    assert manifest['cameras']['front']['bytes'] == 10 and manifest['cameras']['front']['complete']
+    assert manifest['cameras']['back']['complete'] and manifest['cameras']['back']['start_offset'] is None
+    assert (tmp_path / session.session_id / 'front.webm').read_bytes() == b'x' * 10
+    assert session.write_manifest() is None
+
+
+def test_session_ids_are_unique_within_a_millisecond(tmp_path):
+    ids = [new_session_id(str(tmp_path)) for _ in range(5)]
+    assert len(set(ids)) == 5
+    assert all((tmp_path / session_id).is_dir() for session_id in ids)
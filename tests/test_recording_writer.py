@@ -0,0 +1,124 @@
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from file_server import FileServer
+from recording_session import RecordingSession
+from recording_writer import RecordingWriter
+
+
+def test_chunks_are_appended_and_reported(tmp_path):
+    writer = RecordingWriter(str(tmp_path))
+    chunks, closed = [], []
+    writer.on_chunk = lambda name, seq, offset, size, meta: chunks.append((name, seq, offset, size, meta))
+    writer.on_close = lambda name, stats: closed.append((name, stats['chunks'], stats['bytes']))
+    assert writer.write('s1/front.webm', 0, b'abc', {'t0': 1})
+    assert writer.write('s1/front.webm', 1, b'defg')
+    assert writer.close('s1/front.webm')
+    writer.stop()
+
+    assert (tmp_path / 's1' / 'front.webm').read_bytes() == b'abcdefg'
+    assert chunks == [('s1/front.webm', 0, 0, 3, {'t0': 1}), ('s1/front.webm', 1, 3, 4, None)]
+    assert closed == [('s1/front.webm', 2, 7)]
+
+
+def test_seq_zero_restarts_file(tmp_path, caplog):
+    writer = RecordingWriter(str(tmp_path))
+    writer.write('back.webm', 0, b'old-data')
+    writer.write('back.webm', 0, b'new')
+    writer.stop()
+    assert (tmp_path / 'back.webm').read_bytes() == b'new'
+    assert writer.stats['back.webm']['chunks'] == 1
+    assert any('seq 0' in r.getMessage() for r in caplog.records)
+
+
+def test_stop_closes_open_files(tmp_path):
+    writer = RecordingWriter(str(tmp_path))
+    writer.write('laser.webm', 0, b'x')
+    writer.stop()
+    assert writer.files == {}
+    assert (tmp_path / 'laser.webm').read_bytes() == b'x'
+
+
+def test_path_for_drops_parent_and_absolute_parts(tmp_path):
+    writer = RecordingWriter(str(tmp_path))
+    writer.stop()
+    assert writer.path_for('../../etc/passwd') == os.path.join(str(tmp_path), 'etc', 'passwd')
+    assert writer.path_for('/abs/./x.webm') == os.path.join(str(tmp_path), 'abs', 'x.webm')
+    assert writer.path_for('..\\win.webm') == os.path.join(str(tmp_path), 'win.webm')
+
+
+def test_full_queue_rejects_chunk(tmp_path):
+    writer = RecordingWriter(str(tmp_path), max_queue=1)
+    writing = threading.Event()
+    release = threading.Event()
+
+    def on_chunk(name, seq, offset, size, meta):
+        writing.set()
+        release.wait(5)
+
+    writer.on_chunk = on_chunk
+    assert writer.write('front.webm', 0, b'a')
+    assert writing.wait(5)
+    # Yazıcı meşgulken kuyruğun tek yeri dolar, sonraki parça zaman aşımında reddedilir
+    assert writer.write('front.webm', 1, b'b')
+    assert not writer.write('front.webm', 2, b'c', timeout=0.05)
+    assert not writer.close('front.webm', timeout=0.05)
+    assert writer.dropped == 1 and writer.max_depth == 1
+    release.set()
+    writer.stop()
+    assert (tmp_path / 'front.webm').read_bytes() == b'ab'
+
+
+
+def test_record_endpoint_answers_busy_when_queue_is_full(tmp_path):
+    server = FileServer(port=0, recordings_dir=str(tmp_path))
+    assert server.start()
+    try:
+        server.recording_writer.write = lambda *args, **kwargs: False
+        request = urllib.request.Request(f"http://localhost:{server.port}/record/front.webm?seq=3",
+                                         data=b'chunk', method='POST')
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request, timeout=5)
+        assert error.value.code == 503
+        assert error.value.headers['Retry-After'] == '1'
+    finally:
+        server.stop()
+
+
+def test_close_without_chunks_still_reports(tmp_path):
+    writer = RecordingWriter(str(tmp_path))
+    closed = []
+    writer.on_close = lambda name, stats: closed.append((name, stats))
+    writer.close('laser.webm')
+    writer.stop()
+    assert closed == [('laser.webm', {'chunks': 0, 'bytes': 0, 'next_seq': 0, 'started': None})]
+    assert not (tmp_path / 'laser.webm').exists()
+
+
+def post_chunk(port, path, data):
+    request = urllib.request.Request(f"http://localhost:{port}/record/{path}", data=data, method='POST')
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.status
+
+
+def test_record_endpoint_decodes_file_names(tmp_path):
+    server = FileServer(port=0, recordings_dir=str(tmp_path))
+    assert server.start()
+    try:
+        session = RecordingSession({'front': 'ön kamera.webm'}, str(tmp_path), start_delay=0)
+        server.attach_session(session)
+        name = urllib.parse.quote('ön kamera.webm', safe='')
+        assert post_chunk(server.port, f"{name}?session={session.session_id}&seq=0&final=1", b'data') == 204
+        assert post_chunk(server.port, urllib.parse.quote('../../dışarı.webm', safe=''), b'x') == 204
+    finally:
+        server.stop()
+    assert (tmp_path / session.session_id / 'ön kamera.webm').read_bytes() == b'data'
+    # Çözülen '..' parçaları kayıt klasörünün dışına çıkamaz
+    assert (tmp_path / 'dışarı.webm').read_bytes() == b'x'
+    front = session.manifest()['cameras']['front']
+    assert front['bytes'] == 4 and front['complete']
@@ -0,0 +1,68 @@
+import json
+import os
+import time
+
+from stall_watchdog import StallHistogram, StallWatchdog
+
+
+def block(seconds):
+    """GUI thread'ini meşgul eden uzun iş"""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_histogram_buckets():
+    histogram = StallHistogram(bounds=(250, 1000))
+    for duration in (100, 300, 999, 1000, 5000):
+        histogram.add(duration)
+    assert histogram.buckets() == [('0-250 ms', 1), ('250-1000 ms', 2), ('1000+ ms', 2)]
+    assert len(histogram) == 5 and histogram.max_ms == 5000
+
+
+def test_short_gaps_are_not_stalls(tmp_path):
+    watchdog = StallWatchdog(threshold_ms=200, log_path=str(tmp_path / 'stalls.jsonl'))
+    try:
+        assert watchdog.beat() is None
+        for _ in range(3):
+            time.sleep(0.01)
+            assert watchdog.beat() is None
+    finally:
+        watchdog.stop()
+    assert len(watchdog.histogram) == 0
+    assert not (tmp_path / 'stalls.jsonl').exists()
+
+
+def test_blocked_gui_thread_is_sampled_and_logged(tmp_path):
+    log_path = tmp_path / 'stalls.jsonl'
+    watchdog = StallWatchdog(threshold_ms=100, log_path=str(log_path), app_root=os.path.dirname(__file__))
+    try:
+        watchdog.beat()
+        block(0.35)
+        stall = watchdog.beat()
+    finally:
+        watchdog.stop()
+
+    assert stall['kind'] == 'blocked'
+    assert stall['duration_ms'] >= 350
+    assert stall['samples'] >= 1
+    assert stall['culprit'].startswith('block (test_stall_watchdog.py:')
+    assert any(' block' in line for line in stall['stack'])
+    assert watchdog.last_stall() is stall
+    assert len(watchdog.histogram) == 1
+
+    logged = [json.loads(line) for line in log_path.read_text(encoding='utf-8').splitlines()]
+    assert [entry['duration_ms'] for entry in logged] == [stall['duration_ms']]
+
+
+def test_modal_time_counts_as_modal_stall():
+    watchdog = StallWatchdog(threshold_ms=50, log_path=None)
+    try:
+        watchdog.beat()
+        time.sleep(0.08)
+        assert watchdog.beat(modal=True) is None
+        stall = watchdog.beat()
+    finally:
+        watchdog.stop()
+    assert stall['kind'] == 'modal'
+    assert watchdog.beat() is None
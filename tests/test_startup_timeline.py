@@ -0,0 +1,94 @@
+import json
+import sys
+import threading
+
+import pytest
+
+from startup_timeline import ImportProfiler, StartupTimeline
+
+
+def test_phases_complete_across_threads(tmp_path):
+    timeline = StartupTimeline(log_path=str(tmp_path / 'startup.jsonl'))
+    timeline.expect('shell', 'server', 'firebase')
+    with timeline.phase('shell'):
+        pass
+    assert timeline.progress() == (1, 3)
+    assert timeline.summary_text() == "Açılış 1/3: firebase, server bekleniyor"
+
+    worker = threading.Thread(target=lambda: timeline.record('server', timeline.t0, ok=False, detail='port'),
+                              name='ServerThread')
+    worker.start()
+    worker.join()
+    timeline.begin('firebase', thread='FirebaseThread')
+    assert not timeline.is_complete()
+    timeline.end('firebase')
+    assert timeline.is_complete()
+    assert timeline.summary_text().startswith("Açılış tamamlandı")
+
+    rows = {name: (thread, ok, detail) for name, _, _, thread, ok, detail in timeline.rows()}
+    assert rows == {
+        'shell': ('MainThread', True, ''),
+        'server': ('ServerThread', False, 'port'),
+        'firebase': ('FirebaseThread', True, ''),
+    }
+    assert timeline.start_ms('server') == 0.0
+
+
+def test_failed_phase_records_error_and_reraises():
+    timeline = StartupTimeline()
+    with pytest.raises(RuntimeError):
+        with timeline.phase('pages'):
+            raise RuntimeError('sayfa yok')
+    _, _, _, _, ok, detail = timeline.rows()[0]
+    assert (ok, detail) == (False, 'sayfa yok')
+    # Bitmiş aşama ikinci end() ile değişmez
+    timeline.end('pages', True)
+    assert timeline.rows()[0][4] is False
+
+
+def test_mark_keeps_first_moment():
+    timeline = StartupTimeline()
+    timeline.mark('window_exposed')
+    first = timeline.start_ms('window_exposed')
+    timeline.mark('window_exposed')
+    assert timeline.start_ms('window_exposed') == first
+    assert timeline.duration_ms('window_exposed') >= 0.0
+    assert timeline.duration_ms('missing') is None
+
+
+def test_write_log_appends_once(tmp_path):
+    path = tmp_path / 'startup.jsonl'
+    timeline = StartupTimeline(log_path=str(path))
+    with timeline.phase('shell'):
+        pass
+    timeline.write_log()
+    timeline.write_log()
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert list(record['phases']) == ['shell']
+    assert record['phases']['shell']['ok'] is True
+    assert any('shell' in line for line in timeline.report_lines())
+
+
+def test_import_profiler_measures_new_modules_only(tmp_path, monkeypatch):
+    (tmp_path / 'ika_profiled_child.py').write_text("import time\ntime.sleep(0.02)\n")
+    (tmp_path / 'ika_profiled_parent.py').write_text("import ika_profiled_child\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profiler = ImportProfiler().install()
+    try:
+        import json as already_loaded  # noqa: F401
+        import ika_profiled_parent  # noqa: F401
+    finally:
+        profiler.uninstall()
+        sys.modules.pop('ika_profiled_parent', None)
+        sys.modules.pop('ika_profiled_child', None)
+
+    modules = {row['module']: row for row in profiler.summary(top=1000)}
+    assert 'json' not in modules
+    parent, child = modules['ika_profiled_parent'], modules['ika_profiled_child']
+    assert child['cumulative_ms'] >= 20.0
+    # Alt importun süresi üst modülün kümülatif süresine girer, öz süresine girmez
+    assert parent['cumulative_ms'] >= child['cumulative_ms']
+    assert parent['self_ms'] < child['cumulative_ms']
+    assert profiler.report_lines(top=3)[0].startswith("Import süreleri")
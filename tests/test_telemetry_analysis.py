@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from flight_recorder import (
+    KIND_COMMAND, KIND_SENSORS, KIND_STATE, RECORD_DTYPE, RUN_PATTERN, FlightRecorder, encode_record,
+    log_name, new_run_id,
+)
+from telemetry_analysis import (
+    analyse_run, echo_latency, group_runs, imu_extremes, speed_profile, to_columns, track_length,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+T0 = 1_700_000_000.0
+
+
+def columns(rows):
+    return to_columns(np.array([encode_record(i, T0 + t, kind, channel, data)
+                                for i, (t, kind, channel, data) in enumerate(rows)], dtype=RECORD_DTYPE))
+
+
+def rotated_run(log_dir, files=6, per_file=3, run_id=None):
+    """Küçük max_bytes ile birden çok dosyaya dönen tek bir kaydedici çalıştırması"""
+    recorder = FlightRecorder(str(log_dir), max_bytes=64 + RECORD_DTYPE.itemsize * per_file, max_files=0,
+                              flush_interval=60, batch_size=1000)
+    if run_id is not None:
+        recorder.run_id = run_id
+    for i in range(files * per_file):
+        recorder.record_sensors({'gps': {'speed': 1.0, 'latitude': 39.9 + i * 1e-4, 'longitude': 32.8}})
+        if i % per_file == per_file - 1:
+            recorder._flush()
+    recorder.close()
+    return recorder
+
+
+def test_run_pattern_matches_recorder_file_names():
+    match = RUN_PATTERN.match(log_name(new_run_id(), 12))
+    assert match is not None and match.group(1).startswith('ika_')
+
+
+def test_group_runs_keeps_rotated_files_of_one_run_together(tmp_path):
+    recorder = rotated_run(tmp_path)
+    runs = group_runs([str(tmp_path)])
+    assert list(runs) == [f"ika_{recorder.run_id}"]
+    files = runs[f"ika_{recorder.run_id}"]
+    assert len(files) == 6
+    assert files == sorted(os.path.join(str(tmp_path), name) for name in os.listdir(tmp_path))
+
+    report = analyse_run(f"ika_{recorder.run_id}", files)
+    assert (report['files'], report['records'], report['sensor_records']) == (6, 18, 18)
+
+
+def test_group_runs_separates_runs_and_unknown_files(tmp_path):
+    rotated_run(tmp_path, files=2, run_id='20260101-120000-41')
+    rotated_run(tmp_path, files=1, run_id='20260101-120000-42')
+    (tmp_path / 'copy.ikt').write_bytes(b'')
+    runs = group_runs([str(tmp_path)])
+    assert {run: len(files) for run, files in runs.items()} == {
+        'copy': 1, 'ika_20260101-120000-41': 2, 'ika_20260101-120000-42': 1,
+    }
+
+
+def test_speed_profile_and_track_length():
+    c = columns([
+        (0.0, KIND_SENSORS, 'sensors', {'gps': {'speed': 0.0, 'latitude': 0.0, 'longitude': 0.0}}),
+        (1.0, KIND_SENSORS, 'sensors', {'gps': {'speed': 2.0, 'latitude': 0.0, 'longitude': 0.001}}),
+        (3.0, KIND_COMMAND, 'gas', {'command': 'increase'}),
+        (4.0, KIND_SENSORS, 'sensors', {'gps': {'speed': 4.0, 'latitude': 0.0, 'longitude': 0.002}}),
+        (5.0, KIND_SENSORS, 'sensors', {'imu': {'roll': 3.0}}),
+    ])
+    speed = speed_profile(c)
+    assert (speed['min'], speed['max'], speed['mean']) == (0.0, 4.0, 2.0)
+    # 1-4 sn arası 2 m/s ile hareket; ilk saniye durağan
+    assert speed['moving_s'] == 3.0 and speed['duration_s'] == 4.0
+
+    track = track_length(c)
+    assert track['points'] == 3
+    assert track['length_m'] == pytest.approx(222.4, abs=0.1)
+
+
+def test_imu_extremes():
+    c = columns([
+        (0.0, KIND_SENSORS, 'sensors', {'imu': {'roll': 1.0, 'pitch': -2.0}}),
+        (1.0, KIND_SENSORS, 'sensors', {'imu': {'roll': -5.0, 'pitch': 8.0}}),
+        (2.0, KIND_SENSORS, 'sensors', {'imu': {'roll': 4.0}}),
+    ])
+    imu = imu_extremes(c)
+    assert (imu['roll']['min'], imu['roll']['min_t'], imu['roll']['max']) == (-5.0, T0 + 1.0, 4.0)
+    assert (imu['pitch']['min'], imu['pitch']['max'], imu['pitch']['max_t']) == (-2.0, 8.0, T0 + 1.0)
+    assert imu_extremes(columns([(0.0, KIND_COMMAND, 'gas', {'command': 'up'})])) is None
+
+
+def test_echo_latency_counts_first_read_of_each_command():
+    sent = T0 + 10.0
+    c = columns([
+        (10.0, KIND_COMMAND, 'gear', {'gear': '2', 'timestamp': sent}),
+        (10.2, KIND_STATE, 'gear', {'gear': '2', 'timestamp': sent}),
+        (10.3, KIND_STATE, 'gear', {'gear': '2', 'timestamp': sent}),
+        (11.05, KIND_STATE, 'emergency', {'emergency': True, 'timestamp': sent + 1.0}),
+        (12.0, KIND_STATE, 'control', {'mode': 'manual'}),
+    ])
+    latency = echo_latency(c)
+    assert latency['gear']['max'] == pytest.approx(200.0, abs=0.01)
+    assert latency['emergency']['max'] == pytest.approx(50.0, abs=0.01)
+    assert latency['all']['min'] == pytest.approx(50.0, abs=0.01)
+    assert 'control' not in latency
+
+
+def test_cli_exports_and_reports_each_run(tmp_path):
+    recorder = rotated_run(tmp_path / 'telemetry', files=3)
+    report_path = tmp_path / 'report.json'
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'telemetry_analysis.py'), str(tmp_path / 'telemetry'),
+         '--export-dir', str(tmp_path / 'exports'), '--workers', '1', '--json', str(report_path)],
+        capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+    reports = json.loads(report_path.read_text(encoding='utf-8'))
+    assert [(r['run'], r['files'], r['records']) for r in reports] == [(f"ika_{recorder.run_id}", 3, 9)]
+    with np.load(reports[0]['export']) as exported:
+        assert 't' in exported and '_pad' not in exported
+        assert len(exported['speed']) == 9
+
+
+def test_cli_fails_without_logs(tmp_path):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'telemetry_analysis.py'), str(tmp_path)],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 1
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from telemetry_history import SignalHistory, TelemetryHistory, decimate, lttb_decimate, minmax_decimate
+
+
+def signal(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n, dtype=np.float64) * 0.1
+    v = np.cumsum(rng.normal(size=n)).astype(np.float32)
+    return t, v
+
+
+def test_signal_history_orders_after_wrap():
+    history = SignalHistory(capacity=4)
+    assert history.latest() is None
+    for i in range(6):
+        history.append(float(i), i * 10)
+    t, v = history.ordered()
+    assert list(t) == [2.0, 3.0, 4.0, 5.0]
+    assert list(v) == [20, 30, 40, 50]
+    assert history.latest() == 50.0
+    assert len(history) == 4 and history.version == 6
+
+
+@pytest.mark.parametrize('points', [3, 10, 100, 999])
+def test_lttb_keeps_endpoints_and_point_count(points):
+    t, v = signal()
+    dt, dv = lttb_decimate(t, v, points)
+    assert len(dt) == points
+    assert (dt[0], dv[0]) == (t[0], v[0])
+    assert (dt[-1], dv[-1]) == (t[-1], v[-1])
+    assert np.all(np.diff(dt) > 0)
+
+
+def test_lttb_keeps_spike():
+    t, v = signal()
+    v[500] = 1000.0
+    _, dv = lttb_decimate(t, v, 50)
+    assert 1000.0 in dv
+
+
+def test_minmax_keeps_extremes_in_time_order():
+    t, v = signal()
+    v[123] = 500.0
+    v[777] = -500.0
+    dt, dv = minmax_decimate(t, v, 50)
+    assert len(dt) == 100
+    assert dv.max() == 500.0 and dv.min() == -500.0
+    assert np.all(np.diff(dt) > 0)
+
+
+def test_short_signals_are_not_decimated():
+    t, v = signal(20)
+    assert decimate(t, v, 100)[0] is t
+    assert decimate(t, v, 100, method='lttb')[0] is t
+
+
+def test_telemetry_history_skips_missing_and_invalid_fields():
+    history = TelemetryHistory(capacity=8)
+    history.add(1.0, {'imu': {'roll': 5, 'pitch': 'x'}, 'gps': {'speed': '3.5'}})
+    history.add(2.0, {'imu': None})
+    assert history['roll'].latest() == 5.0
+    assert history['speed'].latest() == 3.5
+    assert len(history['pitch']) == 0 and len(history['yaw']) == 0
@@ -0,0 +1,85 @@
+import numpy as np
+
+from flight_recorder import KIND_COMMAND, KIND_SENSORS, KIND_STATE, RECORD_DTYPE, FlightRecorder, encode_record
+from telemetry_replay import MAX_SPEED, MIN_SPEED, TelemetryReplay, format_position
+
+T0 = 1_700_000_000.0
+
+
+def make_records():
+    rows = [
+        (0.0, KIND_SENSORS, 'sensors', {'imu': {'roll': 1.0}}),
+        (1.0, KIND_STATE, 'gear', {'gear': '1'}),
+        (2.0, KIND_COMMAND, 'movement', {'command': 'forward'}),
+        (3.0, KIND_SENSORS, 'sensors', {'imu': {'roll': 2.0}}),
+        (4.0, KIND_STATE, 'gear', {'gear': '2'}),
+        (6.0, KIND_STATE, 'laser_mode', {'active': True}),
+        (8.0, KIND_SENSORS, 'sensors', {'imu': {'roll': 3.0}, 'gps': {'latitude': 39.9}}),
+    ]
+    return np.array([encode_record(i, T0 + t, kind, channel, data)
+                     for i, (t, kind, channel, data) in enumerate(rows)], dtype=RECORD_DTYPE)
+
+
+def test_outgoing_commands_are_not_replayed():
+    replay = TelemetryReplay(make_records())
+    assert len(replay) == 6
+    assert replay.duration == 8.0
+
+
+def test_seek_restores_latest_state_per_channel():
+    replay = TelemetryReplay(make_records())
+    events = replay.seek(5.0)
+    assert events == [
+        ('sensors', {'imu': {'roll': 2.0}}),
+        ('firebase', {'type': 'gear', 'data': {'gear': '2'}}),
+    ]
+    assert replay.position() == 5.0
+    # İmleç hedeften sonraki ilk kayıtta: lazer durumu henüz gelmedi
+    assert replay.due_events() == []
+
+    assert replay.seek(100.0)[-1] == ('sensors', {'imu': {'roll': 3.0}, 'gps': {'latitude': 39.9}})
+    assert replay.is_finished()
+    assert replay.seek(-5.0) == [('sensors', {'imu': {'roll': 1.0}})]
+
+
+def test_due_events_follow_playback_clock():
+    replay = TelemetryReplay(make_records(), speed=2.0)
+    assert [e[0] for e in replay.seek(0.0)] == ['sensors']
+    replay.play()
+    wall = replay._anchor_wall
+
+    assert replay.due_events(wall) == []
+    # 2 sn gerçek zaman = 4 sn log zamanı
+    events = replay.due_events(wall + 2.0)
+    assert [e[1].get('type') for e in events] == ['gear', None, 'gear']
+    assert replay.due_events(wall + 2.0) == []
+    assert replay.due_events(wall + 10.0)[-1][0] == 'sensors'
+    assert replay.is_finished()
+
+
+def test_pause_and_speed_keep_position():
+    replay = TelemetryReplay(make_records())
+    replay.seek(3.0)
+    replay.set_speed(1000)
+    assert replay.speed == MAX_SPEED
+    replay.set_speed(0)
+    assert replay.speed == MIN_SPEED
+    replay.pause()
+    assert replay.position() == 3.0
+    assert replay.next_delay() is None
+
+
+def test_from_path_reads_recorder_logs(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), flush_interval=60)
+    recorder.record_sensors({'gps': {'latitude': 39.9, 'longitude': 32.8}})
+    recorder.record_command('gas', {'command': 'increase'})
+    recorder.record_state('emergency', {'emergency': True})
+    recorder.close()
+
+    replay = TelemetryReplay.from_path(str(tmp_path))
+    assert len(replay) == 2
+    assert replay.seek(replay.duration)[-1] == ('firebase', {'type': 'emergency', 'data': {'emergency': True}})
+
+
+def test_format_position():
+    assert format_position(3725.9) == '1:02:05'
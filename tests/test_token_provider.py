@@ -0,0 +1,114 @@
+import json
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from camera_topology import CameraSpec
+from file_server import TOKEN_KEY_HEADER, FileServer
+from token_provider import EnvTokenProvider, FileTokenProvider, GeneratorTokenProvider
+
+
+def write_tokens(path, tokens, mtime):
+    path.write_text(json.dumps(tokens), encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_env_provider_uses_camera_token_then_default(monkeypatch):
+    monkeypatch.setenv('AGORA_TOKEN', 'shared')
+    cameras = [CameraSpec('front', 'Ön', 'ch-front', 1, token='front-token'),
+               CameraSpec('back', 'Arka', 'ch-back', 2)]
+    provider = EnvTokenProvider(cameras)
+    assert provider.get_token('ch-front') == 'front-token'
+    assert provider.get_token('ch-back') == 'shared'
+    assert provider.get_token('ch-unknown') == 'shared'
+
+
+def test_file_provider_reloads_and_reports_change_once(tmp_path):
+    path = tmp_path / 'tokens.json'
+    write_tokens(path, {'ch-front': 'a', 'default': 'd'}, 1000)
+    provider = FileTokenProvider(str(path))
+    assert provider.get_token('ch-front') == 'a'
+    assert provider.get_token('ch-back') == 'd'
+    assert provider.poll_changed() is False
+
+    write_tokens(path, {'ch-front': 'b'}, 2000)
+    # /token isteği dosyayı önce yüklese de değişiklik GUI kontrolüne bildirilir
+    assert provider.get_token('ch-front') == 'b'
+    assert provider.poll_changed() is True
+    assert provider.poll_changed() is False
+
+
+@pytest.mark.parametrize('content', [['a', 'b'], {'ch-front': 5}])
+def test_file_provider_ignores_invalid_file(tmp_path, content):
+    path = tmp_path / 'tokens.json'
+    write_tokens(path, {'ch-front': 'a'}, 1000)
+    provider = FileTokenProvider(str(path))
+
+    write_tokens(path, content, 2000)
+    assert provider.get_token('ch-front') == 'a'
+    assert provider.poll_changed() is False
+
+
+def test_file_provider_falls_back_when_channel_missing(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGORA_TOKEN', 'env')
+    path = tmp_path / 'tokens.json'
+    write_tokens(path, {'ch-front': 'a'}, 1000)
+    provider = FileTokenProvider(str(path), fallback=EnvTokenProvider([]))
+    assert provider.get_token('ch-back') == 'env'
+    assert FileTokenProvider(str(tmp_path / 'missing.json'), fallback=EnvTokenProvider([])).get_token('x') == 'env'
+
+
+def test_generator_provider_passes_expiry(monkeypatch):
+    monkeypatch.setattr('token_provider.time.time', lambda: 100.0)
+    provider = GeneratorTokenProvider(lambda channel, uid, expire: f"{channel}:{uid}:{expire}", lifetime=60)
+    assert provider.get_token('ch-front', 7) == 'ch-front:7:160'
+
+
+@pytest.fixture
+def token_server(tmp_path):
+    server = FileServer(port=0, recordings_dir=str(tmp_path),
+                        token_provider=GeneratorTokenProvider(lambda channel, uid, expire: f"tok-{channel}"),
+                        token_key='secret', token_channels=['ch-front'])
+    assert server.start()
+    yield server
+    server.stop()
+
+
+def get_token(server, channel, key=None, origin=None):
+    request = urllib.request.Request(f"http://localhost:{server.port}/token?channel={channel}")
+    if key is not None:
+        request.add_header(TOKEN_KEY_HEADER, key)
+    if origin is not None:
+        request.add_header('Origin', origin)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, None
+
+
+def test_token_endpoint_requires_key_and_known_channel(token_server):
+    assert get_token(token_server, 'ch-front')[0] == 403
+    assert get_token(token_server, 'ch-front', key='wrong')[0] == 403
+    assert get_token(token_server, 'ch-other', key='secret')[0] == 403
+
+    status, headers, body = get_token(token_server, 'ch-front', key='secret', origin='null')
+    assert status == 200
+    assert body == {'channel': 'ch-front', 'token': 'tok-ch-front'}
+    assert headers['Access-Control-Allow-Origin'] == 'null'
+
+    _, headers, _ = get_token(token_server, 'ch-front', key='secret', origin='http://evil.example')
+    assert headers['Access-Control-Allow-Origin'] is None
+
+
+def test_token_endpoint_closed_without_key(tmp_path):
+    server = FileServer(port=0, recordings_dir=str(tmp_path),
+                        token_provider=GeneratorTokenProvider(lambda channel, uid, expire: 'tok'),
+                        token_channels=['ch-front'])
+    assert server.start()
+    try:
+        assert get_token(server, 'ch-front', key='')[0] == 403
+    finally:
+        server.stop()
@@ -0,0 +1,50 @@
+from ui_scheduler import UiUpdateScheduler
+
+
+def flush(scheduler):
+    applied = []
+    scheduler.flush(lambda key, text: applied.append((key, text)))
+    return applied
+
+
+def test_latest_value_per_key_applied_once():
+    scheduler = UiUpdateScheduler()
+    scheduler.set('roll', '1.0')
+    scheduler.set('roll', '2.0')
+    scheduler.set('yaw', '90')
+    assert flush(scheduler) == [('roll', '2.0'), ('yaw', '90')]
+    assert not scheduler.has_pending()
+    assert flush(scheduler) == []
+
+
+def test_value_already_shown_is_skipped():
+    scheduler = UiUpdateScheduler()
+    scheduler.set('roll', '1.0')
+    flush(scheduler)
+    scheduler.set('roll', '1.0')
+    assert not scheduler.has_pending()
+    assert scheduler.skipped == 1
+
+
+def test_revert_to_shown_value_counts_once():
+    scheduler = UiUpdateScheduler()
+    scheduler.set('gear', '1')
+    flush(scheduler)
+    scheduler.set('gear', '2')
+    scheduler.set('gear', '1')
+    assert flush(scheduler) == []
+    assert (scheduler.skipped, scheduler.coalesced) == (0, 1)
+
+
+def test_summary_accounts_for_every_update():
+    scheduler = UiUpdateScheduler()
+    for key, text in [('a', '1'), ('a', '1'), ('a', '2'), ('b', 'x'), ('a', '3')]:
+        scheduler.set(key, text)
+    flush(scheduler)
+    scheduler.set('b', 'x')
+    scheduler.set('a', '1')
+    scheduler.set('a', '3')
+    flush(scheduler)
+
+    summary = scheduler.summary()
+    assert summary == {'updates': 8, 'applied': 2, 'skipped': 2, 'coalesced': 3}
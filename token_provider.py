@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Agora Token Sağlayıcıları
+Token'lar kanal bazında sağlayıcıdan alınır; süresi dolmak üzereyken
+sayfalar yeni token'ı renewToken ile kanaldan çıkmadan uygular
+"""
+
+import os
+import json
+import time
+import logging
+import importlib
+import threading
+
+from camera_topology import load_topology
+
+# Opsiyonel: yerel token üretimi için Agora'nın token builder paketi
+try:
+    from agora_token_builder import RtcTokenBuilder
+    TOKEN_BUILDER_AVAILABLE = True
+except ImportError:
+    TOKEN_BUILDER_AVAILABLE = False
+
+DEFAULT_TOKEN_LIFETIME = 3600
+
+
+class TokenProvider:
+    """Temel arayüz: get_token(channel, uid) ve değişiklik kontrolü"""
+
+    def get_token(self, channel, uid=0):
+        raise NotImplementedError
+
+    def poll_changed(self):
+        """Token kaynağı son kontrolden beri değiştiyse True (dosya izleme için)"""
+        return False
+
+
+class EnvTokenProvider(TokenProvider):
+    """Kamera topolojisindeki kanal token'ları, yoksa config.env'deki AGORA_TOKEN (önceki davranış)"""
+
+    def __init__(self, cameras=None):
+        self.default_token = os.getenv('AGORA_TOKEN')
+        cameras = cameras if cameras is not None else load_topology()
+        self.tokens = {camera.channel: camera.token or self.default_token for camera in cameras}
+
+    def get_token(self, channel, uid=0):
+        return self.tokens.get(channel, self.default_token)
+
+
+class FileTokenProvider(TokenProvider):
+    """İzlenen JSON token dosyası: {"<kanal>": "<token>", "default": "<token>"}
+    Dosya harici bir script tarafından güncellendiğinde yeni token'lar uygulanır"""
+
+    def __init__(self, path, fallback=None):
+        self.path = path
+        self.fallback = fallback
+        self.tokens = {}
+        self._mtime = None
+        # HTTP thread'i (/token) ve GUI zamanlayıcısı aynı dosyayı okur; hangisi yüklerse
+        # yüklesin değişiklik, poll_changed() onu bildirene kadar işaretli kalır
+        self._changed = False
+        self._lock = threading.Lock()
+        self._load()
+        self._changed = False
+
+    def _load(self):
+        """Dosya değiştiyse yeniden okur; kilit tutularak çağrılmalı"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                tokens = json.load(f)
+        except (OSError, ValueError) as e:
+            # Dosya yazılırken okunduysa bir sonraki kontrolde tekrar denenir
+            logging.error(f"Token dosyası okunamadı: {e}")
+            return
+        self._mtime = mtime
+        if not isinstance(tokens, dict) or not all(isinstance(v, str) for v in tokens.values()):
+            # Aynı hatalı dosya her istekte yeniden loglanmasın; önceki token'lar geçerli kalır
+            logging.error(f"Token dosyası geçersiz: {self.path} ({{\"kanal\": \"token\"}} biçiminde bir nesne olmalı)")
+            return
+        self.tokens = tokens
+        self._changed = True
+        logging.info(f"Token dosyası yüklendi: {self.path}")
+
+    def get_token(self, channel, uid=0):
+        with self._lock:
+            self._load()
+            token = self.tokens.get(channel, self.tokens.get('default'))
+        if token is None and self.fallback is not None:
+            return self.fallback.get_token(channel, uid)
+        return token
+
+    def poll_changed(self):
+        with self._lock:
+            self._load()
+            changed, self._changed = self._changed, False
+        return changed
+
+
+class GeneratorTokenProvider(TokenProvider):
+    """Token'ı yerelde üreten takılabilir sağlayıcı: generator(channel, uid, expire_ts) -> token"""
+
+    def __init__(self, generator, lifetime=DEFAULT_TOKEN_LIFETIME):
+        self.generator = generator
+        self.lifetime = lifetime
+
+    def get_token(self, channel, uid=0):
+        return self.generator(channel, uid, int(time.time()) + self.lifetime)
+
+
+def agora_builder_generator(app_id, app_certificate):
+    """agora_token_builder paketiyle token üretir"""
+    def generate(channel, uid, expire_ts):
+        # Rol 1: publisher (abone olmayı da kapsar); gönderici de aynı sağlayıcıyı kullanır
+        return RtcTokenBuilder.buildTokenWithUid(app_id, app_certificate, channel, uid or 0, 1, expire_ts)
+    return generate
+
+
+def load_generator(spec):
+    """'modül:fonksiyon' biçimindeki üreteci içe aktarır"""
+    module_name, _, func_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def create_token_provider(cameras=None):
+    """Ortama göre sağlayıcı seçer: AGORA_TOKEN_GENERATOR > AGORA_APP_CERTIFICATE > AGORA_TOKEN_FILE > config.env"""
+    env_provider = EnvTokenProvider(cameras)
+    lifetime = int(os.getenv('AGORA_TOKEN_LIFETIME', DEFAULT_TOKEN_LIFETIME))
+
+    generator_spec = os.getenv('AGORA_TOKEN_GENERATOR')
+    if generator_spec:
+        try:
+            return GeneratorTokenProvider(load_generator(generator_spec), lifetime)
+        except (ImportError, AttributeError) as e:
+            logging.error(f"Token üreteci yüklenemedi ({generator_spec}): {e}")
+
+    certificate = os.getenv('AGORA_APP_CERTIFICATE')
+    if certificate and TOKEN_BUILDER_AVAILABLE:
+        return GeneratorTokenProvider(agora_builder_generator(os.getenv('AGORA_APP_ID'), certificate), lifetime)
+
+    token_file = os.getenv('AGORA_TOKEN_FILE')
+    if token_file:
+        return FileTokenProvider(token_file, fallback=env_provider)
+
+    return env_provider
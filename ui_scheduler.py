@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Arayüz Güncelleme Zamanlayıcısı
+Gelen veriler widget'ları hemen güncellemez; widget başına son değer "kirli"
+olarak işaretlenir ve tek bir zamanlayıcı değişenleri kare başına bir kez uygular
+"""
+
+
+class UiUpdateScheduler:
+    """Anahtar -> gösterilecek metin. Ekrandakiyle aynı olan değerler atlanır,
+    iki kare arasında birden çok gelen değerden yalnızca sonuncusu uygulanır"""
+
+    def __init__(self):
+        self.pending = {}
+        self.shown = {}
+        self.received = 0       # set() çağrısı sayısı
+        self.skipped = 0        # ekrandaki/bekleyen değerle aynı olduğu için atlanan
+        self.coalesced = 0      # aynı kare içinde yenisi geldiği için hiç gösterilmeyen
+        self.applied = 0
+
+    def set(self, key, text):
+        self.received += 1
+        if self.pending.get(key, self.shown.get(key)) == text:
+            self.skipped += 1
+            return
+        if key in self.pending:
+            # Bekleyen değer gösterilmeden düşer; ekrandakine geri dönüş de yalnızca burada sayılır
+            self.coalesced += 1
+            if self.shown.get(key) == text:
+                del self.pending[key]
+                return
+        self.pending[key] = text
+
+    def has_pending(self):
+        return bool(self.pending)
+
+    def flush(self, apply):
+        """Bekleyen değerleri apply(key, text) ile tek geçişte uygular"""
+        if not self.pending:
+            return 0
+        pending, self.pending = self.pending, {}
+        for key, text in pending.items():
+            apply(key, text)
+            self.shown[key] = text
+        self.applied += len(pending)
+        return len(pending)
+
+    def summary(self):
+        return {
+            'updates': self.received,
+            'applied': self.applied,
+            'skipped': self.skipped,
+            'coalesced': self.coalesced,
+        }